@@ -0,0 +1,218 @@
+"""
+Per-Site Circuit Breaker
+
+Tracks the outcome and latency of recent upstream scrapes for one job site.
+
+- closed: calls go through. The breaker opens when, over the rolling
+  window, the failure rate (errors and timeouts) or the slow-call rate
+  crosses its threshold.
+- open: calls are rejected immediately. After a cool-down the breaker goes
+  half-open; the cool-down doubles every time a trial call fails.
+- half_open: one trial call at a time goes through. Success closes the
+  breaker, failure opens it again.
+
+The per-call timeout adapts to the site: a multiple of the p95 latency of
+recent successful calls, clamped to [min_timeout, max_timeout].
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a site whose circuit is open"""
+
+    def __init__(self, site: str, retry_in: float):
+        super().__init__(f"Circuit for {site} is open (retry in {retry_in:.0f}s)")
+        self.site = site
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker with a rolling window and adaptive timeout"""
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = 120.0,
+        window_size: int = 50,
+        min_calls: int = 5,
+        failure_rate: float = 0.5,
+        slow_call_rate: float = 0.8,
+        slow_call_seconds: float = 20.0,
+        open_seconds: float = 30.0,
+        max_open_seconds: float = 300.0,
+        min_timeout: float = 5.0,
+        max_timeout: float = 45.0,
+        timeout_multiplier: float = 2.0
+    ):
+        """
+        Args:
+            name: Site the breaker protects
+            window_seconds: Age of the oldest call in the rolling window
+            window_size: Most calls kept in the rolling window
+            min_calls: Calls in the window before the rates can open the breaker
+            failure_rate: Failure rate that opens the breaker
+            slow_call_rate: Rate of calls slower than slow_call_seconds that opens it
+            slow_call_seconds: Latency above which a call counts as slow
+            open_seconds: First cool-down before a half-open trial
+            max_open_seconds: Cap on the doubling cool-down
+            min_timeout: Lower bound of the adaptive timeout
+            max_timeout: Upper bound, and the timeout until enough calls succeeded
+            timeout_multiplier: Adaptive timeout as a multiple of the p95 latency
+        """
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_rate = slow_call_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+
+        self._lock = threading.Lock()
+        # (finished_at, ok, latency_seconds)
+        self._calls: Deque[Tuple[float, bool, float]] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._cooldown = open_seconds
+        self._trial_in_flight = False
+        self.last_error: Optional[str] = None
+        self.times_opened = 0
+        self.rejected = 0
+
+    def _trim(self, now: float):
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _rates(self) -> Tuple[float, float]:
+        calls = len(self._calls)
+        if not calls:
+            return 0.0, 0.0
+        failures = sum(1 for _, ok, _ in self._calls if not ok)
+        slow = sum(1 for _, _, latency in self._calls if latency > self.slow_call_seconds)
+        return failures / calls, slow / calls
+
+    def _p95(self) -> Optional[float]:
+        latencies = sorted(latency for _, ok, latency in self._calls if ok)
+        if len(latencies) < self.min_calls:
+            return None
+        return latencies[min(len(latencies) - 1, math.ceil(0.95 * len(latencies)) - 1)]
+
+    def _open(self, now: float):
+        if self._state == HALF_OPEN:
+            self._cooldown = min(self._cooldown * 2, self.max_open_seconds)
+        else:
+            self._cooldown = self.open_seconds
+        self._state = OPEN
+        self._opened_at = now
+        self.times_opened += 1
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self._cooldown:
+            self._state = HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    @property
+    def timeout(self) -> float:
+        """Seconds to wait for the next call"""
+        with self._lock:
+            self._trim(time.monotonic())
+            p95 = self._p95()
+        if p95 is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p95 * self.timeout_multiplier))
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now (claims the trial slot when half-open)"""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker allows a trial call"""
+        with self._lock:
+            if self._current_state(time.monotonic()) != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self._cooldown - time.monotonic())
+
+    def record_success(self, latency: float):
+        now = time.monotonic()
+        with self._lock:
+            if self._current_state(now) == HALF_OPEN:
+                # The trial succeeded: start over with a clean window
+                self._calls.clear()
+                self._state = CLOSED
+                self._trial_in_flight = False
+            self._calls.append((now, True, latency))
+            self._check(now)
+
+    def record_failure(self, latency: float, error: str):
+        now = time.monotonic()
+        with self._lock:
+            self.last_error = error
+            state = self._current_state(now)
+            self._calls.append((now, False, latency))
+            if state == HALF_OPEN:
+                self._open(now)
+            else:
+                self._check(now)
+
+    def release(self):
+        """End an allowed call whose outcome says nothing about the site (frees the half-open trial slot)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _check(self, now: float):
+        """Open a closed breaker whose rolling rates crossed a threshold"""
+        self._trim(now)
+        if self._state != CLOSED or len(self._calls) < self.min_calls:
+            return
+        failure_rate, slow_rate = self._rates()
+        if failure_rate >= self.failure_rate or slow_rate >= self.slow_call_rate:
+            self._open(now)
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            self._trim(now)
+            failure_rate, slow_rate = self._rates()
+            p95 = self._p95()
+            retry_in = max(0.0, self._opened_at + self._cooldown - now) if state == OPEN else 0.0
+            calls = len(self._calls)
+        return {
+            "state": state,
+            "calls_in_window": calls,
+            "failure_rate": failure_rate,
+            "slow_call_rate": slow_rate,
+            "p95_latency_seconds": p95,
+            "timeout_seconds": self.timeout,
+            "retry_in_seconds": retry_in,
+            "times_opened": self.times_opened,
+            "rejected_calls": self.rejected,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,166 @@
+"""
+Incremental (Delta) Scraping
+
+Remembers, per scrape query and pushdown, when the last successful scrape
+started, which job_urls it returned and the merged result. A refresh then
+only asks upstream for postings newer than that scrape (jobspy's
+hours_old), fetches them a page at a time (jobspy's offset) and stops at
+the first page containing an already seen job_url, so its cost follows the
+number of new postings instead of the size of the result. New postings are
+merged in front of the remembered result.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Set, Tuple
+
+import pandas as pd
+
+from job_filters import Pushdown
+
+
+class QueryHistory:
+    """Last successful scrape of one query: start time, seen job_urls and merged result"""
+
+    __slots__ = ("scraped_at", "seen_urls", "df")
+
+    def __init__(self, scraped_at: float, seen_urls: Set[str], df: pd.DataFrame):
+        self.scraped_at = scraped_at
+        self.seen_urls = seen_urls
+        self.df = df
+
+
+def _urls(df: pd.DataFrame) -> Set[str]:
+    if df.empty or "job_url" not in df.columns:
+        return set()
+    return set(df["job_url"].dropna().astype(str))
+
+
+def hours_since(scraped_at: float, now: Optional[float] = None) -> int:
+    """jobspy's whole-hour hours_old covering every posting since scraped_at"""
+    now = time.time() if now is None else now
+    return max(1, math.ceil((now - scraped_at) / 3600))
+
+
+def fetch_new_postings(
+    scrape: Callable[..., pd.DataFrame],
+    history: QueryHistory,
+    page_size: int,
+    max_new: int,
+    now: Optional[float] = None
+) -> Tuple[pd.DataFrame, int, bool]:
+    """
+    Page through postings newer than history's scrape until reaching seen ones
+
+    Args:
+        scrape: scrape_jobs with the query's arguments bound
+        history: The query's previous scrape
+        page_size: Jobs requested per page
+        max_new: Most new postings fetched (later pages are not requested)
+        now: Current time (defaults to time.time())
+
+    Returns:
+        (new_df, pages, confirmed): Postings not seen before, pages requested,
+        and whether upstream answered (a page had postings or reached a seen
+        one). jobspy returns an empty page for upstream errors too, so an
+        unconfirmed delta must not move the history's scrape time forward.
+    """
+    hours_old = hours_since(history.scraped_at, now)
+    frames = []
+    found: Set[str] = set()
+    pages = 0
+    confirmed = False
+
+    while len(found) < max_new:
+        page = scrape(results_wanted=page_size, offset=pages * page_size, hours_old=hours_old)
+        pages += 1
+        if page is None or page.empty:
+            break
+        confirmed = True
+
+        urls = page["job_url"].astype(str) if "job_url" in page.columns else pd.Series("", index=page.index)
+        new = ~urls.isin(history.seen_urls) & ~urls.isin(found) & ~urls.duplicated()
+        frames.append(page[new])
+        found.update(urls[new])
+
+        # A seen posting means the rest is already known; a short page is the last one
+        if not new.all() or len(page) < page_size:
+            break
+
+    if not frames:
+        return history.df.iloc[0:0], pages, confirmed
+    new_df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    return new_df.head(max_new), pages, confirmed
+
+
+class ScrapeHistory:
+    """
+    QueryHistory by scrape query key and pushdown
+
+    Histories older than ttl are forgotten (the next scrape is a full one),
+    as are the least recently used ones beyond max_queries. A merged result
+    keeps at most max_jobs postings, newest first.
+    """
+
+    def __init__(self, ttl: float = 7 * 24 * 3600, max_queries: int = 256, max_jobs: int = 200):
+        """
+        Args:
+            ttl: Seconds after the last successful scrape a refresh may be a delta
+            max_queries: Query histories kept
+            max_jobs: Postings kept in each merged result
+        """
+        self.ttl = ttl
+        self.max_queries = max_queries
+        self.max_jobs = max_jobs
+        self._histories: "OrderedDict[Tuple[str, Pushdown], QueryHistory]" = OrderedDict()
+        self.full_scrapes = 0
+        self.delta_scrapes = 0
+        self.new_postings = 0
+
+    def get(self, key: str, pushdown: Pushdown, now: Optional[float] = None) -> Optional[QueryHistory]:
+        """The query's history, or None when the next scrape must be a full one"""
+        now = time.time() if now is None else now
+        history = self._histories.get((key, pushdown))
+        if history is None:
+            return None
+        if now - history.scraped_at > self.ttl:
+            del self._histories[(key, pushdown)]
+            return None
+        self._histories.move_to_end((key, pushdown))
+        return history
+
+    def record(self, key: str, pushdown: Pushdown, df: pd.DataFrame, scraped_at: float,
+               delta: bool = False) -> pd.DataFrame:
+        """
+        Remember a successful scrape started at scraped_at and return the merged result
+
+        A full scrape (delta=False) replaces the query's result; a delta
+        scrape's new postings are put in front of it. Only record deltas
+        fetch_new_postings confirmed, since scraped_at bounds the next one.
+        """
+        history = self._histories.get((key, pushdown)) if delta else None
+        if history is None:
+            self.full_scrapes += 1
+            merged = df.head(self.max_jobs)
+        else:
+            self.delta_scrapes += 1
+            self.new_postings += len(df)
+            merged = df if history.df.empty else (
+                history.df if df.empty else pd.concat([df, history.df], ignore_index=True)
+            )
+            merged = merged.head(self.max_jobs)
+
+        self._histories[(key, pushdown)] = QueryHistory(scraped_at, _urls(merged), merged)
+        self._histories.move_to_end((key, pushdown))
+        while len(self._histories) > self.max_queries:
+            self._histories.popitem(last=False)
+        return merged
+
+    def stats(self) -> dict:
+        return {
+            "queries": len(self._histories),
+            "full_scrapes": self.full_scrapes,
+            "delta_scrapes": self.delta_scrapes,
+            "new_postings": self.new_postings
+        }
@@ -0,0 +1,78 @@
+"""
+Export stored scraped jobs as an Arrow IPC stream or a Parquet file
+
+Reads the job store directly (no running service needed), streaming it in
+record batches so memory stays bounded.
+
+Examples:
+    python export_jobs.py --format parquet --output jobs.parquet
+    python export_jobs.py --columns site,title,company,min_amount --since 2026-10-01 > jobs.arrows
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from job_store import EXPORT_BATCH_SIZE, EXPORT_FORMATS, JobStore, export_to_file
+
+
+def main():
+    """Export command line entry point"""
+    parser = argparse.ArgumentParser(description="Export stored scraped jobs")
+    parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        default="parquet",
+        help="arrow (IPC stream) or parquet"
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="output file, or - for stdout"
+    )
+    parser.add_argument(
+        "--columns",
+        help="comma-separated columns to export (all by default)"
+    )
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        help="only jobs scraped at or after this ISO 8601 time (UTC if naive)"
+    )
+    parser.add_argument(
+        "--until",
+        type=datetime.fromisoformat,
+        help="only jobs scraped before this ISO 8601 time"
+    )
+    parser.add_argument(
+        "--store",
+        help="job store directory (JOB_STORE_PATH or backend/job_store by default)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=EXPORT_BATCH_SIZE,
+        help="rows per record batch / row group"
+    )
+    args = parser.parse_args()
+
+    store = JobStore.open(args.store)
+    if store is None:
+        parser.error("exporting jobs requires pyarrow (pip install pyarrow)")
+
+    columns = [column.strip() for column in args.columns.split(",") if column.strip()] if args.columns else None
+    try:
+        reader = store.scan(columns, args.since, args.until, args.batch_size)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.output == "-":
+        written = export_to_file(reader, args.format, sys.stdout.buffer)
+    else:
+        with open(args.output, "wb") as output:
+            written = export_to_file(reader, args.format, output)
+    print(f"Exported {written:,} bytes", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Combined Gateway
+
+Optional single-process deployment hosting both backend services in one
+ASGI application:
+
+    /jobs/...  job scraper (main.py)
+    /ml/...    career path ML service (ml_service/api/ml_server.py)
+
+so /api/scrape-jobs becomes /jobs/api/scrape-jobs and /api/predict-career-paths
+becomes /ml/api/predict-career-paths. Both apps share one middleware stack
+(CORS, gzip compression, Server-Timing metrics and per-client rate limiting),
+one thread pool for blocking work and one process, instead of two uvicorn
+processes each with its own runtime and middleware.
+
+The split mode is unchanged: main.py and ml_server.py still run on their own.
+
+Run from the backend directory:
+    python gateway.py
+or
+    uvicorn gateway:app --port 8000
+
+Environment:
+    GATEWAY_PORT            Port for `python gateway.py` (default 8000)
+    GATEWAY_THREADS         Size of the shared thread pool (default 16)
+    GATEWAY_RATE_LIMIT      Requests per second per client, 0 disables (default 0)
+    GATEWAY_RATE_BURST      Requests a client may burst (default 2 x rate)
+    GATEWAY_GZIP_MIN_SIZE   Smallest response body to compress in bytes (default 1000)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import asyncio
+import os
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+import uvicorn
+
+import main
+from ml_service.api import ml_server
+
+# main.py and ml_server.py import the ML service's helpers from the
+# ml_service directory, so these are the modules both apps use
+from utils import timing
+from utils.rate_limit import RateLimitMiddleware
+from utils.timing import ServerTimingMiddleware, stage_histograms
+
+JOBS_PREFIX = "/jobs"
+ML_PREFIX = "/ml"
+
+GATEWAY_THREADS = int(os.getenv("GATEWAY_THREADS", "16"))
+RATE_LIMIT = float(os.getenv("GATEWAY_RATE_LIMIT", "0"))
+RATE_BURST = os.getenv("GATEWAY_RATE_BURST")
+GZIP_MIN_SIZE = int(os.getenv("GATEWAY_GZIP_MIN_SIZE", "1000"))
+
+# Probes must keep answering even for a client over its rate limit
+PROBE_PATHS = [
+    f"{ML_PREFIX}/livez",
+    f"{ML_PREFIX}/readyz",
+    f"{ML_PREFIX}/health",
+    f"{JOBS_PREFIX}/",
+]
+
+# Each app's own CORS and Server-Timing middleware would repeat the shared
+# stack below (and add a second Server-Timing header), so drop them before
+# their middleware stacks are built on first use
+for mounted_app in (main.app, ml_server.app):
+    mounted_app.user_middleware.clear()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Share one thread pool and run the mounted apps' startup and shutdown"""
+    # run_in_executor(None, ...) in either app (job scraping, prediction
+    # batches, skill sessions, the profiler) now uses this pool
+    executor = ThreadPoolExecutor(max_workers=GATEWAY_THREADS, thread_name_prefix="gateway")
+    asyncio.get_running_loop().set_default_executor(executor)
+
+    # Mounted apps' lifespans are not run by Starlette, so the ML model would never load
+    async with main.app.router.lifespan_context(main.app):
+        async with ml_server.app.router.lifespan_context(ml_server.app):
+            yield
+
+    executor.shutdown(wait=False)
+
+
+app = FastAPI(
+    title="CareerCatalyst Backend Gateway",
+    description="Job scraper and career path ML service in one process",
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+# Middleware added last runs first: CORS, Server-Timing, rate limit, gzip
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)
+
+if RATE_LIMIT > 0:
+    app.add_middleware(
+        RateLimitMiddleware,
+        rate=RATE_LIMIT,
+        burst=float(RATE_BURST) if RATE_BURST else None,
+        exempt_paths=PROBE_PATHS
+    )
+
+# Per-stage Server-Timing headers and histograms (disable with SERVER_TIMING=0)
+app.add_middleware(ServerTimingMiddleware)
+
+# Allow all origins for development
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["Server-Timing", "Retry-After"],
+)
+
+
+@app.get("/")
+async def root():
+    """Gateway information"""
+    return {
+        "status": "online",
+        "service": "CareerCatalyst Backend Gateway",
+        "mounts": {
+            "jobs": f"{JOBS_PREFIX}/",
+            "ml": f"{ML_PREFIX}/"
+        },
+        "rate_limit_per_second": RATE_LIMIT or None,
+        "thread_pool_size": GATEWAY_THREADS
+    }
+
+
+@app.get("/metrics/stages")
+async def stage_metrics():
+    """Per-stage latency histograms of both services since startup (milliseconds)"""
+    return {
+        "enabled": timing.ENABLED,
+        "stages": stage_histograms.snapshot()
+    }
+
+
+app.mount(JOBS_PREFIX, main.app)
+app.mount(ML_PREFIX, ml_server.app)
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("GATEWAY_PORT", "8000")))
@@ -0,0 +1,176 @@
+"""
+Job Facet Counters
+
+Counts of scraped jobs by site, job type, remote flag, location and salary
+bucket, kept up to date as jobs are ingested instead of being recomputed by
+scanning every job per request. Counts are kept globally (each job_url once)
+and per scrape query (sites + search term + location). A job expires
+`ttl` seconds after it was last scraped, and its counts are decremented
+then.
+"""
+
+import heapq
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+FACET_FIELDS = ("site", "job_type", "is_remote", "location", "salary_bucket")
+
+# Value counted for jobs missing a facet field
+UNKNOWN = "unknown"
+
+
+def query_key(site_names: Iterable[str], search_term: str, location: Optional[str]) -> str:
+    """Normalized key identifying one scrape query"""
+    sites = ",".join(sorted({site.strip().lower() for site in site_names}))
+    return f"{sites}|{search_term.strip().lower()}|{(location or '').strip().lower()}"
+
+
+def facet_values(job: dict) -> Tuple[str, ...]:
+    """A job's value for each facet field, as strings"""
+    values = []
+    for field in FACET_FIELDS:
+        value = job.get(field)
+        if value is None or value == "":
+            values.append(UNKNOWN)
+        elif isinstance(value, bool):
+            values.append("true" if value else "false")
+        else:
+            values.append(str(value))
+    return tuple(values)
+
+
+class FacetCounts:
+    """Job count plus one Counter per facet field"""
+
+    __slots__ = ("total", "counts")
+
+    def __init__(self):
+        self.total = 0
+        self.counts: Dict[str, Counter] = {field: Counter() for field in FACET_FIELDS}
+
+    def add(self, values: Tuple[str, ...], change: int):
+        self.total += change
+        for field, value in zip(FACET_FIELDS, values):
+            counter = self.counts[field]
+            counter[value] += change
+            if counter[value] <= 0:
+                del counter[value]
+
+    def as_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "facets": {field: dict(counter.most_common()) for field, counter in self.counts.items()}
+        }
+
+
+class _IndexedJob:
+    __slots__ = ("values", "queries", "expires")
+
+    def __init__(self, values: Tuple[str, ...], expires: float):
+        self.values = values
+        self.queries = set()
+        self.expires = expires
+
+
+class FacetIndex:
+    """
+    Incrementally maintained global and per-query facet counts
+
+    ingest() costs O(facet fields) per job, reads cost O(distinct facet
+    values) regardless of how many jobs are indexed, and expired jobs are
+    removed lazily from a deadline heap holding one entry per indexed job
+    (refreshed jobs are pushed back when their old deadline comes up).
+    """
+
+    def __init__(self, ttl: float = 24 * 3600):
+        """
+        Args:
+            ttl: Seconds a job stays counted after it was last scraped
+        """
+        self.ttl = ttl
+        self.global_counts = FacetCounts()
+        self.query_counts: Dict[str, FacetCounts] = {}
+        self._jobs: Dict[str, _IndexedJob] = {}
+        self._deadlines: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def _count(self, job: _IndexedJob, change: int):
+        self.global_counts.add(job.values, change)
+        for key in job.queries:
+            counts = self.query_counts.get(key)
+            if counts is None:
+                counts = self.query_counts[key] = FacetCounts()
+            counts.add(job.values, change)
+            if not counts.total:
+                del self.query_counts[key]
+
+    def expire(self, now: Optional[float] = None):
+        """Decrement the counts of every job whose ttl has passed"""
+        now = time.time() if now is None else now
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            deadline, url = heapq.heappop(deadlines)
+            job = self._jobs[url]
+            if job.expires <= now:
+                self._count(job, -1)
+                del self._jobs[url]
+            else:
+                # Scraped again since this entry was pushed
+                heapq.heappush(deadlines, (job.expires, url))
+
+    def ingest(self, jobs: List[dict], key: str, now: Optional[float] = None) -> int:
+        """
+        Count the jobs returned for one scrape query
+
+        Jobs seen before have their expiry refreshed, are added to this query
+        and are recounted if a facet value changed. Jobs without a job_url
+        cannot be deduplicated and are skipped.
+
+        Returns:
+            int: Number of jobs counted
+        """
+        now = time.time() if now is None else now
+        self.expire(now)
+        expires = now + self.ttl
+
+        counted = 0
+        for job in jobs:
+            url = job.get("job_url")
+            if not url or url == "#":
+                continue
+            counted += 1
+
+            values = facet_values(job)
+            indexed = self._jobs.get(url)
+            if indexed is None:
+                indexed = self._jobs[url] = _IndexedJob(values, expires)
+                indexed.queries.add(key)
+                self._count(indexed, 1)
+                heapq.heappush(self._deadlines, (expires, url))
+            else:
+                if indexed.values != values:
+                    self._count(indexed, -1)
+                    indexed.values = values
+                    indexed.queries.add(key)
+                    self._count(indexed, 1)
+                elif key not in indexed.queries:
+                    indexed.queries.add(key)
+                    counts = self.query_counts.get(key)
+                    if counts is None:
+                        counts = self.query_counts[key] = FacetCounts()
+                    counts.add(values, 1)
+                indexed.expires = expires
+
+        return counted
+
+    def facets(self, key: Optional[str] = None, now: Optional[float] = None) -> dict:
+        """Global facet counts, or those of one scrape query when key is given"""
+        self.expire(now)
+        if key is None:
+            return self.global_counts.as_dict()
+        counts = self.query_counts.get(key)
+        return counts.as_dict() if counts is not None else FacetCounts().as_dict()
@@ -0,0 +1,235 @@
+"""
+Server-Side Job Filters
+
+Turns ScrapeParams.job_types and work_location_types into:
+
+- arguments pushed down into jobspy's scrape_jobs where it supports them
+  (a single job_type, and is_remote when only remote jobs are wanted), so
+  the upstream sites return fewer, already filtered pages;
+- a vectorized DataFrame filter for everything else, applied before the
+  DataFrame is converted to records.
+
+ScrapeCache keeps recent scrape results so a narrower query (same search,
+more filters) is answered by filtering a cached broader result instead of
+scraping again.
+"""
+
+import time
+from collections import OrderedDict
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+
+# Client labels (job-scraper.tsx) and jobspy values to jobspy's job_type value
+JOB_TYPES = {
+    "fulltime": "fulltime",
+    "parttime": "parttime",
+    "contract": "contract",
+    "contractor": "contract",
+    "temporary": "temporary",
+    "internship": "internship",
+}
+
+# Client work location labels
+WORK_LOCATIONS = {
+    "remote": "remote",
+    "onsite": "onsite",
+    "hybrid": "hybrid",
+}
+
+# Text columns searched for the word "hybrid" (jobspy has no hybrid flag)
+HYBRID_COLUMNS = ("title", "location", "description")
+
+# (job_type, is_remote) passed to scrape_jobs; None means not pushed down
+Pushdown = Tuple[Optional[str], Optional[bool]]
+
+
+def _normalize(label: str) -> str:
+    """'Full-time' -> 'fulltime', 'On-site' -> 'onsite'"""
+    return "".join(ch for ch in label.lower() if ch.isalnum())
+
+
+def _parse(labels: Optional[Iterable[str]], known: dict, name: str) -> FrozenSet[str]:
+    values = set()
+    for label in labels or []:
+        value = known.get(_normalize(label))
+        if value is None:
+            raise ValueError(f"Unknown {name} '{label}'")
+        values.add(value)
+    return frozenset(values)
+
+
+def _text(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series("", index=df.index)
+    return df[column].fillna("").astype(str)
+
+
+class JobFilters:
+    """Requested job types and work location types (empty sets match everything)"""
+
+    __slots__ = ("job_types", "work_locations")
+
+    def __init__(self, job_types: FrozenSet[str] = frozenset(), work_locations: FrozenSet[str] = frozenset()):
+        self.job_types = job_types
+        self.work_locations = work_locations
+
+    @classmethod
+    def from_params(cls, job_types: Optional[List[str]], work_location_types: Optional[List[str]]) -> "JobFilters":
+        """
+        Parse the request's filter labels
+
+        Raises:
+            ValueError: For a job type or work location type that is not supported
+        """
+        return cls(
+            _parse(job_types, JOB_TYPES, "job type"),
+            _parse(work_location_types, WORK_LOCATIONS, "work location type")
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.job_types or self.work_locations)
+
+    @property
+    def pushdown(self) -> Pushdown:
+        """The part of these filters scrape_jobs can apply upstream"""
+        job_type = next(iter(self.job_types)) if len(self.job_types) == 1 else None
+        is_remote = True if self.work_locations == {"remote"} else None
+        return job_type, is_remote
+
+    def scrape_kwargs(self) -> dict:
+        """Keyword arguments pushing these filters into scrape_jobs"""
+        job_type, is_remote = self.pushdown
+        kwargs = {}
+        if job_type is not None:
+            kwargs["job_type"] = job_type
+        if is_remote is not None:
+            kwargs["is_remote"] = is_remote
+        return kwargs
+
+    def covered_by(self, pushdown: Pushdown) -> bool:
+        """Whether a result scraped with pushdown contains every job these filters want"""
+        job_type, is_remote = pushdown
+        return (
+            (job_type is None or self.job_types == {job_type}) and
+            (is_remote is None or self.work_locations == {"remote"})
+        )
+
+    def apply(self, df: pd.DataFrame, pushdown: Pushdown = (None, None)) -> pd.DataFrame:
+        """
+        Rows of a scrape_jobs DataFrame matching these filters
+
+        Rows missing a job type or remote flag only pass a filter the
+        upstream scrape already applied (pushdown), since the site vouched
+        for them.
+        """
+        if not self or df.empty:
+            return df
+
+        pushed_type, pushed_remote = pushdown
+        mask = pd.Series(True, index=df.index)
+
+        if self.job_types:
+            # jobspy joins several types per job ("fulltime, contract"); the
+            # mock jobs say "Full Time"
+            types = _text(df, "job_type").str.lower().str.replace(r"[^a-z0-9,]", "", regex=True)
+            type_mask = types.str.contains("|".join(sorted(self.job_types)), regex=True)
+            if pushed_type is not None:
+                type_mask |= types == ""
+            mask &= type_mask
+
+        if self.work_locations:
+            remote_flag = df["is_remote"] if "is_remote" in df.columns else pd.Series(None, index=df.index, dtype=object)
+            remote = remote_flag.fillna(False).astype(bool)
+            hybrid = pd.Series(False, index=df.index)
+            for column in HYBRID_COLUMNS:
+                hybrid |= _text(df, column).str.contains(r"\bhybrid\b", case=False, regex=True)
+
+            location_mask = pd.Series(False, index=df.index)
+            if "remote" in self.work_locations:
+                location_mask |= remote
+                if pushed_remote:
+                    location_mask |= remote_flag.isna()
+            if "hybrid" in self.work_locations:
+                location_mask |= hybrid & ~remote
+            if "onsite" in self.work_locations:
+                location_mask |= ~remote & ~hybrid
+            mask &= location_mask
+
+        return df[mask]
+
+
+class ScrapeCache:
+    """
+    Recent scrape results by query and pushdown, with a TTL
+
+    find() prefers a result scraped with exactly the request's pushdown
+    (most relevant rows), then any broader one that still covers it and
+    keeps enough rows once filtered.
+    Expired results stay until evicted, for callers that prefer stale data
+    to none (a site whose circuit is open).
+    """
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 64):
+        """
+        Args:
+            ttl: Seconds a scrape result may be reused (unless stale data is allowed)
+            max_entries: Results kept (least recently used are dropped)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Pushdown], Tuple[float, pd.DataFrame]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def find(
+        self,
+        key: str,
+        filters: JobFilters,
+        allow_stale: bool = False,
+        min_rows: int = 0
+    ) -> Optional[Tuple[pd.DataFrame, Pushdown]]:
+        """
+        A cached result for query key that covers filters, with the pushdown it was scraped with
+
+        Args:
+            key: Scrape query key
+            filters: The request's filters
+            allow_stale: Also return results older than the TTL
+            min_rows: Rows a broader (equally capped) result must keep once
+                filtered, so a selective filter is not answered with a few
+                leftovers where its own scrape would return a full page. A
+                broader result shorter than min_rows was not capped and
+                already holds every match.
+        """
+        now = time.time()
+        candidates = [filters.pushdown, (None, None)] + [
+            pushdown for cached_key, pushdown in list(self._entries) if cached_key == key
+        ]
+        for pushdown in candidates:
+            entry = self._entries.get((key, pushdown))
+            if entry is None:
+                continue
+            stored_at, df = entry
+            if now - stored_at > self.ttl and not allow_stale:
+                continue
+            if not filters.covered_by(pushdown):
+                continue
+            if (
+                pushdown != filters.pushdown and len(df) >= min_rows and
+                len(filters.apply(df, pushdown)) < min_rows
+            ):
+                continue
+            self._entries.move_to_end((key, pushdown))
+            self.hits += 1
+            return df, pushdown
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, pushdown: Pushdown, df: pd.DataFrame):
+        self._entries[(key, pushdown)] = (time.time(), df)
+        self._entries.move_to_end((key, pushdown))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
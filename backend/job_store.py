@@ -0,0 +1,376 @@
+"""
+Columnar Job Store and Export
+
+Every real scrape's jobspy DataFrame is appended, as it comes, to a
+directory of Parquet files partitioned by scrape day
+(scraped_date=YYYY-MM-DD/part-*.parquet), with the time of the scrape and
+its query key. Exports scan that directory as a pyarrow dataset: only the
+requested columns are read, days outside the time range are skipped, and
+rows are streamed as Arrow IPC record batches or Parquet row groups of at
+most batch_size rows, so memory stays bounded whatever the store's size.
+
+A posting is stored once per scrape that returned it (delta refreshes
+only store new postings). Every scrape lands in its own small part file;
+compact() merges each day's part files into one file of large row groups,
+so the file count grows with days, not scrapes.
+
+Requires pyarrow; without it the store is disabled (JobStore.open returns
+None).
+"""
+
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+EXPORT_FORMATS = ("arrow", "parquet")
+
+# Rows per exported record batch / Parquet row group
+EXPORT_BATCH_SIZE = 65536
+
+# Part files the current day may collect before compact() merges them
+# (earlier days are merged as soon as they have more than one)
+COMPACT_MIN_FILES = 32
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "job_store")
+
+if pa is not None:
+    # Stored columns: the jobspy columns the backend reads, plus scrape metadata
+    SCHEMA = pa.schema([
+        ("scraped_at", pa.timestamp("ms", tz="UTC")),
+        ("query", pa.string()),
+        ("site", pa.string()),
+        ("job_url", pa.string()),
+        ("title", pa.string()),
+        ("company", pa.string()),
+        ("location", pa.string()),
+        ("date_posted", pa.date32()),
+        ("job_type", pa.string()),
+        ("is_remote", pa.bool_()),
+        ("min_amount", pa.float64()),
+        ("max_amount", pa.float64()),
+        ("currency", pa.string()),
+        ("interval", pa.string()),
+        ("description", pa.string()),
+    ])
+    PARTITIONING = ds.partitioning(pa.schema([("scraped_date", pa.date32())]), flavor="hive")
+
+
+def _column(df: pd.DataFrame, name: str, type) -> "pa.Array":
+    """A jobspy column converted to its stored type (missing columns are all null)"""
+    if name not in df.columns:
+        return pa.nulls(len(df), type)
+    values = df[name]
+    if pa.types.is_string(type):
+        # jobspy's enum columns (job_type, interval) stringify like any other value
+        return pa.array(values.astype("string"), type=type)
+    if pa.types.is_date(type):
+        return pa.array(pd.to_datetime(values, errors="coerce"), type=pa.timestamp("ms")).cast(type)
+    if pa.types.is_floating(type):
+        return pa.array(pd.to_numeric(values, errors="coerce"), type=type, from_pandas=True)
+    if pa.types.is_boolean(type):
+        missing = values.isna().to_numpy()
+        return pa.array(values.where(~missing, False).astype(bool).to_numpy(), type=type, mask=missing)
+    return pa.array(values, type=type, from_pandas=True)
+
+
+def _coalesce(batches: Iterable["pa.RecordBatch"], batch_size: int) -> Iterator["pa.RecordBatch"]:
+    """Regroup record batches (one per small part file) into batches of up to batch_size rows"""
+    pending: List[pa.RecordBatch] = []
+    rows = 0
+    for batch in batches:
+        if not batch.num_rows:
+            continue
+        pending.append(batch)
+        rows += batch.num_rows
+        if rows >= batch_size:
+            table = pa.Table.from_batches(pending).combine_chunks()
+            for start in range(0, table.num_rows - table.num_rows % batch_size, batch_size):
+                yield from table.slice(start, batch_size).to_batches()
+            pending = table.slice(table.num_rows - table.num_rows % batch_size).to_batches()
+            rows = sum(batch.num_rows for batch in pending)
+    if pending:
+        yield from pa.Table.from_batches(pending).combine_chunks().to_batches()
+
+
+@contextmanager
+def _partition_lock(directory: str) -> Iterator[bool]:
+    """
+    Exclusive, non-blocking lock on a day directory for compaction
+
+    Yields whether the lock was acquired; another process compacting the
+    same day holds it until it is done. The OS releases it if that process
+    dies.
+    """
+    with open(os.path.join(directory, ".compact.lock"), "a+b") as lock:
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class _ChunkSink:
+    """Write-only file object collecting what a writer wrote since the last drain()"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class JobStore:
+    """Scraped jobs in a day-partitioned Parquet directory"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Store directory (created if missing)
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    @classmethod
+    def open(cls, path: Optional[str] = None) -> Optional["JobStore"]:
+        """The store at path (JOB_STORE_PATH by default), or None without pyarrow"""
+        if pa is None:
+            return None
+        return cls(path or os.getenv("JOB_STORE_PATH", DEFAULT_STORE_PATH))
+
+    def append(self, df: pd.DataFrame, query: str, scraped_at: Optional[float] = None) -> int:
+        """
+        Store the jobs of one scrape as a new part file
+
+        Part files are written under a temporary name and renamed, so
+        concurrent exports and writers in other processes never see a
+        partial file.
+
+        Returns:
+            int: Number of jobs stored
+        """
+        if df is None or df.empty:
+            return 0
+        scraped_at = time.time() if scraped_at is None else scraped_at
+        scraped = datetime.fromtimestamp(scraped_at, tz=timezone.utc)
+
+        columns = [
+            pa.array([scraped] * len(df), type=SCHEMA.field("scraped_at").type),
+            pa.array([query] * len(df), type=pa.string()),
+        ] + [_column(df, field.name, field.type) for field in SCHEMA][2:]
+        table = pa.Table.from_arrays(columns, schema=SCHEMA)
+
+        directory = os.path.join(self.path, f"scraped_date={scraped.date().isoformat()}")
+        os.makedirs(directory, exist_ok=True)
+        name = f"part-{int(scraped_at * 1000)}-{uuid.uuid4().hex[:8]}.parquet"
+        temporary = os.path.join(directory, f".{name}.tmp")
+        pq.write_table(table, temporary)
+        os.replace(temporary, os.path.join(directory, name))
+        return table.num_rows
+
+    def compact(self, min_files: int = COMPACT_MIN_FILES, now: Optional[float] = None) -> int:
+        """
+        Merge each day's part files into one
+
+        Earlier days no longer receive scrapes and are merged whenever they
+        have more than one part file; the current (UTC) day only once it has
+        min_files. Merged files keep the parts' row order and are written in
+        row groups of EXPORT_BATCH_SIZE rows. A day is merged under an
+        exclusive file lock, so API processes compacting the same store never
+        merge the same parts twice (a day locked by another process is
+        skipped). Only the part files listed under the lock are removed, so
+        parts appended meanwhile are kept for the next compaction. An export
+        running during a merge can fail on a removed part file and has to be
+        retried.
+
+        Returns:
+            int: Number of part files merged away
+        """
+        now = time.time() if now is None else now
+        today = f"scraped_date={datetime.fromtimestamp(now, tz=timezone.utc).date().isoformat()}"
+        merged = 0
+        for day in sorted(os.listdir(self.path)):
+            directory = os.path.join(self.path, day)
+            if not day.startswith("scraped_date=") or not os.path.isdir(directory):
+                continue
+            with _partition_lock(directory) as locked:
+                if locked:
+                    merged += self._compact_day(directory, min_files if day == today else 2)
+        return merged
+
+    def _compact_day(self, directory: str, min_files: int) -> int:
+        """Merge one day's part files if it has at least min_files; returns the files merged away"""
+        # Part names start with the scrape time, so sorting keeps scrape order
+        parts = sorted(name for name in os.listdir(directory) if name.startswith("part-"))
+        if len(parts) < min_files:
+            return 0
+
+        # Named after its earliest part, so it sorts before parts appended later
+        name = f"part-{parts[0].split('-')[1]}-{uuid.uuid4().hex[:8]}.parquet"
+        temporary = os.path.join(directory, f".{name}.tmp")
+        with pq.ParquetWriter(temporary, SCHEMA) as writer:
+            # Buffer parts into full row groups instead of one small group per part
+            pending: List[pa.Table] = []
+            rows = 0
+            for part in parts:
+                table = pq.read_table(os.path.join(directory, part), schema=SCHEMA)
+                pending.append(table)
+                rows += table.num_rows
+                if rows >= EXPORT_BATCH_SIZE:
+                    buffered = pa.concat_tables(pending)
+                    full = rows - rows % EXPORT_BATCH_SIZE
+                    writer.write_table(buffered.slice(0, full), row_group_size=EXPORT_BATCH_SIZE)
+                    pending, rows = [buffered.slice(full)], rows - full
+            if pending:
+                writer.write_table(pa.concat_tables(pending), row_group_size=EXPORT_BATCH_SIZE)
+        os.replace(temporary, os.path.join(directory, name))
+        for part in parts:
+            os.remove(os.path.join(directory, part))
+        return len(parts) - 1
+
+    def scan(
+        self,
+        columns: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> "pa.RecordBatchReader":
+        """
+        Stream the stored jobs scraped in [since, until) as record batches
+
+        Args:
+            columns: Columns to read (all stored columns by default)
+            since: Earliest scrape time (timezone-aware, or naive UTC)
+            until: Scrape time to stop before
+            batch_size: Most rows per batch
+
+        Raises:
+            ValueError: For a column that is not stored
+        """
+        columns = list(columns) if columns else SCHEMA.names
+        unknown = [column for column in columns if column not in SCHEMA.names]
+        if unknown:
+            raise ValueError(f"Unknown columns {unknown}; stored columns are {SCHEMA.names}")
+
+        # Partition (day) and row filters: whole days outside the range are never opened
+        conditions = []
+        for bound, before in ((since, False), (until, True)):
+            if bound is None:
+                continue
+            if bound.tzinfo is None:
+                bound = bound.replace(tzinfo=timezone.utc)
+            bound = bound.astimezone(timezone.utc)
+            scalar = pa.scalar(bound, type=SCHEMA.field("scraped_at").type)
+            if before:
+                conditions += [ds.field("scraped_date") <= bound.date(), ds.field("scraped_at") < scalar]
+            else:
+                conditions += [ds.field("scraped_date") >= bound.date(), ds.field("scraped_at") >= scalar]
+        row_filter = None
+        for condition in conditions:
+            row_filter = condition if row_filter is None else row_filter & condition
+
+        schema = pa.schema([SCHEMA.field(column) for column in columns])
+        dataset = ds.dataset(
+            self.path,
+            schema=pa.schema(list(SCHEMA) + [pa.field("scraped_date", pa.date32())]),
+            format="parquet",
+            partitioning=PARTITIONING,
+            exclude_invalid_files=False,
+            ignore_prefixes=["."]
+        )
+        batches = dataset.to_batches(
+            columns=columns,
+            filter=row_filter,
+            batch_size=batch_size,
+            batch_readahead=2,
+            fragment_readahead=2
+        )
+        return pa.RecordBatchReader.from_batches(schema, _coalesce(batches, batch_size))
+
+
+def export_chunks(reader: "pa.RecordBatchReader", export_format: str) -> Iterator[bytes]:
+    """
+    Encode a batch stream as an Arrow IPC stream or a Parquet file, chunk by chunk
+
+    Each chunk holds about one record batch, so the encoded export is never
+    held in memory.
+    """
+    sink = _ChunkSink()
+    if export_format == "arrow":
+        writer = ipc.new_stream(sink, reader.schema)
+        write = writer.write_batch
+    elif export_format == "parquet":
+        writer = pq.ParquetWriter(sink, reader.schema)
+        write = lambda batch: writer.write_table(pa.Table.from_batches([batch]))
+    else:
+        raise ValueError(f"Unknown export format '{export_format}'")
+
+    try:
+        for batch in reader:
+            write(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_to_file(reader: "pa.RecordBatchReader", export_format: str, output: BinaryIO) -> int:
+    """Write an export to a binary file object; returns the bytes written"""
+    written = 0
+    for chunk in export_chunks(reader, export_format):
+        output.write(chunk)
+        written += len(chunk)
+    return written
@@ -1,11 +1,43 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Union
+from datetime import datetime
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+import time
 import uvicorn
 from jobspy import scrape_jobs
 import math
 
+import pandas as pd
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from delta_scrape import ScrapeHistory, fetch_new_postings
+from job_facets import FacetIndex, query_key
+from job_filters import JobFilters, ScrapeCache
+from job_store import EXPORT_FORMATS, JobStore, export_chunks
+from scrape_queue import DONE, ScrapeQueue, default_queue_path
+
+# The ML service's modules import each other from the ml_service directory
+# (utils.*, inference); import its helpers the same way, so a process hosting
+# both services (gateway.py) loads each module once
+ML_SERVICE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ml_service")
+if ML_SERVICE_DIR not in sys.path:
+    sys.path.append(ML_SERVICE_DIR)
+
+from utils import timing
+from utils.job_ranker import JobRanker
+from utils.profiler import admin_router
+from utils.timing import ServerTimingMiddleware, stage, stage_histograms
+
 app = FastAPI()
 
 # Allow all origins for development
@@ -15,14 +47,45 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Per-stage Server-Timing headers and histograms (disable with SERVER_TIMING=0)
+app.add_middleware(ServerTimingMiddleware)
+
+# Token-protected /admin/profile and /admin/memory (enabled by ADMIN_TOKEN)
+app.include_router(admin_router())
+
 class ScrapeParams(BaseModel):
     site_name: Union[str, List[str]]
     search_term: str
     location: Optional[str] = None
     job_types: Optional[List[str]] = None
     work_location_types: Optional[List[str]] = None
+    # When given, jobs are sorted by relevance to these skills and get a match_score
+    user_skills: Optional[List[str]] = None
+
+# Vectorizer of the trained career model, loaded at startup (None if no model is exported)
+job_ranker: Optional[JobRanker] = None
+
+@app.on_event("startup")
+async def load_job_ranker():
+    """Load the career model's vectorizer for ranking jobs by the user's skills"""
+    global job_ranker
+    try:
+        job_ranker = JobRanker.from_model_dir()
+    except Exception as e:
+        print(f"Could not load job ranker: {e}")
+    if job_ranker is None:
+        print("No exported career model found; user_skills will not rank jobs")
+
+def rank_jobs(jobs, user_skills):
+    """Sort jobs by relevance to user_skills when both a ranker and skills are available"""
+    skills = [skill.strip() for skill in user_skills or [] if skill.strip()]
+    if job_ranker is None or not skills:
+        return jobs
+    with stage("rank"):
+        return job_ranker.rank(jobs, skills)
 
 def sanitize_floats(obj):
     """Sanitize NaN and infinity values for JSON serialization"""
@@ -60,6 +123,229 @@ def format_salary(min_amount, max_amount, currency):
     except:
         return "Salary not disclosed"
 
+# Upper bounds of the yearly salary facet buckets (the last bucket is unbounded)
+SALARY_BUCKETS = [50000, 100000, 150000, 200000]
+
+# Pay periods per year for jobspy's compensation intervals (full-time, like jobspy's own annualization)
+INTERVALS_PER_YEAR = {"yearly": 1, "monthly": 12, "weekly": 52, "daily": 260, "hourly": 2080}
+
+def salary_bucket(min_amount, max_amount, currency, interval=None):
+    """
+    Salary facet bucket from the same jobspy columns format_salary reads
+    
+    Amounts are annualized by the posting's pay interval first, so hourly
+    and monthly postings land in the same buckets as yearly ones. A missing
+    or unrecognized interval is taken as yearly.
+    """
+    # Handle None/NaN values
+    amounts = [
+        amount for amount in (min_amount, max_amount)
+        if amount is not None and not (isinstance(amount, float) and math.isnan(amount))
+    ]
+    if not amounts:
+        return "Not disclosed"
+    if not currency:
+        currency = "USD"
+    
+    # Bucket by the midpoint of the range, per year
+    interval = getattr(interval, "value", interval)
+    per_year = INTERVALS_PER_YEAR.get(interval.lower(), 1) if isinstance(interval, str) else 1
+    amount = sum(amounts) / len(amounts) * per_year
+    lower = 0
+    for upper in SALARY_BUCKETS:
+        if amount < upper:
+            return f"{currency} {lower // 1000}k-{upper // 1000}k"
+        lower = upper
+    return f"{currency} {lower // 1000}k+"
+
+# Jobs requested from each scrape
+RESULTS_WANTED = 25
+
+# Recent scrape results, reused to answer narrower (more filtered) queries
+scrape_cache = ScrapeCache(
+    ttl=float(os.getenv("SCRAPE_CACHE_TTL", "600")),
+    max_entries=int(os.getenv("SCRAPE_CACHE_SIZE", "64"))
+)
+
+# Last successful scrape of each query, so refreshes only fetch new postings
+scrape_history = ScrapeHistory(
+    ttl=float(os.getenv("SCRAPE_HISTORY_TTL", str(7 * 24 * 3600))),
+    max_jobs=int(os.getenv("SCRAPE_HISTORY_MAX_JOBS", "200"))
+)
+
+# Jobs requested per page of a delta refresh
+DELTA_PAGE_SIZE = 10
+
+# Every real scrape's jobs, for bulk export (None when pyarrow is not installed)
+job_store = JobStore.open()
+if job_store is None:
+    print("pyarrow is not installed; scraped jobs will not be stored for export")
+
+# Seconds between merges of the job store's per-scrape part files
+JOB_STORE_COMPACT_INTERVAL = float(os.getenv("JOB_STORE_COMPACT_INTERVAL", "3600"))
+
+async def compact_job_store():
+    """Merge the job store's part files, periodically"""
+    while True:
+        await asyncio.sleep(JOB_STORE_COMPACT_INTERVAL)
+        try:
+            merged = await asyncio.to_thread(job_store.compact)
+            if merged:
+                print(f"Compacted {merged} job store part files")
+        except Exception as e:
+            print(f"Could not compact the job store: {e}")
+
+job_store_compaction = None
+
+@app.on_event("startup")
+async def start_job_store_compaction():
+    """Start merging the job store's part files in the background"""
+    global job_store_compaction
+    if job_store is not None and JOB_STORE_COMPACT_INTERVAL > 0:
+        job_store_compaction = asyncio.create_task(compact_job_store())
+
+# One circuit breaker per job site, created on first use
+site_breakers = {}
+
+def breaker_for(site):
+    breaker = site_breakers.get(site)
+    if breaker is None:
+        breaker = site_breakers[site] = CircuitBreaker(site)
+    return breaker
+
+# Threads scraping one site at a time; a hung site only ties up its own threads
+SITE_SCRAPE_THREADS = int(os.getenv("SITE_SCRAPE_THREADS", "2"))
+
+site_executors = {}
+
+def executor_for(site):
+    executor = site_executors.get(site)
+    if executor is None:
+        executor = site_executors[site] = ThreadPoolExecutor(
+            max_workers=SITE_SCRAPE_THREADS,
+            thread_name_prefix=f"scrape-{site}"
+        )
+    return executor
+
+async def run_site_scrape(site, fetch, timeout):
+    """
+    Run a blocking scrape on the site's executor with a timeout
+    
+    The timeout starts once a thread picks the scrape up. A scrape still
+    queued after timeout seconds (every thread of the site busy, e.g. with
+    hung scrapes) is cancelled. A timed-out scrape finishes in the background.
+    
+    Returns:
+        (result, latency): fetch's result and the seconds it ran
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.create_future()
+    
+    def mark_started():
+        if not started.done():
+            started.set_result(time.perf_counter())
+    
+    def run():
+        loop.call_soon_threadsafe(mark_started)
+        return fetch()
+    
+    future = loop.run_in_executor(executor_for(site), run)
+    try:
+        start = await asyncio.wait_for(started, timeout)
+    except asyncio.TimeoutError:
+        future.cancel()
+        raise RuntimeError(f"all {SITE_SCRAPE_THREADS} scrape threads busy for {timeout:.1f}s")
+    
+    result = await asyncio.wait_for(future, max(0.0, timeout - (time.perf_counter() - start)))
+    return result, time.perf_counter() - start
+
+def check_scrape_result(site, jobs_df):
+    """
+    Raise for an empty or column-less scrape result
+    
+    jobspy logs upstream errors, blocks and rate limits and returns an empty
+    DataFrame, so a result without jobs counts as a failed scrape.
+    """
+    if jobs_df is None or jobs_df.empty or "job_url" not in jobs_df.columns:
+        raise RuntimeError(f"{site} returned no jobs (blocked, rate limited or unreachable)")
+
+async def scrape_site(site, params, filters):
+    """
+    Scrape one site through its circuit breaker, executor and the scrape cache
+    
+    Returns (DataFrame, pushdown it was scraped with). A query scraped before
+    is refreshed with a delta scrape of the postings since, merged into the
+    previous result. A site whose circuit is open, times out or fails is
+    answered from stale cached data when there is some; otherwise the error
+    is raised.
+    """
+    key = query_key([site], params.search_term, params.location)
+    cached = scrape_cache.find(key, filters, min_rows=RESULTS_WANTED)
+    if cached is not None:
+        print(f"Reusing cached {site} scrape (pushdown {cached[1]})")
+        return cached
+    
+    breaker = breaker_for(site)
+    if not breaker.allow():
+        stale = scrape_cache.find(key, filters, allow_stale=True)
+        if stale is not None:
+            print(f"Circuit for {site} is open, serving cached jobs")
+            return stale
+        raise CircuitOpenError(site, breaker.retry_in())
+    
+    scrape = partial(
+        scrape_jobs,
+        site_name=[site],
+        search_term=params.search_term,
+        location=params.location,
+        **filters.scrape_kwargs()
+    )
+    history = scrape_history.get(key, filters.pushdown)
+    if history is None:
+        fetch = partial(scrape, results_wanted=RESULTS_WANTED)
+    else:
+        fetch = partial(fetch_new_postings, scrape, history, DELTA_PAGE_SIZE, RESULTS_WANTED)
+    
+    timeout = breaker.timeout
+    scraped_at = time.time()
+    start = time.perf_counter()
+    try:
+        jobs_df, latency = await run_site_scrape(site, fetch, timeout)
+        if history is None:
+            check_scrape_result(site, jobs_df)
+    except Exception as e:
+        error = f"timed out after {timeout:.1f}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+        breaker.record_failure(min(time.perf_counter() - start, timeout), error)
+        print(f"Scraping {site} failed: {error}")
+        stale = scrape_cache.find(key, filters, allow_stale=True)
+        if stale is not None:
+            return stale
+        raise
+    
+    if history is not None:
+        jobs_df, pages, confirmed = jobs_df
+        if not confirmed:
+            # An empty first page may be a swallowed upstream error: keep the
+            # previous scrape time so the next delta covers this window again
+            breaker.release()
+            print(f"Delta scrape of {site} returned nothing, keeping the previous result")
+            return history.df.head(RESULTS_WANTED), filters.pushdown
+        print(f"Delta scrape of {site}: {len(jobs_df)} new postings in {pages} pages")
+    breaker.record_success(latency)
+    if job_store is not None:
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, job_store.append, jobs_df, key, scraped_at)
+        except Exception as e:
+            print(f"Could not store {site} jobs: {e}")
+    # The history keeps the whole merge; responses get the newest RESULTS_WANTED
+    jobs_df = scrape_history.record(key, filters.pushdown, jobs_df, scraped_at, delta=history is not None)
+    jobs_df = jobs_df.head(RESULTS_WANTED)
+    scrape_cache.put(key, filters.pushdown, jobs_df)
+    return jobs_df, filters.pushdown
+
+# Facet counts of every real job scraped within JOB_FACET_TTL seconds
+facet_index = FacetIndex(ttl=float(os.getenv("JOB_FACET_TTL", str(24 * 3600))))
+
 # Mock job data for fallback when real scraping fails
 MOCK_JOBS = [
     {
@@ -192,63 +478,115 @@ async def get_location_suggestions(q: str = ""):
     filtered = [loc for loc in all_locations if q.lower() in loc.lower()]
     return {"suggestions": filtered[:10]}
 
+def site_names_of(params):
+    """Ensure site_name is always a list"""
+    return [params.site_name] if isinstance(params.site_name, str) else params.site_name
+
+def parse_filters(params):
+    try:
+        return JobFilters.from_params(params.job_types, params.work_location_types)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.post("/api/scrape-jobs")
 async def scrape_jobs_api(params: ScrapeParams):
     print(f"Received scrape request with params: {params}")
+    filters = parse_filters(params)
+    
+    jobs, scraped = await collect_jobs(params, filters)
+    if scraped:
+        with stage("facets"):
+            facet_index.ingest(jobs, query_key(site_names_of(params), params.search_term, params.location))
+    
+    return {"jobs": jobs}
+
+async def collect_jobs(params, filters, on_site_done=None):
+    """
+    Scrape, filter, process and rank the jobs for one request
+    
+    Args:
+        params: ScrapeParams of the request
+        filters: JobFilters parsed from params
+        on_site_done: Optional callback invoked with each site name as its scrape finishes
+    
+    Returns:
+        (jobs, scraped): The response jobs, and False if they are mock fallback data
+    """
     try:
-        # Ensure site_name is always a list
-        site_names = [params.site_name] if isinstance(params.site_name, str) else params.site_name
+        site_names = site_names_of(params)
         
         print(f"Scraping from sites: {site_names}")
         print(f"Search term: {params.search_term}")
         print(f"Location: {params.location}")
 
-        # Use jobspy library for real scraping
-        jobs_df = scrape_jobs(
-            site_name=site_names,
-            search_term=params.search_term,
-            location=params.location,
-            results_wanted=25,  # Fixed at 25
-        )
+        async def scrape_and_report(site):
+            try:
+                return await scrape_site(site.lower(), params, filters)
+            finally:
+                if on_site_done is not None:
+                    on_site_done(site)
+
+        # Scrape the sites concurrently, each behind its own circuit breaker,
+        # with the filters jobspy supports pushed down
+        with stage("scrape"):
+            site_results = await asyncio.gather(
+                *(scrape_and_report(site) for site in site_names),
+                return_exceptions=True
+            )
+        
+        scraped = [result for result in site_results if not isinstance(result, BaseException)]
+        if not scraped:
+            raise site_results[0]
+
+        # Filters jobspy could not apply upstream
+        with stage("filter"):
+            frames = [filters.apply(site_df, pushdown) for site_df, pushdown in scraped]
+            jobs_df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
 
         # Convert dataframe to list of dictionaries
-        jobs_list = jobs_df.to_dict(orient="records")
+        with stage("to_records"):
+            jobs_list = jobs_df.to_dict(orient="records")
         print(f"Successfully scraped {len(jobs_list)} real jobs")
 
         # Process and standardize job data
-        processed_jobs = []
-        for job in jobs_list:
-            # Get source site information
-            site = job.get("site", "indeed").lower()
-            site_info = {
-                "linkedin": {"name": "LinkedIn", "logo": "linkedin", "color": "#0077b5"},
-                "indeed": {"name": "Indeed", "logo": "briefcase", "color": "#2557a7"}
-            }.get(site, {"name": "Indeed", "logo": "briefcase", "color": "#2557a7"})
-            
-            processed_job = {
-                "id": job.get("job_url", f"job_{len(processed_jobs)}"),
-                "title": job.get("title", "Job Title Not Available"),
-                "company": job.get("company", "Company Not Listed"),
-                "location": job.get("location", "Location Not Specified"),
-                "date_posted": job.get("date_posted", "Recently Posted"),
-                "job_url": job.get("job_url", "#"),
-                "description": job.get("description", "No description available"),
-                "salary": format_salary(job.get("min_amount"), job.get("max_amount"), job.get("currency")),
-                "site": site,
-                "source": site_info,
-                "is_remote": job.get("is_remote", False),
-                "job_type": job.get("job_type", "Full Time"),
-                "type": job.get("job_type", "Full Time"),
-                "companyIcon": "domain",
-                "companyColor": "#4285F4",
-                "saved": False,
-            }
-            processed_jobs.append(processed_job)
+        with stage("process"):
+            processed_jobs = []
+            for job in jobs_list:
+                # Get source site information
+                site = job.get("site", "indeed").lower()
+                site_info = {
+                    "linkedin": {"name": "LinkedIn", "logo": "linkedin", "color": "#0077b5"},
+                    "indeed": {"name": "Indeed", "logo": "briefcase", "color": "#2557a7"}
+                }.get(site, {"name": "Indeed", "logo": "briefcase", "color": "#2557a7"})
+                
+                processed_job = {
+                    "id": job.get("job_url", f"job_{len(processed_jobs)}"),
+                    "title": job.get("title", "Job Title Not Available"),
+                    "company": job.get("company", "Company Not Listed"),
+                    "location": job.get("location", "Location Not Specified"),
+                    "date_posted": job.get("date_posted", "Recently Posted"),
+                    "job_url": job.get("job_url", "#"),
+                    "description": job.get("description", "No description available"),
+                    "salary": format_salary(job.get("min_amount"), job.get("max_amount"), job.get("currency")),
+                    "salary_bucket": salary_bucket(
+                        job.get("min_amount"), job.get("max_amount"), job.get("currency"), job.get("interval")
+                    ),
+                    "site": site,
+                    "source": site_info,
+                    "is_remote": job.get("is_remote", False),
+                    "job_type": job.get("job_type", "Full Time"),
+                    "type": job.get("job_type", "Full Time"),
+                    "companyIcon": "domain",
+                    "companyColor": "#4285F4",
+                    "saved": False,
+                }
+                processed_jobs.append(processed_job)
 
         # Sanitize floats (NaN/Infinity) for JSON compatibility
-        sanitized_jobs = sanitize_floats(processed_jobs)
+        with stage("sanitize"):
+            sanitized_jobs = sanitize_floats(processed_jobs)
 
-        return {"jobs": sanitized_jobs}
+        return rank_jobs(sanitized_jobs, params.user_skills), True
 
     except Exception as e:
         print(f"Error in real scraping: {e}")
@@ -258,21 +596,312 @@ async def scrape_jobs_api(params: ScrapeParams):
         search_term = params.search_term.lower()
         filtered_jobs = []
         
-        for job in MOCK_JOBS:
-            if (search_term in job["title"].lower() or 
-                search_term in job["description"].lower() or
-                search_term in job["company"].lower()):
-                filtered_jobs.append(job)
+        with stage("fallback"):
+            for job in MOCK_JOBS:
+                if (search_term in job["title"].lower() or 
+                    search_term in job["description"].lower() or
+                    search_term in job["company"].lower()):
+                    filtered_jobs.append(job)
         
         # If no specific matches, return limited mock jobs
         if not filtered_jobs:
             filtered_jobs = MOCK_JOBS[:5]  # Just return 5 jobs as fallback
+        
+        if filters:
+            filtered_jobs = filters.apply(pd.DataFrame(filtered_jobs)).to_dict(orient="records")
+        
+        filtered_jobs = rank_jobs(filtered_jobs, params.user_skills)
             
-        # Limit results based on params.results_wanted
-        if params.results_wanted:
-            filtered_jobs = filtered_jobs[:params.results_wanted]
+        # Limit results to what a real scrape would return
+        filtered_jobs = filtered_jobs[:RESULTS_WANTED]
             
-        return {"jobs": filtered_jobs}
+        return filtered_jobs, False
+
+# Scraper worker processes running queued asynchronous scrapes (0 disables the async API)
+SCRAPE_WORKERS = int(os.getenv("SCRAPE_WORKERS", "0"))
+
+# Seconds an idle worker waits before checking the queue again
+SCRAPE_POLL_INTERVAL = 0.5
+
+# Seconds a claimed scrape stays with its worker without a heartbeat
+SCRAPE_LEASE_SECONDS = float(os.getenv("SCRAPE_LEASE_SECONDS", "120"))
+
+# Seconds between checks for dead workers and purges of old scrapes
+SCRAPE_MAINTENANCE_INTERVAL = 30.0
+
+# Durable queue of asynchronous scrapes and the workers draining it, set up at startup
+scrape_queue: Optional[ScrapeQueue] = None
+scrape_worker_stop = None
+scrape_workers = []
+scrape_maintenance: Optional[asyncio.Task] = None
+
+def scrape_site_status():
+    """This process's circuit breakers, scrape cache and delta history"""
+    return {
+        "sites": {site: breaker.snapshot() for site, breaker in site_breakers.items()},
+        "cache": {"hits": scrape_cache.hits, "misses": scrape_cache.misses},
+        "history": scrape_history.stats()
+    }
+
+def scrape_worker(queue_path, stop_event):
+    """Entry point of a scraper worker process"""
+    queue = ScrapeQueue(queue_path, lease_seconds=SCRAPE_LEASE_SECONDS)
+    asyncio.run(run_scrape_worker(queue, stop_event))
+
+async def run_scrape_worker(queue, stop_event):
+    """Claim queued scrapes and run them until stop_event is set"""
+    await load_job_ranker()
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    heartbeat_interval = queue.lease_seconds / 4
+    last_report = 0.0
+    
+    async def heartbeat(task_id):
+        """Renew the task's lease and republish this worker's status while it scrapes"""
+        while True:
+            await asyncio.sleep(heartbeat_interval)
+            queue.heartbeat(task_id, worker)
+            queue.report_worker(worker, scrape_site_status())
+    
+    while not stop_event.is_set():
+        # Breakers live in this process; publish them for the API's /api/scrape-status
+        if time.monotonic() - last_report >= heartbeat_interval:
+            queue.report_worker(worker, scrape_site_status())
+            last_report = time.monotonic()
+        
+        task = queue.claim(worker)
+        if task is None:
+            await asyncio.sleep(SCRAPE_POLL_INTERVAL)
+            continue
+        
+        print(f"Worker {worker} running scrape {task['id']}")
+        beating = asyncio.create_task(heartbeat(task["id"]))
+        try:
+            params = ScrapeParams(**task["params"])
+            filters = JobFilters.from_params(params.job_types, params.work_location_types)
+            sites_done = 0
+            
+            def report_site(site):
+                nonlocal sites_done
+                sites_done += 1
+                queue.set_progress(task["id"], sites_done)
+            
+            jobs, scraped = await collect_jobs(params, filters, on_site_done=report_site)
+            queue.complete(task["id"], {"jobs": jsonable_encoder(jobs)}, scraped)
+        except Exception as e:
+            print(f"Scrape {task['id']} failed: {e}")
+            queue.fail(task["id"], str(e))
+        finally:
+            beating.cancel()
+        last_report = 0.0
+
+def start_scrape_worker(context, index):
+    process = context.Process(
+        target=scrape_worker,
+        args=(scrape_queue.path, scrape_worker_stop),
+        name=f"scrape-worker-{index}",
+        daemon=True
+    )
+    process.start()
+    return process
+
+async def maintain_scrape_workers(context):
+    """Replace worker processes that died and purge old scrapes, periodically"""
+    while True:
+        await asyncio.sleep(SCRAPE_MAINTENANCE_INTERVAL)
+        for i, process in enumerate(scrape_workers):
+            if not process.is_alive() and not scrape_worker_stop.is_set():
+                # Its scrape, if any, is requeued once the lease runs out
+                print(f"Scrape worker {process.name} exited with {process.exitcode}, restarting it")
+                scrape_workers[i] = start_scrape_worker(context, i)
+        try:
+            purged = await asyncio.to_thread(scrape_queue.purge)
+            if purged:
+                print(f"Purged {purged} old scrapes")
+        except Exception as e:
+            print(f"Could not purge the scrape queue: {e}")
+
+@app.on_event("startup")
+async def start_scrape_workers():
+    """Open the scrape queue, requeue work interrupted by a restart and start the workers"""
+    global scrape_queue, scrape_worker_stop, scrape_maintenance
+    if SCRAPE_WORKERS <= 0:
+        return
+    
+    scrape_queue = ScrapeQueue(default_queue_path(), lease_seconds=SCRAPE_LEASE_SECONDS)
+    requeued = await asyncio.to_thread(scrape_queue.recover)
+    if requeued:
+        print(f"Requeued {requeued} interrupted scrapes")
+    
+    # Spawned, not forked: the parent runs an event loop and threads
+    context = multiprocessing.get_context("spawn")
+    scrape_worker_stop = context.Event()
+    scrape_workers.extend(start_scrape_worker(context, i) for i in range(SCRAPE_WORKERS))
+    scrape_maintenance = asyncio.create_task(maintain_scrape_workers(context))
+    print(f"Started {SCRAPE_WORKERS} scrape workers")
+
+@app.on_event("shutdown")
+async def stop_scrape_workers():
+    """Stop the workers; a scrape cut short is requeued at the next startup"""
+    if scrape_worker_stop is None:
+        return
+    if scrape_maintenance is not None:
+        scrape_maintenance.cancel()
+    scrape_worker_stop.set()
+    for process in scrape_workers:
+        process.join(timeout=2)
+        if process.is_alive():
+            process.terminate()
+    scrape_workers.clear()
+
+@app.post("/api/scrape-jobs/async", status_code=202)
+async def submit_scrape_job(params: ScrapeParams):
+    """
+    Queue a scrape and return its id immediately
+    
+    The scrape runs in a worker process; poll GET /api/scrape-jobs/async/{id}
+    for progress and the jobs. Queued scrapes survive restarts.
+    """
+    filters = parse_filters(params)
+    if scrape_queue is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Asynchronous scraping is disabled (SCRAPE_WORKERS=0)"
+        )
+    
+    task_id = await asyncio.to_thread(scrape_queue.enqueue, params.model_dump(), len(site_names_of(params)))
+    return {"id": task_id, "status": "queued", "poll": f"/api/scrape-jobs/async/{task_id}"}
+
+@app.get("/api/scrape-jobs/async/{task_id}")
+async def get_scrape_job(task_id: str):
+    """Status, per-site progress and, once done, the jobs of a queued scrape"""
+    task = await asyncio.to_thread(scrape_queue.get, task_id) if scrape_queue is not None else None
+    if task is None:
+        raise HTTPException(status_code=404, detail="Unknown scrape id")
+    
+    response = {
+        "id": task_id,
+        "status": task["status"],
+        "progress": {
+            "sites_done": task["sites_done"],
+            "sites_total": task["sites_total"],
+            "fraction": task["sites_done"] / task["sites_total"] if task["sites_total"] else 1.0
+        },
+        "attempts": task["attempts"],
+        "created_at": task["created_at"],
+        "started_at": task["started_at"],
+        "finished_at": task["finished_at"],
+        "error": task["error"],
+    }
+    
+    if task["status"] == DONE:
+        jobs = task["result"]["jobs"]
+        # Count real results into the facets once, when first delivered
+        if task["scraped"] and await asyncio.to_thread(scrape_queue.mark_delivered, task_id):
+            params = task["params"]
+            site_names = [params["site_name"]] if isinstance(params["site_name"], str) else params["site_name"]
+            facet_index.ingest(jobs, query_key(site_names, params["search_term"], params["location"]))
+        response["jobs"] = jobs
+    
+    return response
+
+@app.get("/api/jobs/facets")
+async def get_job_facets(
+    search_term: Optional[str] = None,
+    location: Optional[str] = None,
+    site_name: Optional[List[str]] = Query(default=None)
+):
+    """
+    Job counts by site, job_type, is_remote, location and salary_bucket
+    
+    Counts cover every job scraped within JOB_FACET_TTL seconds. With a
+    search_term (plus the site_name and location of the scrape) they cover
+    only the jobs that scrape query returned.
+    """
+    if search_term is None:
+        return {"query": None, **facet_index.facets()}
+    
+    if not site_name:
+        raise HTTPException(
+            status_code=400,
+            detail="site_name is required with search_term"
+        )
+    
+    key = query_key(site_name, search_term, location)
+    return {
+        "query": {"site_name": site_name, "search_term": search_term, "location": location},
+        **facet_index.facets(key)
+    }
+
+# Media type and file extension of each export format
+EXPORT_MEDIA_TYPES = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+@app.get("/api/jobs/export")
+async def export_jobs(
+    format: str = "arrow",
+    columns: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+):
+    """
+    Stream every stored job as an Arrow IPC stream or a Parquet file
+    
+    Args:
+        format: "arrow" (IPC stream) or "parquet"
+        columns: Comma-separated columns to export (all by default)
+        since: Only jobs scraped at or after this time (ISO 8601, UTC if naive)
+        until: Only jobs scraped before this time
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {list(EXPORT_FORMATS)}")
+    if job_store is None:
+        raise HTTPException(status_code=503, detail="Job export requires pyarrow")
+    
+    selected = [column.strip() for column in columns.split(",") if column.strip()] if columns else None
+    try:
+        # Lists the store's files, so off the event loop
+        reader = await asyncio.get_running_loop().run_in_executor(
+            None, partial(job_store.scan, selected, since, until)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    media_type, extension = EXPORT_MEDIA_TYPES[format]
+    return StreamingResponse(
+        export_chunks(reader, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="jobs.{extension}"'}
+    )
+
+@app.get("/api/scrape-status")
+async def get_scrape_status():
+    """
+    Circuit breaker state, error rates, p95 latency and timeout of each job site
+    
+    Every process keeps its own breakers: the top level is the API process
+    (synchronous scrapes); async_workers holds what each worker process last
+    published (asynchronous scrapes).
+    """
+    counts, workers = None, None
+    if scrape_queue is not None:
+        counts = await asyncio.to_thread(scrape_queue.counts)
+        workers = await asyncio.to_thread(scrape_queue.worker_status)
+    return {
+        **scrape_site_status(),
+        "async_queue": counts,
+        "async_workers_alive": sum(1 for process in scrape_workers if process.is_alive()),
+        "async_workers": workers
+    }
+
+@app.get("/metrics/stages")
+async def stage_metrics():
+    """Per-stage latency histograms collected since startup (milliseconds)"""
+    return {
+        "enabled": timing.ENABLED,
+        "stages": stage_histograms.snapshot()
+    }
 
 @app.get("/")
 async def root():
@@ -4,18 +4,33 @@ Career Path Prediction API Server
 FastAPI server that serves ML model predictions for career paths based on user skills.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional, Tuple
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import Executor
+import asyncio
+import hashlib
+import json
 import os
 import sys
+import time
 
-# Add parent directory to path to import train_model
+# Add parent directory to path to import the ml_service modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from train_model import CareerPathPredictor
+from inference import CareerPathInference, SkillSession, TEST_CASES
 from utils.course_recommender import CourseRecommender
+from utils.course_catalog import load_catalog
+from utils.helpers import load_skill_aliases
+from utils.skill_canonicalizer import SkillCanonicalizer
+from utils.skill_gap import SkillGapIndex
+from utils import timing
+from utils.profiler import admin_router, estimate_size
+from utils.timing import ServerTimingMiddleware, stage, stage_histograms
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -31,22 +46,310 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Per-stage Server-Timing headers and histograms (disable with SERVER_TIMING=0)
+app.add_middleware(ServerTimingMiddleware)
+
 # Initialize predictor
-predictor = CareerPathPredictor()
+predictor = CareerPathInference()
 model_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+course_catalog_path = os.getenv(
+    "COURSE_CATALOG_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'course_catalog.json')
+)
+
+# Micro-batching configuration
+BATCH_MAX_SIZE = int(os.getenv("ML_BATCH_MAX_SIZE", "32"))
+BATCH_MAX_WAIT_MS = float(os.getenv("ML_BATCH_MAX_WAIT_MS", "2"))
+
+
+class PredictionBatcher:
+    """
+    Collects concurrent prediction requests into micro-batches
+    
+    Requests are queued for at most max_wait_ms (or until max_batch_size is
+    reached), scored together with one sparse matrix product on a worker
+    thread, and each caller's future is resolved with its own results. The
+    event loop never runs the CPU-bound scoring itself.
+    
+    Batches are scored one at a time on the executor given to start(), or
+    on the loop's default executor (the gateway's shared thread pool when
+    hosted by gateway.py).
+    """
+    
+    def __init__(self, predictor: CareerPathInference, max_batch_size: int = 32, max_wait_ms: float = 2.0):
+        self.predictor = predictor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor: Optional[Executor] = None
+    
+    def start(self, executor: Optional[Executor] = None):
+        """Start the batching loop on the running event loop, scoring on executor (default: the loop's)"""
+        self._executor = executor
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop the batching loop and fail any requests still queued"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        
+        while self._queue is not None and not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Prediction service is shutting down"))
+    
+    async def predict(self, skills: List[str], top_n: int) -> List[dict]:
+        """Queue one prediction and wait for its batch to be scored"""
+        if self._queue is None:
+            raise RuntimeError("Prediction batcher is not running")
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((skills, top_n, future))
+        result, stages = await future
+        
+        # Stages of the batch this request was scored in
+        timing.record(stages)
+        return result
+    
+    async def _collect(self) -> List[Tuple[List[str], int, asyncio.Future]]:
+        """Wait for the first request, then gather more until the batch is full or the window closes"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        # Anything already queued rides along for free
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        
+        return batch
+    
+    def _score(self, skill_lists: List[List[str]], top_ns: List[int]):
+        """Score one batch on the worker thread, timing its stages"""
+        with timing.collect() as timer:
+            results = self.predictor.predict_career_paths_batch(skill_lists, top_ns)
+        return results, timer.stages if timer is not None else None
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            skill_lists = [skills for skills, _, _ in batch]
+            top_ns = [top_n for _, top_n, _ in batch]
+            
+            try:
+                results, stages = await loop.run_in_executor(
+                    self._executor,
+                    self._score,
+                    skill_lists,
+                    top_ns
+                )
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result((result, stages))
+
+
+batcher = PredictionBatcher(predictor, max_batch_size=BATCH_MAX_SIZE, max_wait_ms=BATCH_MAX_WAIT_MS)
+
+# Built at startup from the model vocabulary, SKILL_CATEGORY_MAP and the alias file
+canonicalizer: Optional[SkillCanonicalizer] = None
+
+
+def build_canonicalizer() -> SkillCanonicalizer:
+    """Create the skill canonicalizer for the currently loaded model"""
+    vocabulary = [skill for skills in predictor.career_skills.values() for skill in skills]
+    vocabulary.extend(CourseRecommender.SKILL_CATEGORY_MAP)
+    return SkillCanonicalizer(vocabulary, load_skill_aliases(), display_names=predictor.skill_display_names)
+
+
+def canonicalize_skills(skills: List[str]) -> List[str]:
+    """Canonicalize request skills, dropping blanks and duplicates"""
+    if canonicalizer is None:
+        return [skill.strip() for skill in skills if skill.strip()]
+    return canonicalizer.canonicalize_skills(skills)
+
+
+# Bitset index of career skill requirements, built at startup
+skill_gap_index: Optional[SkillGapIndex] = None
+
+
+def export_legacy_model():
+    """
+    Write the inference artifact for a model trained before it existed
+    
+    Only this path imports train_model and scikit-learn; it runs once, after
+    which the service starts from the exported artifact.
+    """
+    from train_model import CareerPathPredictor
+    
+    print("Exporting inference model from pickled training artifacts...")
+    legacy = CareerPathPredictor()
+    legacy.load_model(model_dir)
+    legacy.export_inference_model(model_dir)
+
+
+# Optional JSON file with a list of skill lists to warm up with (default: TEST_CASES)
+WARMUP_FILE = os.getenv("ML_WARMUP_FILE", "")
+
+
+class ServiceReadiness:
+    """Startup progress reported by /readyz"""
+    
+    def __init__(self):
+        self.model_loaded = False
+        self.warmed_up = False
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.warmup_queries = 0
+        self.error: Optional[str] = None
+    
+    @property
+    def ready(self) -> bool:
+        return self.model_loaded and self.warmed_up
+    
+    def as_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "model_loaded": self.model_loaded,
+            "warmed_up": self.warmed_up,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds,
+            "warmup_queries": self.warmup_queries,
+            "error": self.error
+        }
+
+
+readiness = ServiceReadiness()
+
+
+def load_warmup_queries() -> List[List[str]]:
+    """Skill lists to run through the service before reporting ready"""
+    if WARMUP_FILE:
+        with open(WARMUP_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return TEST_CASES
+
+
+async def warm_up():
+    """
+    Exercise every prediction path once so the first real request does not
+    pay for lazy allocations, cold caches or thread pool start-up
+    """
+    start = time.perf_counter()
+    try:
+        queries = load_warmup_queries()
+        for skills in queries:
+            canonical = canonicalize_skills(skills)
+            predictions = await batcher.predict(canonical, 5)
+            await asyncio.to_thread(
+                CourseRecommender.recommend_training,
+                career_paths=predictions,
+                user_skills=canonical,
+                required_skills=required_skills_for(predictions)
+            )
+            await asyncio.to_thread(
+                skill_gap_index.analyze, canonical, titles=[pred['title'] for pred in predictions]
+            )
+        
+        readiness.warmup_queries = len(queries)
+        readiness.warmup_seconds = time.perf_counter() - start
+        readiness.warmed_up = True
+        print(f"✅ Warm-up finished: {len(queries)} queries in {readiness.warmup_seconds:.3f}s")
+    except Exception as e:
+        readiness.error = f"Warm-up failed: {e}"
+        print(f"⚠️ Warning: {readiness.error}")
+
 
 # Load model on startup
 @app.on_event("startup")
 async def load_model():
     """Load the trained model when server starts"""
+    global canonicalizer, skill_gap_index
+    
+    start = time.perf_counter()
     try:
+        if not CareerPathInference.has_exported_model(model_dir):
+            export_legacy_model()
         predictor.load_model(model_dir)
+        readiness.model_loaded = True
         print("✅ Model loaded successfully!")
     except Exception as e:
+        readiness.error = f"Could not load model: {e}"
         print(f"⚠️ Warning: Could not load model: {e}")
         print("Please run train_model.py first to train the model.")
+    
+    canonicalizer = build_canonicalizer()
+    print(f"✅ Skill canonicalizer ready: {len(canonicalizer)} canonical skills")
+    
+    skill_gap_index = SkillGapIndex(predictor.career_skills)
+    
+    try:
+        catalog = load_catalog(course_catalog_path)
+        if catalog is not None:
+            CourseRecommender.set_catalog(catalog)
+            print(f"✅ Course catalog loaded: {len(catalog)} courses")
+    except Exception as e:
+        print(f"⚠️ Warning: Could not load course catalog: {e}")
+        print("Falling back to built-in course recommendations.")
+    
+    readiness.load_seconds = time.perf_counter() - start
+    
+    batcher.start()
+    
+    # Warm up in the background so /livez answers while /readyz is still false
+    if readiness.model_loaded:
+        asyncio.create_task(warm_up())
+
+
+@app.on_event("shutdown")
+async def stop_batcher():
+    """Stop the prediction batcher when server stops"""
+    await batcher.stop()
+
+
+def model_memory_report() -> dict:
+    """Bytes held by the loaded model and the indexes built from it"""
+    report = {"predictor": predictor.memory_usage()}
+    if canonicalizer is not None:
+        report["canonicalizer"] = estimate_size(canonicalizer)
+    if skill_gap_index is not None:
+        report["skill_gap_index"] = estimate_size(skill_gap_index)
+    if CourseRecommender.CATALOG is not None:
+        report["course_catalog"] = estimate_size(CourseRecommender.CATALOG)
+    return report
+
+
+# Token-protected /admin/profile and /admin/memory (enabled by ADMIN_TOKEN)
+app.include_router(admin_router(model_memory_report))
+
+
+def required_skills_for(predictions: List[dict]) -> dict:
+    """Map each predicted career title to the skills the model associates with it"""
+    return {pred['title']: predictor.get_required_skills(pred['title']) for pred in predictions}
 
 
 # Request/Response models
@@ -117,12 +420,48 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "predict": "/api/predict-career-paths",
+            "training": "/api/recommend-training",
+            "insights": "/api/career-insights",
+            "skill_gap": "/api/skill-gap",
+            "skill_session": "/ws/skill-session",
             "health": "/health",
+            "liveness": "/livez",
+            "readiness": "/readyz",
+            "stage_metrics": "/metrics/stages",
             "docs": "/docs"
         }
     }
 
 
+@app.get("/livez")
+async def liveness_check():
+    """Liveness probe: the process is up and its event loop is responsive"""
+    return {"status": "alive"}
+
+
+@app.get("/readyz")
+async def readiness_check():
+    """
+    Readiness probe: 200 only once the model is loaded and warm-up has run
+    
+    Returns 503 with the same body until then (or if loading failed), so a
+    load balancer never routes traffic to a cold worker.
+    """
+    return JSONResponse(
+        status_code=200 if readiness.ready else 503,
+        content=readiness.as_dict()
+    )
+
+
+@app.get("/metrics/stages")
+async def stage_metrics():
+    """Per-stage latency histograms collected since startup (milliseconds)"""
+    return {
+        "enabled": timing.ENABLED,
+        "stages": stage_histograms.snapshot()
+    }
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -146,8 +485,12 @@ async def predict_career_paths(request: SkillsRequest):
         PredictionResponse with career path recommendations
     """
     try:
+        # Map spelling variants and typos onto known skills
+        with stage("canonicalize"):
+            skills = canonicalize_skills(request.skills)
+        
         # Validate input
-        if not request.skills or len(request.skills) == 0:
+        if not skills:
             raise HTTPException(
                 status_code=400,
                 detail="Skills list cannot be empty"
@@ -167,28 +510,27 @@ async def predict_career_paths(request: SkillsRequest):
             )
         
         # Get predictions
-        predictions = predictor.predict_career_paths(
-            user_skills=request.skills,
-            top_n=request.top_n
-        )
+        with stage("predict"):
+            predictions = await batcher.predict(skills, request.top_n)
         
         # Format response
-        career_paths = [
-            CareerPath(
-                id=pred['id'],
-                title=pred['title'],
-                description=pred['description'],
-                match_score=pred['match_score'],
-                confidence=pred['confidence']
+        with stage("response"):
+            career_paths = [
+                CareerPath(
+                    id=pred['id'],
+                    title=pred['title'],
+                    description=pred['description'],
+                    match_score=pred['match_score'],
+                    confidence=pred['confidence']
+                )
+                for pred in predictions
+            ]
+            
+            return PredictionResponse(
+                success=True,
+                career_paths=career_paths,
+                user_skills=request.skills
             )
-            for pred in predictions
-        ]
-        
-        return PredictionResponse(
-            success=True,
-            career_paths=career_paths,
-            user_skills=request.skills
-        )
         
     except HTTPException:
         raise
@@ -200,29 +542,264 @@ async def predict_career_paths(request: SkillsRequest):
         )
 
 
-@app.get("/api/available-careers")
-async def get_available_careers():
-    """Get list of all available career paths in the model"""
+# Most skills a live skill session may hold
+SESSION_MAX_SKILLS = int(os.getenv("ML_SESSION_MAX_SKILLS", "100"))
+
+
+def apply_session_message(session: SkillSession, message: dict, top_n: int) -> dict:
+    """
+    Apply one skill session message and return the updated top career paths
+    
+    Runs in a worker thread; a connection awaits each message before reading
+    the next, so a session is never updated concurrently.
+    """
+    action = message.get("action")
+    changed = False
+    
+    with stage("session_update"):
+        if action in ("add", "remove"):
+            skill = message.get("skill")
+            if not isinstance(skill, str):
+                raise ValueError("'skill' must be a string")
+            
+            for canonical in canonicalize_skills([skill]):
+                if action == "remove":
+                    changed = session.remove(canonical)
+                elif len(session.skills) >= SESSION_MAX_SKILLS:
+                    raise ValueError(f"A session can hold at most {SESSION_MAX_SKILLS} skills")
+                else:
+                    changed = session.add(canonical)
+        
+        elif action == "set":
+            skills = message.get("skills")
+            if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+                raise ValueError("'skills' must be a list of strings")
+            
+            skills = canonicalize_skills(skills)
+            if len(skills) > SESSION_MAX_SKILLS:
+                raise ValueError(f"A session can hold at most {SESSION_MAX_SKILLS} skills")
+            
+            # Keep the skills still present so only the difference is applied
+            wanted = {skill.lower() for skill in skills}
+            for skill in list(session.skills):
+                if skill.lower() not in wanted:
+                    changed = session.remove(skill) or changed
+            for skill in skills:
+                changed = session.add(skill) or changed
+        
+        elif action == "clear":
+            for skill in list(session.skills):
+                changed = session.remove(skill) or changed
+        
+        elif action != "top":
+            raise ValueError("'action' must be one of add, remove, set, clear or top")
+        
+        return {
+            "success": True,
+            "changed": changed,
+            "skills": list(session.skills),
+            "career_paths": session.top(top_n)
+        }
+
+
+@app.websocket("/ws/skill-session")
+async def skill_session(websocket: WebSocket):
+    """
+    Live career matches while the user edits their skills one at a time
+    
+    Each JSON message changes the connection's skill list and is answered
+    with the updated top career paths:
+    
+        {"action": "add", "skill": "React"}
+        {"action": "remove", "skill": "React"}
+        {"action": "set", "skills": ["React", "CSS"]}
+        {"action": "clear"}
+        {"action": "top"}
+    
+    Any message may also carry "top_n" (1-10, default 5), which sticks for
+    later messages. Replies look like {"success": true, "changed": true,
+    "skills": [...], "career_paths": [...]}; invalid messages get
+    {"success": false, "error": "..."} and the session stays open.
+    
+    The session keeps the query's term counts and per-career dot products
+    (see SkillSession), so one add or remove costs about one skill's
+    non-zeros rather than re-scoring the whole list.
+    """
+    await websocket.accept()
+    
+    if predictor.skill_vectors is None:
+        await websocket.send_json({"success": False, "error": "Model not loaded. Please contact administrator."})
+        await websocket.close(code=1013)
+        return
+    
+    session = SkillSession(predictor)
+    top_n = 5
+    loop = asyncio.get_running_loop()
+    
     try:
-        if predictor.career_data is None:
-            raise HTTPException(
-                status_code=503,
-                detail="Model not loaded"
-            )
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except (ValueError, KeyError):
+                await websocket.send_json({"success": False, "error": "Messages must be JSON objects"})
+                continue
+            
+            if not isinstance(message, dict):
+                await websocket.send_json({"success": False, "error": "Messages must be JSON objects"})
+                continue
+            
+            requested_top_n = message.get("top_n", top_n)
+            if not isinstance(requested_top_n, int) or requested_top_n < 1 or requested_top_n > 10:
+                await websocket.send_json({"success": False, "error": "top_n must be between 1 and 10"})
+                continue
+            top_n = requested_top_n
+            
+            try:
+                reply = await loop.run_in_executor(None, apply_session_message, session, message, top_n)
+            except ValueError as e:
+                reply = {"success": False, "error": str(e)}
+            await websocket.send_json(reply)
+    
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"Error in skill session: {e}")
+        await websocket.close(code=1011)
+
+
+# Cache-Control for the career list; clients revalidate with If-None-Match after it expires
+CAREERS_CACHE_CONTROL = os.getenv("ML_CAREERS_CACHE_CONTROL", "public, max-age=300")
+
+
+class CareerListCache:
+    """
+    Serialized /api/available-careers responses for one model version
+    
+    Bodies and their ETags are computed once per (prefix, offset, limit) and
+    dropped together when the model version changes. Title prefixes are
+    resolved with a binary search over lowercased titles, so filtering does
+    not scan the catalog.
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._version = None
+        self._careers: List[dict] = []
+        self._sorted_titles: List[str] = []
+        self._sorted_ids: List[int] = []
+        self._entries: "OrderedDict[Tuple[str, int, Optional[int]], Tuple[str, bytes]]" = OrderedDict()
+    
+    def _refresh(self):
+        """Rebuild lookup tables if the loaded model changed"""
+        version = predictor.model_version or str(id(predictor.career_data))
+        if version == self._version:
+            return
         
-        careers = [
+        self._careers = [
             {
                 "title": career['title'],
                 "description": career['description']
             }
             for career in predictor.career_data
         ]
+        ordered = sorted((career['title'].lower(), i) for i, career in enumerate(self._careers))
+        self._sorted_titles = [title for title, _ in ordered]
+        self._sorted_ids = [i for _, i in ordered]
+        self._entries.clear()
+        self._version = version
+    
+    def _matching_ids(self, prefix: str) -> List[int]:
+        """Indices of careers whose title starts with prefix, in model order"""
+        if not prefix:
+            return list(range(len(self._careers)))
         
-        return {
+        start = bisect_left(self._sorted_titles, prefix)
+        end = bisect_left(self._sorted_titles, prefix + "\uffff", lo=start)
+        return sorted(self._sorted_ids[start:end])
+    
+    def get(self, prefix: str, offset: int, limit: Optional[int]) -> Tuple[str, bytes]:
+        """Return (etag, body) for the requested page"""
+        self._refresh()
+        
+        key = (prefix, offset, limit)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        
+        ids = self._matching_ids(prefix)
+        page = ids[offset:] if limit is None else ids[offset:offset + limit]
+        body = json.dumps({
             "success": True,
-            "total_careers": len(careers),
-            "careers": careers
-        }
+            "total_careers": len(ids),
+            "offset": offset,
+            "limit": limit,
+            "careers": [self._careers[i] for i in page]
+        }, separators=(",", ":")).encode("utf-8")
+        etag = f'"{self._version}-{hashlib.sha256(body).hexdigest()[:16]}"'
+        
+        self._entries[key] = (etag, body)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return etag, body
+
+
+career_list_cache = CareerListCache()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches etag"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+@app.get("/api/available-careers")
+async def get_available_careers(
+    offset: int = 0,
+    limit: Optional[int] = None,
+    prefix: str = "",
+    if_none_match: Optional[str] = Header(default=None)
+):
+    """
+    Get list of all available career paths in the model
+    
+    The response is served from a cache that is rebuilt only when the model
+    changes, carries a strong ETag and answers 304 Not Modified when the
+    client's If-None-Match matches.
+    
+    Args:
+        offset: Number of matching careers to skip
+        limit: Maximum number of careers to return (default: all)
+        prefix: Case-insensitive career title prefix filter
+    """
+    try:
+        if predictor.skill_vectors is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Model not loaded"
+            )
+        
+        if offset < 0:
+            raise HTTPException(
+                status_code=400,
+                detail="offset must not be negative"
+            )
+        
+        if limit is not None and (limit < 1 or limit > 1000):
+            raise HTTPException(
+                status_code=400,
+                detail="limit must be between 1 and 1000"
+            )
+        
+        etag, body = career_list_cache.get(prefix.strip().lower(), offset, limit)
+        headers = {"ETag": etag, "Cache-Control": CAREERS_CACHE_CONTROL}
+        
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        
+        return Response(content=body, media_type="application/json", headers=headers)
         
     except HTTPException:
         raise
@@ -288,8 +865,12 @@ async def recommend_training(request: TrainingRequest):
         TrainingResponse with training recommendations and courses
     """
     try:
+        # Map spelling variants and typos onto known skills
+        with stage("canonicalize"):
+            skills = canonicalize_skills(request.skills)
+        
         # Validate input
-        if not request.skills or len(request.skills) == 0:
+        if not skills:
             raise HTTPException(
                 status_code=400,
                 detail="Skills list cannot be empty"
@@ -309,47 +890,280 @@ async def recommend_training(request: TrainingRequest):
             )
         
         # Get career path predictions first
-        career_predictions = predictor.predict_career_paths(
-            user_skills=request.skills,
-            top_n=request.top_n
-        )
+        with stage("predict"):
+            career_predictions = await batcher.predict(skills, request.top_n)
         
         # Get course recommendations based on career paths
-        training_recommendations = CourseRecommender.recommend_training(
-            career_paths=career_predictions,
-            user_skills=request.skills
-        )
+        with stage("recommend"):
+            training_recommendations = await asyncio.to_thread(
+                CourseRecommender.recommend_training,
+                career_paths=career_predictions,
+                user_skills=skills,
+                required_skills=required_skills_for(career_predictions)
+            )
         
         # Format response
-        formatted_recommendations = [
-            TrainingRecommendation(
-                id=rec['id'],
-                title=rec['title'],
-                courses=[
-                    Course(
-                        platform=course['platform'],
-                        name=course['name'],
-                        link=course['link'],
-                        description=course['description']
+        with stage("response"):
+            formatted_recommendations = [
+                TrainingRecommendation(
+                    id=rec['id'],
+                    title=rec['title'],
+                    courses=[
+                        Course(
+                            platform=course['platform'],
+                            name=course['name'],
+                            link=course['link'],
+                            description=course['description']
+                        )
+                        for course in rec['courses']
+                    ]
+                )
+                for rec in training_recommendations
+            ]
+            
+            return TrainingResponse(
+                success=True,
+                training_recommendations=formatted_recommendations,
+                user_skills=request.skills
+            )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in training recommendation: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
+class CareerInsightsRequest(BaseModel):
+    skills: List[str]
+    top_n: int = 5
+    include_career_paths: bool = True
+    include_training: bool = True
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "skills": ["JavaScript", "React", "Node.js", "HTML", "CSS"],
+                "top_n": 5,
+                "include_career_paths": True,
+                "include_training": True
+            }
+        }
+
+
+class CareerInsightsResponse(BaseModel):
+    success: bool
+    career_paths: Optional[List[CareerPath]] = None
+    training_recommendations: Optional[List[TrainingRecommendation]] = None
+    user_skills: List[str]
+
+
+@app.post(
+    "/api/career-insights",
+    response_model=CareerInsightsResponse,
+    response_model_exclude_none=True
+)
+async def career_insights(request: CareerInsightsRequest):
+    """
+    Predict career paths and recommend training from a single scoring pass
+    
+    Replaces calling /api/predict-career-paths followed by
+    /api/recommend-training, which scores the same skills twice. Use the
+    include_* flags to leave out parts of the response the client does not need.
+    
+    Args:
+        request: CareerInsightsRequest containing skills, optional top_n and include flags
+        
+    Returns:
+        CareerInsightsResponse with the requested career paths and/or training recommendations
+    """
+    try:
+        # Map spelling variants and typos onto known skills
+        with stage("canonicalize"):
+            skills = canonicalize_skills(request.skills)
+        
+        # Validate input
+        if not skills:
+            raise HTTPException(
+                status_code=400,
+                detail="Skills list cannot be empty"
+            )
+        
+        if request.top_n < 1 or request.top_n > 10:
+            raise HTTPException(
+                status_code=400,
+                detail="top_n must be between 1 and 10"
+            )
+        
+        if not request.include_career_paths and not request.include_training:
+            raise HTTPException(
+                status_code=400,
+                detail="At least one of include_career_paths or include_training must be true"
+            )
+        
+        # Check if model is loaded
+        if predictor.skill_vectors is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Model not loaded. Please contact administrator."
+            )
+        
+        # Score once and reuse the predictions for both parts of the response
+        with stage("predict"):
+            predictions = await batcher.predict(skills, request.top_n)
+        
+        recommendations = None
+        if request.include_training:
+            with stage("recommend"):
+                recommendations = await asyncio.to_thread(
+                    CourseRecommender.recommend_training,
+                    career_paths=predictions,
+                    user_skills=skills,
+                    required_skills=required_skills_for(predictions)
+                )
+        
+        with stage("response"):
+            career_paths = None
+            if request.include_career_paths:
+                career_paths = [CareerPath(**pred) for pred in predictions]
+            
+            training_recommendations = None
+            if recommendations is not None:
+                training_recommendations = [
+                    TrainingRecommendation(
+                        id=rec['id'],
+                        title=rec['title'],
+                        courses=[Course(**course) for course in rec['courses']]
                     )
-                    for course in rec['courses']
+                    for rec in recommendations
                 ]
+            
+            return CareerInsightsResponse(
+                success=True,
+                career_paths=career_paths,
+                training_recommendations=training_recommendations,
+                user_skills=request.skills
             )
-            for rec in training_recommendations
-        ]
         
-        return TrainingResponse(
-            success=True,
-            training_recommendations=formatted_recommendations,
-            user_skills=request.skills
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in career insights: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
         )
+
+
+class SkillGapRequest(BaseModel):
+    skills: List[str]
+    top_n: int = 5
+    all_careers: bool = False
+    limit: Optional[int] = None
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "skills": ["Python", "Machine Learning", "SQL"],
+                "top_n": 5,
+                "all_careers": False
+            }
+        }
+
+
+class CareerSkillGap(BaseModel):
+    id: int
+    title: str
+    match_score: Optional[float] = None
+    coverage: float
+    matched_skills: List[str]
+    missing_skills: List[str]
+
+
+class SkillGapResponse(BaseModel):
+    success: bool
+    skill_gaps: List[CareerSkillGap]
+    user_skills: List[str]
+
+
+@app.post("/api/skill-gap", response_model=SkillGapResponse)
+async def skill_gap(request: SkillGapRequest):
+    """
+    Per-career skill coverage and missing skills
+    
+    By default analyzes the top_n predicted careers (with their match scores).
+    With all_careers, ranks the whole career catalog by coverage instead,
+    optionally keeping only the first `limit` careers.
+    
+    Args:
+        request: SkillGapRequest containing skills and selection options
+        
+    Returns:
+        SkillGapResponse with coverage, matched and missing skills per career
+    """
+    try:
+        # Map spelling variants and typos onto known skills
+        with stage("canonicalize"):
+            skills = canonicalize_skills(request.skills)
+        
+        # Validate input
+        if not skills:
+            raise HTTPException(
+                status_code=400,
+                detail="Skills list cannot be empty"
+            )
+        
+        if not request.all_careers and (request.top_n < 1 or request.top_n > 10):
+            raise HTTPException(
+                status_code=400,
+                detail="top_n must be between 1 and 10"
+            )
+        
+        if request.limit is not None and request.limit < 1:
+            raise HTTPException(
+                status_code=400,
+                detail="limit must be at least 1"
+            )
+        
+        # Check if model is loaded
+        if predictor.skill_vectors is None or skill_gap_index is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Model not loaded. Please contact administrator."
+            )
+        
+        if request.all_careers:
+            match_scores = {}
+            with stage("skill_gap"):
+                gaps = await asyncio.to_thread(skill_gap_index.analyze, skills, limit=request.limit)
+        else:
+            with stage("predict"):
+                predictions = await batcher.predict(skills, request.top_n)
+            match_scores = {pred['title']: pred['match_score'] for pred in predictions}
+            with stage("skill_gap"):
+                gaps = await asyncio.to_thread(
+                    skill_gap_index.analyze, skills, titles=list(match_scores), limit=request.limit
+                )
+        
+        with stage("response"):
+            return SkillGapResponse(
+                success=True,
+                skill_gaps=[
+                    CareerSkillGap(id=i + 1, match_score=match_scores.get(gap['title']), **gap)
+                    for i, gap in enumerate(gaps)
+                ],
+                user_skills=request.skills
+            )
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in training recommendation: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"Error in skill gap analysis: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
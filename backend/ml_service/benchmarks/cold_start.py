@@ -0,0 +1,124 @@
+"""
+Cold start benchmark for the ML service
+
+Each measurement runs in a fresh Python process so nothing is already
+imported or cached. Compares the sklearn-free serving path
+(CareerPathInference + exported artifact) with loading the pickled
+training model through train_model, and measures the full FastAPI app
+from import to first answered request.
+
+Run from the ml_service directory after training the model:
+    python benchmarks/cold_start.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ML_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_DIR = os.path.join(ML_SERVICE_DIR, 'models')
+
+SKILLS = ["JavaScript", "React", "Node.js", "HTML", "CSS"]
+
+# Each snippet prints a JSON object of phase timings in seconds
+PREDICTOR_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {ml_service_dir!r})
+from {module} import {cls}
+imported = time.perf_counter()
+predictor = {cls}()
+predictor.load_model({model_dir!r})
+loaded = time.perf_counter()
+predictor.predict_career_paths({skills!r}, top_n=5)
+predicted = time.perf_counter()
+print(json.dumps({{
+    "import": imported - start,
+    "load_model": loaded - imported,
+    "first_prediction": predicted - loaded,
+    "sklearn_imported": "sklearn" in sys.modules
+}}))
+"""
+
+SERVER_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {api_dir!r})
+import ml_server
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(ml_server.app) as client:
+    started = time.perf_counter()
+    response = client.post("/api/predict-career-paths", json={{"skills": {skills!r}, "top_n": 5}})
+    answered = time.perf_counter()
+    assert response.status_code == 200, response.text
+print(json.dumps({{
+    "import": imported - start,
+    "startup": started - imported,
+    "first_request": answered - started,
+    "sklearn_imported": "sklearn" in sys.modules
+}}))
+"""
+
+
+def run_snippet(snippet):
+    """Run a snippet in a fresh interpreter and return its JSON timings"""
+    result = subprocess.run(
+        [sys.executable, "-c", snippet],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(name, snippet, runs):
+    """Median of each phase over several cold runs"""
+    samples = [run_snippet(snippet) for _ in range(runs)]
+    phases = [key for key in samples[0] if key != "sklearn_imported"]
+    
+    print(f"\n{name}")
+    total = 0.0
+    for phase in phases:
+        median = statistics.median(sample[phase] for sample in samples)
+        total += median
+        print(f"  {phase:<18} {median * 1000:8.1f} ms")
+    print(f"  {'total':<18} {total * 1000:8.1f} ms")
+    print(f"  scikit-learn imported: {samples[0]['sklearn_imported']}")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ML service cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="cold runs per measurement")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("ML Service Cold Start Benchmark")
+    print("=" * 60)
+    
+    common = {"ml_service_dir": ML_SERVICE_DIR, "model_dir": MODEL_DIR, "skills": SKILLS}
+    legacy = measure(
+        "Pickled model via train_model.CareerPathPredictor",
+        PREDICTOR_SNIPPET.format(module="train_model", cls="CareerPathPredictor", **common),
+        args.runs
+    )
+    inference = measure(
+        "Exported model via inference.CareerPathInference",
+        PREDICTOR_SNIPPET.format(module="inference", cls="CareerPathInference", **common),
+        args.runs
+    )
+    measure(
+        "FastAPI app: import, startup, first request",
+        SERVER_SNIPPET.format(api_dir=os.path.join(ML_SERVICE_DIR, 'api'), skills=SKILLS),
+        args.runs
+    )
+    
+    print(f"\nInference path is {legacy / inference:.1f}x faster to first prediction")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Shared fixtures for the pytest-benchmark suite
+
+Synthetic career catalogs are trained once per session from the skills in
+the training dataset, exported to a temporary model directory and reused by
+every benchmark, so the suite does not depend on a previously trained model.
+
+Sizes can be overridden with BENCHMARK_CATALOG_SIZES (comma-separated career
+counts, default "1000,10000,100000"). Baselines are stored in
+benchmarks/.benchmarks; a run with --benchmark-compare fails when a benchmark
+regresses beyond BENCHMARK_REGRESSION_THRESHOLD (default "mean:20%") unless
+--benchmark-compare-fail is given explicitly.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+from pytest_benchmark.utils import parse_compare_fail
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_catalog import load_dataset_skills, synthetic_catalog
+from train_model import CareerPathPredictor
+
+CATALOG_SIZES = [
+    int(size) for size in os.getenv("BENCHMARK_CATALOG_SIZES", "1000,10000,100000").split(",")
+]
+
+REGRESSION_THRESHOLD = os.getenv("BENCHMARK_REGRESSION_THRESHOLD", "mean:20%")
+
+BENCHMARK_STORAGE = "file://" + os.path.join(os.path.dirname(os.path.abspath(__file__)), ".benchmarks")
+
+# Size used by benchmarks that do not sweep the catalog size
+DEFAULT_CATALOG_SIZE = min(CATALOG_SIZES, key=lambda size: abs(size - 10000))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Apply the suite's storage location and regression threshold defaults"""
+    if config.option.benchmark_storage == "file://./.benchmarks":
+        config.option.benchmark_storage = BENCHMARK_STORAGE
+    if config.option.benchmark_compare and not config.option.benchmark_compare_fail:
+        config.option.benchmark_compare_fail = [
+            parse_compare_fail(check) for check in REGRESSION_THRESHOLD.split(",")
+        ]
+
+
+def synthetic_careers(count, skills, seed=3):
+    """Generate count careers, each requiring 4-15 dataset skills"""
+    rng = random.Random(seed)
+    careers = []
+    for i in range(count):
+        required = rng.sample(skills, rng.randint(4, 15))
+        careers.append({
+            'title': f"Career {i}",
+            'description': f"Synthetic career built around {required[0]} and {required[1]}.",
+            'skills_text': ', '.join(required).lower(),
+            'popularity': rng.randint(1, 50)
+        })
+    return careers
+
+
+def sample_skill_sets(skills, count, size, seed=42):
+    """Draw count random skill lists of the given size"""
+    rng = random.Random(seed)
+    return [rng.sample(skills, min(size, len(skills))) for _ in range(count)]
+
+
+@pytest.fixture(scope="session")
+def dataset_skills():
+    return load_dataset_skills()
+
+
+@pytest.fixture(scope="session")
+def model_dirs(dataset_skills, tmp_path_factory):
+    """Career count to a directory holding a trained synthetic model"""
+    dirs = {}
+    for size in CATALOG_SIZES:
+        predictor = CareerPathPredictor()
+        predictor.career_data = synthetic_careers(size, dataset_skills)
+        predictor.train()
+        
+        model_dir = str(tmp_path_factory.mktemp(f"model_{size}"))
+        predictor.save_model(model_dir)
+        dirs[size] = model_dir
+    return dirs
+
+
+@pytest.fixture(scope="session")
+def predictors(model_dirs):
+    """Career count to a loaded CareerPathInference"""
+    from inference import CareerPathInference
+    
+    loaded = {}
+    for size, model_dir in model_dirs.items():
+        predictor = CareerPathInference()
+        predictor.load_model(model_dir)
+        loaded[size] = predictor
+    return loaded
+
+
+@pytest.fixture(scope="session")
+def course_catalog(dataset_skills):
+    """A 10k-course synthetic CourseCatalog"""
+    from utils.course_catalog import CourseCatalog
+    
+    return CourseCatalog(synthetic_catalog(10000, dataset_skills))
@@ -0,0 +1,113 @@
+"""
+Benchmark for skill-gap course retrieval over a large catalog
+
+Generates a synthetic Coursera/Udemy-style catalog (or loads a real one with
+--catalog), indexes it with CourseCatalog and measures per-career retrieval
+latency for the skill gaps of the trained model's careers.
+
+Run from the ml_service directory after training the model:
+    python benchmarks/course_catalog.py [--courses 50000] [--catalog path]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from train_model import CareerPathPredictor
+from utils.course_catalog import CourseCatalog
+from utils.helpers import get_missing_skills
+
+ML_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_DIR = os.path.join(ML_SERVICE_DIR, 'models')
+DATA_PATH = os.path.join(ML_SERVICE_DIR, 'data', 'career_skills_dataset.json')
+
+NAME_TEMPLATES = [
+    "{0} for Beginners",
+    "The Complete {0} Bootcamp",
+    "Mastering {0} and {1}",
+    "{0} Professional Certificate",
+    "Applied {0} with {1}",
+    "{0} Specialization",
+]
+LEVELS = ["introductory", "intermediate", "advanced", "hands-on", "project-based"]
+
+
+def load_dataset_skills():
+    """All distinct skills in the training dataset"""
+    with open(DATA_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return sorted({skill for example in data['training_data'] for skill in example['skills']})
+
+
+def synthetic_catalog(count, skills, seed=7):
+    """Generate count fake courses whose names and descriptions mention dataset skills"""
+    rng = random.Random(seed)
+    courses = []
+    for i in range(count):
+        a, b, c = rng.sample(skills, 3)
+        courses.append({
+            "platform": rng.choice(["Coursera", "Udemy"]),
+            "name": rng.choice(NAME_TEMPLATES).format(a, b),
+            "link": f"https://example.com/course/{i}",
+            "description": f"An {rng.choice(LEVELS)} course covering {a}, {b} and {c} with real-world projects."
+        })
+    return courses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--courses", type=int, default=50000, help="synthetic catalog size")
+    parser.add_argument("--catalog", help="path to a real catalog file instead of a synthetic one")
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("Course Catalog Retrieval Benchmark")
+    print("=" * 60)
+    print()
+    
+    skills = load_dataset_skills()
+    start = time.perf_counter()
+    if args.catalog:
+        catalog = CourseCatalog.load(args.catalog)
+    else:
+        catalog = CourseCatalog(synthetic_catalog(args.courses, skills))
+    print(f"Indexed {len(catalog)} courses in {time.perf_counter() - start:.2f} s")
+    
+    predictor = CareerPathPredictor()
+    predictor.load_model(MODEL_DIR)
+    
+    rng = random.Random(11)
+    titles = list(predictor.career_skills)
+    gaps = []
+    for _ in range(args.queries):
+        user_skills = rng.sample(skills, rng.randint(1, 8))
+        required = predictor.get_required_skills(rng.choice(titles))
+        gaps.append(get_missing_skills(user_skills, required) or required)
+    
+    start = time.perf_counter()
+    for gap in gaps:
+        catalog.search(gap, top_k=3)
+    single = (time.perf_counter() - start) / len(gaps) * 1000
+    
+    # recommend_training searches the gaps of all predicted careers together
+    batches = [gaps[i:i + 5] for i in range(0, len(gaps), 5)]
+    start = time.perf_counter()
+    for batch in batches:
+        catalog.search_batch(batch, top_k=3)
+    batched = (time.perf_counter() - start) / len(gaps) * 1000
+    
+    print(f"\nSingle-career search:        {single:6.2f} ms/career")
+    print(f"Batched (5 careers/request): {batched:6.2f} ms/career")
+    print(f"\nExample gap: {', '.join(gaps[0])}")
+    for course in catalog.search(gaps[0], top_k=3):
+        print(f"  - [{course['platform']}] {course['name']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Open-loop HTTP load generator for the backend services
+
+Fires requests at a fixed average arrival rate (Poisson arrivals) no matter
+how quickly responses come back, so queueing inside the services shows up as
+latency instead of being hidden by a client that waits between calls.
+Drives the ML service (/api/predict-career-paths, /api/recommend-training)
+and the job scraper (/api/scrape-jobs, /api/locations) with a configurable
+request mix. Skill sets are drawn from career_skills_dataset.json.
+
+Start the services first, then run from the ml_service directory:
+    python benchmarks/load_test.py --rate 50 --duration 30 \
+        --mix predict=60,training=30,locations=10 --output results.json
+
+Requires httpx.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+import httpx
+import numpy as np
+
+ML_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(ML_SERVICE_DIR, 'data', 'career_skills_dataset.json')
+
+DEFAULT_MIX = "predict=50,training=30,locations=15,scrape=5"
+
+SITES = ["indeed", "linkedin"]
+LOCATIONS = ["New York", "San Francisco", "London", "Berlin", "Toronto", "Remote", ""]
+LOCATION_QUERIES = ["", "new", "san", "lon", "ca", "usa", "ber", "syd"]
+
+# Latency histogram bucket upper bounds in milliseconds
+HISTOGRAM_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class SkillSampler:
+    """
+    Realistic skill sets drawn from the training dataset
+    
+    Each query starts from the skills of one training example (so skills that
+    co-occur in real profiles stay together), keeps a random subset of them and
+    sometimes adds one or two other skills weighted by how often they appear
+    in the dataset.
+    """
+    
+    def __init__(self, data_path, seed=None):
+        with open(data_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        self.examples = data['training_data']
+        frequency = Counter(skill for example in self.examples for skill in example['skills'])
+        self.skills = list(frequency)
+        self.weights = [frequency[skill] for skill in self.skills]
+        self.rng = random.Random(seed)
+    
+    def example(self):
+        return self.rng.choice(self.examples)
+    
+    def skill_set(self, example=None):
+        example = example or self.example()
+        skills = example['skills']
+        chosen = self.rng.sample(skills, self.rng.randint(1, len(skills)))
+        if self.rng.random() < 0.3:
+            for skill in self.rng.choices(self.skills, self.weights, k=self.rng.randint(1, 2)):
+                if skill not in chosen:
+                    chosen.append(skill)
+        return chosen
+
+
+def parse_mix(spec):
+    """Parse "predict=50,training=30" into normalized endpoint weights"""
+    weights = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        weights[name] = float(weight or 1)
+    
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Request mix weights must sum to a positive number")
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def predict_request(args, sampler):
+    return "POST", f"{args.ml_url}/api/predict-career-paths", {
+        "json": {"skills": sampler.skill_set(), "top_n": args.top_n}
+    }
+
+
+def training_request(args, sampler):
+    example = sampler.example()
+    career = sampler.rng.choice(example['career_paths'])
+    return "POST", f"{args.ml_url}/api/recommend-training", {
+        "json": {"skills": sampler.skill_set(example), "job_title": career['title'], "top_n": args.top_n}
+    }
+
+
+def scrape_request(args, sampler):
+    example = sampler.example()
+    return "POST", f"{args.jobs_url}/api/scrape-jobs", {
+        "json": {
+            "site_name": sampler.rng.sample(SITES, sampler.rng.randint(1, len(SITES))),
+            "search_term": sampler.rng.choice(example['career_paths'])['title'],
+            "location": sampler.rng.choice(LOCATIONS) or None
+        }
+    }
+
+
+def locations_request(args, sampler):
+    return "GET", f"{args.jobs_url}/api/locations", {
+        "params": {"q": sampler.rng.choice(LOCATION_QUERIES)}
+    }
+
+
+ENDPOINTS = {
+    "predict": predict_request,
+    "training": training_request,
+    "scrape": scrape_request,
+    "locations": locations_request,
+}
+
+
+def summarize(records, elapsed):
+    """RPS, error rate, latency percentiles and histogram for a list of results"""
+    latencies = np.array([latency for _, _, latency in records], dtype=np.float64)
+    errors = sum(1 for _, ok, _ in records if not ok)
+    statuses = Counter(str(status) for status, _, _ in records)
+    
+    summary = {
+        "requests": len(records),
+        "errors": errors,
+        "error_rate": errors / len(records) if records else 0.0,
+        "rps": len(records) / elapsed if elapsed else 0.0,
+        "status_codes": dict(statuses),
+    }
+    if len(latencies):
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        counts = np.histogram(latencies, bins=[0] + HISTOGRAM_BUCKETS_MS + [np.inf])[0]
+        summary["latency_ms"] = {
+            "mean": float(latencies.mean()),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "max": float(latencies.max()),
+        }
+        summary["histogram_ms"] = {
+            f"<={bound}" if bound != np.inf else f">{HISTOGRAM_BUCKETS_MS[-1]}": int(count)
+            for bound, count in zip(HISTOGRAM_BUCKETS_MS + [np.inf], counts)
+        }
+    return summary
+
+
+async def run_load(args):
+    """Issue requests at the target rate for the configured duration"""
+    mix = parse_mix(args.mix)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    sampler = SkillSampler(args.data, seed=args.seed)
+    rng = random.Random(args.seed)
+    
+    records = {name: [] for name in names}
+    in_flight = set()
+    dropped = 0
+    
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+    
+        async def send(name, method, url, kwargs):
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                status, ok = response.status_code, response.status_code < 400
+            except httpx.HTTPError as e:
+                status, ok = type(e).__name__, False
+            records[name].append((status, ok, (time.perf_counter() - start) * 1000))
+        
+        started_at = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        start = time.perf_counter()
+        next_arrival = start
+        end = start + args.duration
+        while next_arrival < end:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            
+            # Open loop: never wait for earlier requests, only shed load past the cap
+            if len(in_flight) >= args.max_in_flight:
+                dropped += 1
+            else:
+                name = rng.choices(names, weights)[0]
+                method, url, kwargs = ENDPOINTS[name](args, sampler)
+                task = asyncio.create_task(send(name, method, url, kwargs))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            
+            next_arrival += rng.expovariate(args.rate)
+        
+        if in_flight:
+            await asyncio.wait(in_flight)
+        elapsed = time.perf_counter() - start
+    
+    all_records = [record for endpoint_records in records.values() for record in endpoint_records]
+    return {
+        "config": {
+            "ml_url": args.ml_url,
+            "jobs_url": args.jobs_url,
+            "rate": args.rate,
+            "duration": args.duration,
+            "mix": mix,
+            "max_in_flight": args.max_in_flight,
+            "timeout": args.timeout,
+            "seed": args.seed,
+        },
+        "started_at": started_at,
+        "elapsed_seconds": elapsed,
+        "dropped": dropped,
+        "overall": summarize(all_records, elapsed),
+        "endpoints": {name: summarize(endpoint_records, elapsed) for name, endpoint_records in records.items()},
+    }
+
+
+def print_report(results):
+    print(f"\nElapsed: {results['elapsed_seconds']:.1f} s, dropped (over max in-flight): {results['dropped']}")
+    print(f"{'endpoint':<12}{'requests':>9}{'rps':>8}{'errors':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+    rows = list(results['endpoints'].items()) + [("overall", results['overall'])]
+    for name, summary in rows:
+        latency = summary.get("latency_ms", {})
+        print(
+            f"{name:<12}{summary['requests']:>9}{summary['rps']:>8.1f}{summary['error_rate']:>8.1%}"
+            + "".join(f"{latency.get(key, float('nan')):>9.1f}" for key in ("p50", "p95", "p99", "max"))
+        )
+    
+    print("\nLatency histogram (all endpoints):")
+    for bucket, count in results['overall'].get("histogram_ms", {}).items():
+        print(f"  {bucket:>8} ms  {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--ml-url", default="http://localhost:8001", help="ML service base URL")
+    parser.add_argument("--jobs-url", default="http://localhost:8000", help="job scraper base URL")
+    parser.add_argument("--rate", type=float, default=20.0, help="mean arrivals per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to generate load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint weights, e.g. predict=70,training=30")
+    parser.add_argument("--top-n", type=int, default=5)
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="requests in flight before arrivals are dropped")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--data", default=DATA_PATH, help="dataset to draw skill sets from")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+    
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    print("=" * 60)
+    print("Backend Load Test")
+    print("=" * 60)
+    print(f"\n{args.rate:g} req/s for {args.duration:g} s, mix: {args.mix}")
+    
+    results = asyncio.run(run_load(args))
+    print_report(results)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    return 1 if results['overall']['requests'] == 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
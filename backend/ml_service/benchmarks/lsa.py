@@ -0,0 +1,134 @@
+"""
+Benchmark for dense LSA scoring against sparse TF-IDF scoring
+
+Trains the real dataset model and synthetic career catalogs, exports each
+with sparse TF-IDF scoring and with LSA scoring at several embedding
+dimensions, and compares single-query and batch latency, model memory and
+top-k overlap with the sparse ranking.
+
+Run from the ml_service directory:
+    python benchmarks/lsa.py [--careers 1000,10000,100000] [--dims 64,128,256]
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import sample_skill_sets, synthetic_careers
+from course_catalog import load_dataset_skills
+from inference import CareerPathInference
+from train_model import CareerPathPredictor
+
+ML_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PATH = os.path.join(ML_SERVICE_DIR, 'data', 'career_skills_dataset.json')
+
+TOP_N = 5
+BATCH_SIZE = 32
+
+
+def quiet():
+    """Swallow the training/loading progress output"""
+    return redirect_stdout(io.StringIO())
+
+
+def load_model(model_dir):
+    with quiet():
+        predictor = CareerPathInference()
+        predictor.load_model(model_dir)
+    return predictor
+
+
+def measure(predictor, skill_sets):
+    """Mean single-query latency and per-query batch latency in microseconds"""
+    start = time.perf_counter()
+    for skills in skill_sets:
+        predictor.predict_career_paths(skills, top_n=TOP_N)
+    single = (time.perf_counter() - start) / len(skill_sets) * 1e6
+    
+    batches = [skill_sets[i:i + BATCH_SIZE] for i in range(0, len(skill_sets), BATCH_SIZE)]
+    start = time.perf_counter()
+    for batch in batches:
+        predictor.predict_career_paths_batch(batch, [TOP_N] * len(batch))
+    batched = (time.perf_counter() - start) / len(skill_sets) * 1e6
+    
+    return single, batched
+
+
+def top_k_overlap(reference, predictor, skill_sets):
+    """Mean fraction of the reference top-k careers also in predictor's top-k"""
+    overlap = 0.0
+    for skills in skill_sets:
+        expected = {pred['title'] for pred in reference.predict_career_paths(skills, top_n=TOP_N)}
+        actual = {pred['title'] for pred in predictor.predict_career_paths(skills, top_n=TOP_N)}
+        overlap += len(expected & actual) / len(expected)
+    return overlap / len(skill_sets)
+
+
+def compare(name, trainer, skill_sets, dims):
+    """Export trainer in both modes and print one row per configuration"""
+    print(f"\n{name}: {len(trainer.career_data)} careers, {len(trainer.vectorizer.vocabulary_)} terms")
+    print(f"{'mode':<12}{'single (us)':>12}{'batch (us/q)':>14}{'memory (KB)':>13}{'top-5 overlap':>15}")
+    
+    with tempfile.TemporaryDirectory() as model_dir:
+        trainer.export_inference_model(model_dir, precision='float32')
+        sparse = load_model(model_dir)
+    
+    single, batched = measure(sparse, skill_sets)
+    memory = sparse.memory_usage()
+    scoring_memory = memory['career_matrix']
+    print(f"{'tfidf':<12}{single:>12.1f}{batched:>14.1f}{scoring_memory / 1024:>13.1f}{1:>15.1%}")
+    
+    # Dimensions past the catalog's rank collapse to the same embedding
+    for dim in sorted({min(dim, len(trainer.career_data) - 1) for dim in dims}):
+        with quiet():
+            trainer.fit_lsa(dim)
+        with tempfile.TemporaryDirectory() as model_dir:
+            trainer.export_inference_model(model_dir, scoring='lsa')
+            dense = load_model(model_dir)
+        
+        single, batched = measure(dense, skill_sets)
+        memory = dense.memory_usage()
+        scoring_memory = memory['career_embeddings'] + memory['lsa_components']
+        overlap = top_k_overlap(sparse, dense, skill_sets)
+        label = f"lsa-{dense._career_embeddings.shape[1]}"
+        print(f"{label:<12}{single:>12.1f}{batched:>14.1f}{scoring_memory / 1024:>13.1f}{overlap:>15.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--careers", default="1000,10000,100000", help="synthetic catalog sizes")
+    parser.add_argument("--dims", default="64,128,256", help="LSA embedding dimensions")
+    parser.add_argument("--queries", type=int, default=512)
+    args = parser.parse_args()
+    
+    dims = [int(dim) for dim in args.dims.split(",")]
+    skills = load_dataset_skills()
+    skill_sets = sample_skill_sets(skills, args.queries, 5)
+    
+    print("=" * 60)
+    print("LSA Scoring Benchmark")
+    print("=" * 60)
+    print("Memory is the scoring matrices only (career matrix or embeddings + projection)")
+    
+    with quiet():
+        trainer = CareerPathPredictor()
+        trainer.load_training_data(DATA_PATH)
+        trainer.train()
+    compare("Training dataset", trainer, skill_sets, dims)
+    
+    for size in [int(size) for size in args.careers.split(",")]:
+        with quiet():
+            trainer = CareerPathPredictor()
+            trainer.career_data = synthetic_careers(size, skills)
+            trainer.train()
+        compare("Synthetic catalog", trainer, skill_sets, dims)
+
+
+if __name__ == "__main__":
+    main()
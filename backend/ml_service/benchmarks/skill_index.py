@@ -0,0 +1,84 @@
+"""
+Benchmark for the skill-atomic vectorization path
+
+Compares CareerPathPredictor.predict_career_paths with the skill index enabled
+against the original TfidfVectorizer.transform + cosine_similarity path, and
+checks that both produce identical scores.
+
+Run from the ml_service directory after training the model:
+    python benchmarks/skill_index.py
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from train_model import CareerPathPredictor
+
+ML_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_DIR = os.path.join(ML_SERVICE_DIR, 'models')
+DATA_PATH = os.path.join(ML_SERVICE_DIR, 'data', 'career_skills_dataset.json')
+
+ITERATIONS = 2000
+
+
+def sample_skill_sets(count, seed=42):
+    """Draw random skill lists from the training dataset"""
+    with open(DATA_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    all_skills = sorted({skill for example in data['training_data'] for skill in example['skills']})
+    rng = random.Random(seed)
+    return [rng.sample(all_skills, rng.randint(1, 12)) for _ in range(count)]
+
+
+def time_predictions(predictor, skill_sets):
+    """Return mean latency in microseconds per predict_career_paths call"""
+    start = time.perf_counter()
+    for skills in skill_sets:
+        predictor.predict_career_paths(skills, top_n=5)
+    return (time.perf_counter() - start) / len(skill_sets) * 1e6
+
+
+def main():
+    print("=" * 60)
+    print("Skill Index Benchmark")
+    print("=" * 60)
+    print()
+    
+    predictor = CareerPathPredictor()
+    predictor.load_model(MODEL_DIR)
+    skill_sets = sample_skill_sets(ITERATIONS)
+    
+    # Verify scores are identical
+    mismatches = 0
+    for skills in skill_sets:
+        predictor.use_skill_index = True
+        fast = predictor.score_careers(skills)
+        predictor.use_skill_index = False
+        slow = predictor.score_careers(skills)
+        if not np.array_equal(fast, slow):
+            mismatches += 1
+    
+    print(f"\nChecked {len(skill_sets)} skill sets, mismatched scores: {mismatches}")
+    
+    predictor.use_skill_index = False
+    baseline = time_predictions(predictor, skill_sets)
+    predictor.use_skill_index = True
+    fast = time_predictions(predictor, skill_sets)
+    
+    print(f"TfidfVectorizer.transform path: {baseline:8.1f} us/request")
+    print(f"Skill index path:               {fast:8.1f} us/request")
+    print(f"Speedup:                        {baseline / fast:8.1f}x")
+    
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Performance benchmark suite for the ML service
+
+In-process pytest-benchmark measurements of CareerPathInference prediction
+(against catalog size and number of input skills), batch throughput, model
+loading, CourseRecommender.recommend_training and the FastAPI endpoints
+through TestClient.
+
+Run from the ml_service directory:
+    pytest benchmarks --benchmark-autosave            # record a baseline
+    pytest benchmarks --benchmark-compare             # compare with the latest baseline
+
+Compared runs fail when a benchmark's mean regresses by more than 20%; set
+BENCHMARK_REGRESSION_THRESHOLD (e.g. "mean:10%,max:50%") to change that.
+"""
+
+import os
+import sys
+
+import pytest
+
+from conftest import CATALOG_SIZES, DEFAULT_CATALOG_SIZE, sample_skill_sets
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference import CareerPathInference, TEST_CASES
+from utils.course_recommender import CourseRecommender
+
+SKILL_COUNTS = [1, 5, 20]
+BATCH_SIZES = [1, 16, 64]
+
+# Distinct queries cycled through by each benchmark, so results are not
+# dominated by a single cache-friendly input
+QUERY_POOL = 64
+
+
+class QueryCycle:
+    """Round-robin over a fixed list of queries"""
+    
+    def __init__(self, queries):
+        self.queries = queries
+        self.position = 0
+    
+    def next(self):
+        query = self.queries[self.position]
+        self.position = (self.position + 1) % len(self.queries)
+        return query
+
+
+@pytest.mark.benchmark(group="predict")
+@pytest.mark.parametrize("n_skills", SKILL_COUNTS)
+@pytest.mark.parametrize("n_careers", CATALOG_SIZES)
+def test_predict_career_paths(benchmark, predictors, dataset_skills, n_careers, n_skills):
+    predictor = predictors[n_careers]
+    queries = QueryCycle(sample_skill_sets(dataset_skills, QUERY_POOL, n_skills))
+    
+    results = benchmark(lambda: predictor.predict_career_paths(queries.next(), top_n=5))
+    
+    assert len(results) == 5
+
+
+@pytest.mark.benchmark(group="batch")
+@pytest.mark.parametrize("batch_size", BATCH_SIZES)
+def test_predict_career_paths_batch(benchmark, predictors, dataset_skills, batch_size):
+    predictor = predictors[DEFAULT_CATALOG_SIZE]
+    skill_sets = sample_skill_sets(dataset_skills, batch_size, 5)
+    benchmark.extra_info["batch_size"] = batch_size
+    
+    results = benchmark(predictor.predict_career_paths_batch, skill_sets, [5] * batch_size)
+    
+    assert len(results) == batch_size
+    if benchmark.stats is not None:
+        benchmark.extra_info["queries_per_second"] = batch_size / benchmark.stats.stats.mean
+
+
+@pytest.mark.benchmark(group="load_model")
+@pytest.mark.parametrize("n_careers", CATALOG_SIZES)
+def test_load_model(benchmark, model_dirs, n_careers):
+    def load():
+        predictor = CareerPathInference()
+        predictor.load_model(model_dirs[n_careers])
+        return predictor
+    
+    predictor = benchmark.pedantic(load, rounds=5, iterations=1, warmup_rounds=1)
+    
+    assert len(predictor.career_data) == n_careers
+
+
+@pytest.fixture
+def catalog_enabled(request, course_catalog):
+    """Run with the synthetic course catalog installed, or with the built-in courses"""
+    previous = CourseRecommender.CATALOG
+    CourseRecommender.set_catalog(course_catalog if request.param else None)
+    yield request.param
+    CourseRecommender.CATALOG = previous
+
+
+@pytest.mark.benchmark(group="recommend_training")
+@pytest.mark.parametrize("catalog_enabled", [False, True], ids=["builtin", "catalog"], indirect=True)
+def test_recommend_training(benchmark, predictors, dataset_skills, catalog_enabled):
+    predictor = predictors[DEFAULT_CATALOG_SIZE]
+    cases = []
+    for skills in sample_skill_sets(dataset_skills, QUERY_POOL, 5):
+        predictions = predictor.predict_career_paths(skills, top_n=5)
+        required = {pred['title']: predictor.get_required_skills(pred['title']) for pred in predictions}
+        cases.append((predictions, skills, required))
+    queries = QueryCycle(cases)
+    
+    def recommend():
+        predictions, skills, required = queries.next()
+        return CourseRecommender.recommend_training(
+            career_paths=predictions,
+            user_skills=skills,
+            required_skills=required
+        )
+    
+    results = benchmark(recommend)
+    
+    assert results
+
+
+@pytest.fixture(scope="module")
+def client(model_dirs):
+    """TestClient over ml_server serving the default-size synthetic model"""
+    from fastapi.testclient import TestClient
+    
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api'))
+    import ml_server
+    
+    previous = ml_server.model_dir
+    ml_server.model_dir = model_dirs[DEFAULT_CATALOG_SIZE]
+    with TestClient(ml_server.app) as test_client:
+        yield test_client
+    ml_server.model_dir = previous
+
+
+@pytest.mark.benchmark(group="endpoint")
+@pytest.mark.parametrize("path", [
+    "/api/predict-career-paths",
+    "/api/recommend-training",
+    "/api/career-insights",
+    "/api/skill-gap",
+])
+def test_endpoint(benchmark, client, path):
+    queries = QueryCycle(TEST_CASES)
+    
+    def post():
+        response = client.post(path, json={"skills": queries.next(), "top_n": 5})
+        assert response.status_code == 200
+        return response
+    
+    benchmark(post)
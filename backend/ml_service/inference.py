@@ -0,0 +1,751 @@
+"""
+Career Path Inference
+
+Serving-only side of CareerPathPredictor. Scores user skills against the
+trained careers using just numpy and scipy: the fitted vocabulary, IDF
+weights and normalized career matrix are exported by train_model.py, so
+neither scikit-learn nor the pickled vectorizer is imported at runtime.
+"""
+
+import hashlib
+import json
+import math
+import os
+from collections.abc import Mapping
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from utils.profiler import estimate_size
+from utils.tfidf import INFERENCE_ARRAYS, INFERENCE_METADATA, TfidfAnalyzer
+from utils.timing import stage
+
+# Upper bound on skills outside the training vocabulary that get memoized
+# by the skill index. Anything beyond this is tokenized on every request.
+SKILL_CACHE_SIZE = 10000
+
+# How queries are scored: sparse TF-IDF cosine against the career matrix, or
+# cosine between dense LSA (truncated SVD) embeddings
+SCORING_MODES = ('tfidf', 'lsa')
+
+# Storage precisions for the career matrix. int8 is dequantized to float32
+# on load, so it only shrinks the artifact; float32 also halves memory.
+PRECISIONS = ('float64', 'float32', 'int8')
+
+# Default export precision, for both the CLI and save_model: float64 keeps
+# scores bit-identical to the trained vectorizer; the others trade accuracy
+# for size and must be asked for
+DEFAULT_PRECISION = 'float64'
+
+# Stored dtype of the career matrix data for each precision
+PRECISION_DTYPES = {'float64': np.float64, 'float32': np.float32, 'int8': np.int8}
+
+# Sample skill sets used to sanity-check a freshly trained model (and to warm
+# up the API server before it reports ready)
+TEST_CASES = [
+    ["JavaScript", "React", "Node.js", "HTML", "CSS"],
+    ["Python", "Machine Learning", "TensorFlow", "Data Analysis"],
+    ["Java", "Spring Boot", "Microservices", "Docker"],
+    ["AWS", "Kubernetes", "DevOps", "CI/CD"]
+]
+
+
+def compact_matrix(matrix, precision=DEFAULT_PRECISION):
+    """
+    Arrays storing a term x career CSR matrix at the given precision
+    
+    Indices are stored as int32. For int8, each career column is scaled so
+    its largest weight maps to 127 and the per-career scales are stored
+    alongside.
+    
+    Returns:
+        dict: Arrays to save, keyed as load_model expects them
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"precision must be one of {', '.join(PRECISIONS)}")
+    
+    arrays = {
+        'matrix_indices': matrix.indices.astype(np.int32),
+        'matrix_indptr': matrix.indptr.astype(np.int32),
+        'matrix_shape': np.array(matrix.shape)
+    }
+    if precision == 'int8':
+        scales = np.zeros(matrix.shape[1], dtype=np.float32)
+        np.maximum.at(scales, matrix.indices, np.abs(matrix.data).astype(np.float32))
+        scales /= 127
+        scales[scales == 0] = 1
+        arrays['matrix_data'] = np.rint(matrix.data / scales[matrix.indices]).astype(np.int8)
+        arrays['matrix_scales'] = scales
+    else:
+        arrays['matrix_data'] = matrix.data.astype(precision)
+    return arrays
+
+
+class CareerTable:
+    """
+    Career metadata in struct-of-arrays form
+    
+    Titles and descriptions are plain lists; popularity and each career's
+    skills (ids into one shared skill list, CSR-style) are int32 arrays, so
+    skill strings are stored once instead of once per career. Indexing and
+    iteration yield {'title', 'description', 'popularity'} dicts, so a table
+    can stand in for the list of career dicts.
+    """
+    
+    def __init__(self, titles, descriptions, popularity, skill_names, skill_ids, skill_indptr):
+        self.titles = titles
+        self.descriptions = descriptions
+        self.popularity = np.asarray(popularity, dtype=np.int32)
+        self.skill_names = skill_names
+        self.skill_ids = np.asarray(skill_ids, dtype=np.int32)
+        self.skill_indptr = np.asarray(skill_indptr, dtype=np.int32)
+    
+    @classmethod
+    def from_records(cls, career_data):
+        """Build a table from career dicts with title, description, skills_text and popularity"""
+        skill_ids = {}
+        ids = []
+        indptr = [0]
+        for career in career_data:
+            for skill in career['skills_text'].split(', '):
+                ids.append(skill_ids.setdefault(skill, len(skill_ids)))
+            indptr.append(len(ids))
+        
+        return cls(
+            titles=[career['title'] for career in career_data],
+            descriptions=[career['description'] for career in career_data],
+            popularity=[career.get('popularity', 0) for career in career_data],
+            skill_names=list(skill_ids),
+            skill_ids=ids,
+            skill_indptr=indptr
+        )
+    
+    def __len__(self):
+        return len(self.titles)
+    
+    def __getitem__(self, i):
+        return {
+            'title': self.titles[i],
+            'description': self.descriptions[i],
+            'popularity': int(self.popularity[i])
+        }
+    
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+    
+    def skills(self, i):
+        """Skills of career i (shared string objects)"""
+        names = self.skill_names
+        return [names[j] for j in self.skill_ids[self.skill_indptr[i]:self.skill_indptr[i + 1]]]
+    
+    def skills_by_title(self):
+        """Read-only title -> skills mapping computed from the table on access"""
+        return CareerSkills(self)
+    
+    def metadata(self):
+        """JSON-serializable part of the table"""
+        return {
+            'titles': self.titles,
+            'descriptions': self.descriptions,
+            'skills': self.skill_names
+        }
+    
+    def arrays(self):
+        """Array part of the table"""
+        return {
+            'career_popularity': self.popularity,
+            'career_skill_ids': self.skill_ids,
+            'career_skill_indptr': self.skill_indptr
+        }
+
+
+class CareerSkills(Mapping):
+    """Title -> skills view over a CareerTable (no per-career lists are kept)"""
+    
+    def __init__(self, table):
+        self._table = table
+        self._ids = {title: i for i, title in enumerate(table.titles)}
+    
+    def __getitem__(self, title):
+        return self._table.skills(self._ids[title])
+    
+    def __iter__(self):
+        return iter(self._ids)
+    
+    def __len__(self):
+        return len(self._ids)
+
+
+class CareerPathInference:
+    """Skill-atomic TF-IDF scoring over an exported career model"""
+    
+    def __init__(self):
+        self.vocabulary = {}
+        self.career_data = []
+        self.skill_vectors = None
+        
+        # Hash of the loaded model files, changes whenever the model does
+        self.model_version = None
+        
+        # Skill-atomic inference index (see build_skill_index)
+        self.skill_index = {}
+        self.career_skills = {}
+        self.skill_display_names = []
+        self._career_matrix_t = None
+        self.analyzer = None
+        self._idf = None
+        self._tokenize = None
+        
+        # Dense LSA scoring (scoring == 'lsa'): vocabulary x k projection and
+        # L2-normalized careers x k embeddings, both float32
+        self.scoring = 'tfidf'
+        self.precision = DEFAULT_PRECISION
+        self._lsa_components_t = None
+        self._career_embeddings = None
+        
+        # Query vectors are built in the scoring matrix's dtype so products never upcast
+        self._score_dtype = np.float64
+    
+    @staticmethod
+    def has_exported_model(model_dir):
+        """Whether model_dir contains an exported inference artifact"""
+        return (
+            os.path.exists(os.path.join(model_dir, INFERENCE_ARRAYS)) and
+            os.path.exists(os.path.join(model_dir, INFERENCE_METADATA))
+        )
+    
+    def load_model(self, model_dir):
+        """Load the exported inference artifact"""
+        print(f"Loading model from {model_dir}...")
+        
+        digest = hashlib.sha256()
+        
+        with open(os.path.join(model_dir, INFERENCE_METADATA), 'rb') as f:
+            raw_metadata = f.read()
+        digest.update(raw_metadata)
+        metadata = json.loads(raw_metadata)
+        
+        with open(os.path.join(model_dir, INFERENCE_ARRAYS), 'rb') as f:
+            digest.update(f.read())
+            f.seek(0)
+            with np.load(f, allow_pickle=False) as arrays:
+                self._idf = arrays['idf']
+                
+                self.scoring = metadata.get('scoring', 'tfidf')
+                self.precision = metadata.get('precision', DEFAULT_PRECISION)
+                if self.scoring == 'lsa':
+                    self._lsa_components_t = arrays['lsa_components_t']
+                    self._career_embeddings = arrays['career_embeddings']
+                    self._career_matrix_t = None
+                    self._score_dtype = self._career_embeddings.dtype
+                else:
+                    data = arrays['matrix_data']
+                    expected = PRECISION_DTYPES.get(self.precision)
+                    if data.dtype != expected:
+                        raise ValueError(
+                            f"Inference artifact says precision {self.precision} "
+                            f"but its career matrix is stored as {data.dtype}"
+                        )
+                    indices = arrays['matrix_indices']
+                    if 'matrix_scales' in arrays:
+                        data = data.astype(np.float32) * arrays['matrix_scales'][indices]
+                    self._career_matrix_t = csr_matrix(
+                        (data, indices, arrays['matrix_indptr']),
+                        shape=tuple(arrays['matrix_shape'])
+                    )
+                    self._lsa_components_t = None
+                    self._career_embeddings = None
+                    self._score_dtype = self._career_matrix_t.dtype
+                
+                if 'careers' in metadata:
+                    careers = metadata['careers']
+                    self.career_data = CareerTable(
+                        careers['titles'],
+                        careers['descriptions'],
+                        arrays['career_popularity'],
+                        careers['skills'],
+                        arrays['career_skill_ids'],
+                        arrays['career_skill_indptr']
+                    )
+                else:
+                    # Artifacts exported before career metadata was compacted
+                    self.career_data = CareerTable.from_records(metadata['career_data'])
+        
+        # The same analyzer the job ranker loads, so both tokenize alike
+        self.analyzer = TfidfAnalyzer.from_artifact(metadata, self._idf)
+        self.vocabulary = self.analyzer.vocabulary
+        self.skill_display_names = metadata.get('skill_display_names', [])
+        self._tokenize = self.analyzer.tokenize
+        if self.scoring == 'lsa':
+            self.skill_vectors = self._career_embeddings
+        else:
+            self.skill_vectors = self._career_matrix_t.T
+        self.model_version = digest.hexdigest()[:16]
+        
+        self.build_skill_index()
+        
+        print(f"Model loaded successfully! ({self.scoring}, {self.precision})")
+    
+    def build_skill_index(self):
+        """
+        Precompute per-skill term counts from the fitted vocabulary
+        
+        The vectorizer tokenizes the comma-joined skill string, so a query is
+        the sum of each skill's own unigrams/bigrams plus one bigram across
+        every boundary between neighbouring skills. Caching the per-skill part
+        (and its first/last token) lets inference skip the regex tokenizer and
+        n-gram generation while producing exactly the same TF-IDF vector.
+        """
+        careers = self.career_data
+        if not isinstance(careers, CareerTable):
+            careers = CareerTable.from_records(careers)
+        
+        self.career_skills = careers.skills_by_title()
+        self.skill_index = {skill: self._analyze_skill(skill) for skill in careers.skill_names}
+        
+        print(f"Skill index built for {len(self.skill_index)} skills")
+    
+    def memory_usage(self):
+        """
+        Approximate bytes held by each part of the loaded model
+        
+        Returns:
+            dict: Component name to bytes, plus their sum under 'total'
+        """
+        # Objects shared between components are counted for the first one only
+        seen = set()
+        usage = {
+            name: estimate_size(component, seen)
+            for name, component in self._memory_components().items()
+            if component is not None
+        }
+        usage['total'] = sum(usage.values())
+        return usage
+    
+    def _memory_components(self):
+        """Model components reported by memory_usage, in reporting order"""
+        return {
+            'career_matrix': self._career_matrix_t,
+            'career_embeddings': self._career_embeddings,
+            'lsa_components': self._lsa_components_t,
+            'idf': self._idf,
+            'vocabulary': self.vocabulary,
+            'career_data': self.career_data,
+            'skill_index': self.skill_index,
+            'career_skills': self.career_skills
+        }
+    
+    def get_required_skills(self, career_title):
+        """Return the (lowercased) skills associated with a career title"""
+        return self.career_skills.get(career_title, [])
+    
+    def _analyze_skill(self, skill):
+        """Return (first_token, last_token, {column: count}) for one lowercased skill"""
+        vocabulary = self.vocabulary
+        tokens = self._tokenize(skill)
+        if not tokens:
+            return None, None, {}
+        
+        terms = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        counts = {}
+        for term in terms:
+            column = vocabulary.get(term)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + 1
+        
+        return tokens[0], tokens[-1], counts
+    
+    def _lookup_skill(self, skill):
+        """Get the cached analysis for a lowercased skill, analyzing it on a miss"""
+        entry = self.skill_index.get(skill)
+        if entry is None:
+            entry = self._analyze_skill(skill)
+            if len(self.skill_index) < SKILL_CACHE_SIZE:
+                self.skill_index[skill] = entry
+        return entry
+    
+    def _query_row(self, user_skills):
+        """Return sorted column indices and normalized TF-IDF weights for one skill list"""
+        vocabulary = self.vocabulary
+        counts = {}
+        previous_token = None
+        for skill in user_skills:
+            first_token, last_token, skill_counts = self._lookup_skill(skill.lower())
+            if first_token is None:
+                continue
+            
+            for column, count in skill_counts.items():
+                counts[column] = counts.get(column, 0) + count
+            
+            # Bigram spanning the ", " separator between two skills
+            if previous_token is not None:
+                column = vocabulary.get(f"{previous_token} {first_token}")
+                if column is not None:
+                    counts[column] = counts.get(column, 0) + 1
+            previous_token = last_token
+        
+        indices = np.array(sorted(counts), dtype=np.int32)
+        data = np.array([counts[column] for column in indices], dtype=np.float64)
+        data *= self._idf[indices]
+        
+        # transform() normalizes once and cosine_similarity() normalizes again;
+        # both are repeated here so scores stay bit-identical.
+        for _ in range(2):
+            norm = 0.0
+            for value in data:
+                norm += value * value
+            if norm != 0.0:
+                data /= math.sqrt(norm)
+        
+        return indices, data
+    
+    def vectorize_skill_batch(self, skill_lists):
+        """
+        Build L2-normalized TF-IDF query vectors for several skill lists
+        
+        Args:
+            skill_lists (list): One list of skills per query
+            
+        Returns:
+            csr_matrix: len(skill_lists) x vocabulary query matrix
+        """
+        rows = [self._query_row(user_skills) for user_skills in skill_lists]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int32)
+        indptr[1:] = np.cumsum([len(indices) for indices, _ in rows])
+        
+        if rows:
+            indices = np.concatenate([indices for indices, _ in rows])
+            data = np.concatenate([data for _, data in rows])
+        else:
+            indices = np.array([], dtype=np.int32)
+            data = np.array([], dtype=np.float64)
+        
+        # Match the scoring matrix precision so the product never upcasts (and copies) it
+        return csr_matrix(
+            (data.astype(self._score_dtype, copy=False), indices, indptr),
+            shape=(len(rows), len(self._idf))
+        )
+    
+    def vectorize_skills(self, user_skills):
+        """
+        Build the L2-normalized TF-IDF query vector for a list of skills
+        
+        Args:
+            user_skills (list): List of user skills
+            
+        Returns:
+            csr_matrix: 1 x vocabulary query vector
+        """
+        return self.vectorize_skill_batch([user_skills])
+    
+    def score_career_batch(self, skill_lists):
+        """
+        Cosine similarity between several skill lists and every career
+        
+        All queries are scored in a single matrix product, so batching
+        concurrent requests costs little more than scoring one of them. With
+        LSA scoring the TF-IDF queries are projected onto the embedding space
+        and scored with one dense (BLAS) product against the career embeddings.
+        
+        Args:
+            skill_lists (list): One list of skills per query
+            
+        Returns:
+            np.ndarray: len(skill_lists) x len(career_data) similarity scores
+        """
+        with stage("vectorize"):
+            user_vectors = self.vectorize_skill_batch(skill_lists)
+        
+        if self._career_embeddings is not None:
+            with stage("project"):
+                embedded = np.asarray(user_vectors @ self._lsa_components_t)
+                norms = np.linalg.norm(embedded, axis=1, keepdims=True)
+                embedded /= np.where(norms == 0, 1, norms)
+            with stage("similarity"):
+                return embedded @ self._career_embeddings.T
+        
+        with stage("similarity"):
+            return (user_vectors @ self._career_matrix_t).toarray()
+    
+    def score_careers(self, user_skills):
+        """
+        Cosine similarity between the user's skills and every career
+        
+        Args:
+            user_skills (list): List of user skills
+            
+        Returns:
+            np.ndarray: One similarity score per entry in career_data
+        """
+        return self.score_career_batch([user_skills])[0]
+    
+    def rank_careers(self, similarities, top_n=5):
+        """
+        Turn one row of similarity scores into the top N career results
+        
+        Args:
+            similarities (np.ndarray): One similarity score per career
+            top_n (int): Number of career paths to return
+            
+        Returns:
+            list: Top N career paths with match scores
+        """
+        # Get top N indices
+        top_indices = np.argsort(similarities)[::-1][:top_n]
+        
+        return self.career_results(top_indices, similarities[top_indices])
+    
+    def career_results(self, career_indices, scores):
+        """
+        Build career path results for ranked career indices
+        
+        Args:
+            career_indices (np.ndarray): Career indices, best match first
+            scores (np.ndarray): Similarity score of each of those careers
+            
+        Returns:
+            list: Career paths with match scores
+        """
+        results = []
+        for idx, (career_idx, match_score) in enumerate(zip(career_indices, scores)):
+            career = self.career_data[career_idx]
+            
+            results.append({
+                'id': idx + 1,
+                'title': career['title'],
+                'description': career['description'],
+                'match_score': float(match_score),
+                'confidence': 'high' if match_score > 0.5 else 'medium' if match_score > 0.3 else 'low'
+            })
+        
+        return results
+        
+    def predict_career_paths(self, user_skills, top_n=5):
+        """
+        Predict top N career paths for given user skills
+        
+        Args:
+            user_skills (list): List of user skills
+            top_n (int): Number of career paths to return
+            
+        Returns:
+            list: Top N career paths with match scores
+        """
+        # Calculate cosine similarity between user skills and all careers
+        similarities = self.score_careers(user_skills)
+        
+        with stage("top_k"):
+            return self.rank_careers(similarities, top_n)
+    
+    def predict_career_paths_batch(self, skill_lists, top_ns):
+        """
+        Predict career paths for several skill lists in one scoring pass
+        
+        Args:
+            skill_lists (list): One list of skills per query
+            top_ns (list): Number of career paths to return for each query
+            
+        Returns:
+            list: One list of career path results per query
+        """
+        similarities = self.score_career_batch(skill_lists)
+        
+        with stage("top_k"):
+            return [
+                self.rank_careers(row, top_n)
+                for row, top_n in zip(similarities, top_ns)
+            ]
+
+
+class SkillSession:
+    """
+    Incrementally maintained career scores for a skill list edited one skill at a time
+    
+    Keeps the unnormalized query term counts, the squared norm of their TF-IDF
+    weights and the raw dot product with every career (or, with LSA scoring,
+    the unnormalized query embedding). Adding or removing a skill applies only
+    that skill's terms plus the separator bigrams it creates or breaks, so an
+    update costs one skill's non-zeros instead of re-vectorizing the whole
+    list. Scores match predict_career_paths for the same ordered skill list up
+    to floating point rounding.
+    """
+    
+    # Updates between full rebuilds, bounding accumulated rounding error
+    REBUILD_INTERVAL = 1000
+    
+    def __init__(self, predictor):
+        """
+        Args:
+            predictor (CareerPathInference): Loaded model to score against
+        """
+        self.predictor = predictor
+        self.skills = []
+        self._keys = []
+        self._entries = []
+        self._reset()
+    
+    def _reset(self):
+        predictor = self.predictor
+        self._model_version = predictor.model_version
+        self._counts = {}
+        self._norm_sq = 0.0
+        self._updates = 0
+        if predictor._career_embeddings is not None:
+            self._dots = None
+            self._embedded = np.zeros(predictor._career_embeddings.shape[1], dtype=np.float64)
+        else:
+            self._dots = np.zeros(predictor._career_matrix_t.shape[1], dtype=np.float64)
+            self._embedded = None
+    
+    def _rebuild(self):
+        """Recompute all state from the skill list (also picks up a reloaded model)"""
+        skills, keys = self.skills, self._keys
+        self.skills, self._keys, self._entries = [], [], []
+        self._reset()
+        for skill, key in zip(skills, keys):
+            self._append(skill, key)
+        self._updates = 0
+    
+    def _bigram(self, left, right):
+        """Vocabulary column of the bigram spanning two neighbouring skills"""
+        if left is None or right is None:
+            return None
+        return self.predictor.vocabulary.get(f"{left[1]} {right[0]}")
+    
+    def _neighbour(self, position, step):
+        """Nearest tokenized skill entry from position in direction step"""
+        position += step
+        while 0 <= position < len(self._entries):
+            if self._entries[position][0] is not None:
+                return self._entries[position]
+            position += step
+        return None
+    
+    def _apply(self, delta):
+        """Add per-column count changes to the counts, norm and career dot products"""
+        predictor = self.predictor
+        idf = predictor._idf
+        counts = self._counts
+        for column, change in delta.items():
+            if not change:
+                continue
+            old = counts.get(column, 0)
+            new = old + change
+            if new:
+                counts[column] = new
+            else:
+                del counts[column]
+            
+            weight = idf[column]
+            self._norm_sq += (new * new - old * old) * weight * weight
+            weight *= change
+            
+            if self._embedded is not None:
+                self._embedded += weight * predictor._lsa_components_t[column]
+            else:
+                matrix = predictor._career_matrix_t
+                start, end = matrix.indptr[column], matrix.indptr[column + 1]
+                self._dots[matrix.indices[start:end]] += weight * matrix.data[start:end]
+        
+        self._updates += 1
+        if not counts:
+            self._reset()
+    
+    def _append(self, skill, key):
+        entry = self.predictor._lookup_skill(key)
+        delta = dict(entry[2])
+        if entry[0] is not None:
+            column = self._bigram(self._neighbour(len(self._entries), -1), entry)
+            if column is not None:
+                delta[column] = delta.get(column, 0) + 1
+        
+        self.skills.append(skill)
+        self._keys.append(key)
+        self._entries.append(entry)
+        self._apply(delta)
+    
+    def add(self, skill):
+        """
+        Append a skill to the list
+        
+        Returns:
+            bool: False if the skill was already in the list
+        """
+        key = skill.lower()
+        if key in self._keys:
+            return False
+        
+        if self._model_version != self.predictor.model_version or self._updates >= self.REBUILD_INTERVAL:
+            self._rebuild()
+        
+        self._append(skill, key)
+        return True
+    
+    def remove(self, skill):
+        """
+        Remove a skill from the list
+        
+        Returns:
+            bool: False if the skill was not in the list
+        """
+        key = skill.lower()
+        if key not in self._keys:
+            return False
+        
+        if self._model_version != self.predictor.model_version or self._updates >= self.REBUILD_INTERVAL:
+            self._rebuild()
+        
+        position = self._keys.index(key)
+        entry = self._entries[position]
+        delta = {column: -count for column, count in entry[2].items()}
+        if entry[0] is not None:
+            previous = self._neighbour(position, -1)
+            following = self._neighbour(position, 1)
+            
+            # The skill's separator bigrams go, and its neighbours become adjacent
+            for column, change in (
+                (self._bigram(previous, entry), -1),
+                (self._bigram(entry, following), -1),
+                (self._bigram(previous, following), 1)
+            ):
+                if column is not None:
+                    delta[column] = delta.get(column, 0) + change
+        
+        del self.skills[position]
+        del self._keys[position]
+        del self._entries[position]
+        self._apply(delta)
+        return True
+    
+    def top(self, top_n=5):
+        """
+        Top N career paths for the current skill list
+        
+        Args:
+            top_n (int): Number of career paths to return
+            
+        Returns:
+            list: Top N career paths with match scores (empty without any known terms)
+        """
+        if self._model_version != self.predictor.model_version:
+            self._rebuild()
+        if self._norm_sq <= 0.0:
+            return []
+        
+        if self._embedded is not None:
+            norm = np.linalg.norm(self._embedded)
+            if norm == 0.0:
+                return []
+            scores = self.predictor._career_embeddings @ (self._embedded / norm).astype(self.predictor._score_dtype)
+        else:
+            scores = self._dots
+        
+        top_n = min(top_n, len(scores))
+        top_indices = np.argpartition(-scores, top_n - 1)[:top_n]
+        # Best first, ties to the later career like rank_careers' reversed argsort
+        top_indices = top_indices[np.lexsort((-top_indices, -scores[top_indices]))]
+        top_scores = scores[top_indices]
+        if self._embedded is None:
+            top_scores = top_scores / math.sqrt(self._norm_sq)
+        
+        return self.predictor.career_results(top_indices, top_scores)
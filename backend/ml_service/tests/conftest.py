@@ -0,0 +1,59 @@
+"""
+Shared fixtures for the ML service unit tests
+
+A small career model is trained once per session from the training dataset
+and exported to a temporary model directory, so the tests do not depend on a
+previously trained model.
+
+Run from the ml_service directory:
+    pytest tests
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+ML_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ML_SERVICE_DIR)
+sys.path.append(os.path.join(ML_SERVICE_DIR, 'api'))
+
+from train_model import CareerPathPredictor
+
+DATA_PATH = os.path.join(ML_SERVICE_DIR, 'data', 'career_skills_dataset.json')
+
+
+@pytest.fixture(scope="session")
+def dataset_skills():
+    """Every (cased) skill of the training dataset, sorted"""
+    with open(DATA_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return sorted({skill for example in data['training_data'] for skill in example['skills']})
+
+
+@pytest.fixture(scope="session")
+def trained_predictor():
+    """CareerPathPredictor trained on the dataset, scoring through its TfidfVectorizer"""
+    predictor = CareerPathPredictor()
+    predictor.load_training_data(DATA_PATH)
+    predictor.train()
+    return predictor
+
+
+@pytest.fixture(scope="session")
+def model_dir(trained_predictor, tmp_path_factory):
+    """Directory holding the trained model and its exported inference artifact"""
+    directory = str(tmp_path_factory.mktemp("model"))
+    trained_predictor.save_model(directory)
+    return directory
+
+
+@pytest.fixture(scope="session")
+def inference(model_dir):
+    """CareerPathInference loaded from the exported model"""
+    from inference import CareerPathInference
+    
+    predictor = CareerPathInference()
+    predictor.load_model(model_dir)
+    return predictor
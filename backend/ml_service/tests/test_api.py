@@ -0,0 +1,49 @@
+"""
+HTTP caching of /api/available-careers: ETags and 304 Not Modified
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="module")
+def client(model_dir):
+    """TestClient over ml_server serving the session's trained model"""
+    import ml_server
+    
+    previous = ml_server.model_dir
+    ml_server.model_dir = model_dir
+    with TestClient(ml_server.app) as test_client:
+        yield test_client
+    ml_server.model_dir = previous
+
+
+def test_available_careers_not_modified_round_trip(client):
+    first = client.get("/api/available-careers")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and etag.endswith('"')
+    assert first.json()
+    
+    cached = client.get("/api/available-careers", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+    
+    assert client.get("/api/available-careers", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    assert client.get("/api/available-careers", headers={"If-None-Match": f'"stale", {etag}'}).status_code == 304
+    
+    stale = client.get("/api/available-careers", headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == first.content
+
+
+def test_available_careers_etag_depends_on_page(client):
+    full = client.get("/api/available-careers")
+    page = client.get("/api/available-careers", params={"limit": 1})
+    assert page.status_code == 200
+    assert page.headers["ETag"] != full.headers["ETag"]
+    
+    # The full list's ETag does not validate a different page
+    response = client.get("/api/available-careers", params={"limit": 1}, headers={"If-None-Match": full.headers["ETag"]})
+    assert response.status_code == 200
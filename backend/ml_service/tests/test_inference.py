@@ -0,0 +1,105 @@
+"""
+Correctness tests for career scoring: the skill index against the fitted
+TfidfVectorizer, the exported inference model against the trained one, and
+SkillSession's incremental updates against scoring the whole skill list
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from inference import SkillSession, TEST_CASES
+
+
+def sample_skill_sets(skills, count=200, seed=7):
+    """Random skill lists of 1-12 dataset skills, plus unknown and blank entries"""
+    rng = random.Random(seed)
+    skill_sets = [rng.sample(skills, rng.randint(1, 12)) for _ in range(count)]
+    skill_sets += [["Quantum Basket Weaving"], ["", "Python"], ["python", "PYTHON"]]
+    return TEST_CASES + skill_sets
+
+
+@pytest.fixture
+def vectorizer_scoring(trained_predictor):
+    """Score through TfidfVectorizer.transform + cosine_similarity for the test's duration"""
+    def score(skills):
+        trained_predictor.use_skill_index = False
+        try:
+            return trained_predictor.score_careers(skills), trained_predictor.predict_career_paths(skills, top_n=5)
+        finally:
+            trained_predictor.use_skill_index = True
+    return score
+
+
+def test_skill_index_scores_are_bit_identical(trained_predictor, vectorizer_scoring, dataset_skills):
+    for skills in sample_skill_sets(dataset_skills):
+        expected_scores, expected_paths = vectorizer_scoring(skills)
+        assert np.array_equal(trained_predictor.score_careers(skills), expected_scores), skills
+        assert trained_predictor.predict_career_paths(skills, top_n=5) == expected_paths, skills
+
+
+def test_batch_scores_match_single_queries(trained_predictor, dataset_skills):
+    skill_sets = sample_skill_sets(dataset_skills, count=32)
+    batch = trained_predictor.score_career_batch(skill_sets)
+    for row, skills in zip(batch, skill_sets):
+        assert np.array_equal(row, trained_predictor.score_careers(skills)), skills
+
+
+def test_exported_model_matches_trained_model(trained_predictor, inference, dataset_skills):
+    assert inference.precision == 'float64'
+    for skills in sample_skill_sets(dataset_skills):
+        np.testing.assert_allclose(
+            inference.score_careers(skills), trained_predictor.score_careers(skills), rtol=0, atol=1e-12
+        )
+
+
+def assert_session_matches_full_scoring(session, predictor, top_n=10):
+    """session.top() agrees with scoring session.skills from scratch"""
+    results = session.top(top_n)
+    if not session.skills:
+        assert results == []
+        return
+    
+    scores = predictor.score_careers(session.skills)
+    if not scores.any():
+        assert results == []
+        return
+    
+    expected = np.sort(scores)[::-1][:top_n]
+    np.testing.assert_allclose([result['match_score'] for result in results], expected, rtol=0, atol=1e-9)
+    
+    # Near-ties may order differently; every returned career must have the reported score
+    index_of = {career['title']: i for i, career in enumerate(predictor.career_data)}
+    for result in results:
+        assert result['match_score'] == pytest.approx(scores[index_of[result['title']]], abs=1e-9)
+
+
+def test_skill_session_matches_full_scoring(inference, dataset_skills):
+    rng = random.Random(11)
+    session = SkillSession(inference)
+    assert session.top() == []
+    
+    for _ in range(300):
+        if session.skills and rng.random() < 0.4:
+            skill = rng.choice(session.skills)
+            assert session.remove(skill)
+        else:
+            skill = rng.choice(dataset_skills + ["Quantum Basket Weaving"])
+            present = skill.lower() in [known.lower() for known in session.skills]
+            assert session.add(skill) != present
+        assert_session_matches_full_scoring(session, inference)
+
+
+def test_skill_session_removal_rejoins_neighbours(inference):
+    # Removing the middle skill makes its neighbours adjacent, creating their bigram
+    session = SkillSession(inference)
+    for skill in ["Machine Learning", "Python", "Deep Learning", "SQL"]:
+        session.add(skill)
+    session.remove("Python")
+    session.remove("Deep Learning")
+    assert session.skills == ["Machine Learning", "SQL"]
+    assert_session_matches_full_scoring(session, inference)
+    
+    assert not session.remove("Python")
+    assert not session.add("machine learning")
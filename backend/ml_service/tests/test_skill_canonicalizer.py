@@ -0,0 +1,80 @@
+"""
+Tests for SkillCanonicalizer: exact, spelling-variant and fuzzy matches, and
+real skills that must not be rewritten into other ones
+"""
+
+import pytest
+
+from utils.helpers import load_skill_aliases
+from utils.skill_canonicalizer import SkillCanonicalizer, bounded_edit_distance
+
+
+# Real skills one edit away from each other; none may be swapped for another
+NEIGHBOURING_SKILLS = ["Scala", "Flask", "Linux", "Excel", "Java", "Rust", "Ruby", "Go", "Dart"]
+
+
+@pytest.fixture(scope="module")
+def canonicalizer(dataset_skills):
+    """Canonicalizer over the dataset's skills and aliases, like the server builds it"""
+    vocabulary = [skill.lower() for skill in dataset_skills] + [skill.lower() for skill in NEIGHBOURING_SKILLS]
+    return SkillCanonicalizer(
+        vocabulary,
+        load_skill_aliases(),
+        display_names=dataset_skills + NEIGHBOURING_SKILLS
+    )
+
+
+@pytest.mark.parametrize("skill, expected", [
+    ("Reactjs ", "React"),
+    ("Kubernets", "Kubernetes"),
+    ("Node JS", "Node.js"),
+    ("node.js", "Node.js"),
+    ("  python  ", "Python"),
+    ("Javascrpit", "JavaScript"),
+    ("Machine Lerning", "Machine Learning"),
+])
+def test_variants_map_to_canonical_skill(canonicalizer, skill, expected):
+    assert canonicalizer.canonicalize(skill) == expected
+
+
+@pytest.mark.parametrize("skill", ["Scale", "Flash", "Linus", "Excels", "Jaca", "Rest", "Rests", "Cart", "Data"])
+def test_real_words_are_not_swapped_for_another_skill(canonicalizer, skill):
+    assert canonicalizer.canonicalize(skill) == skill
+
+
+@pytest.mark.parametrize("skill", NEIGHBOURING_SKILLS)
+def test_known_skills_keep_their_display_casing(canonicalizer, skill):
+    assert canonicalizer.canonicalize(skill) == skill
+    assert canonicalizer.canonicalize(skill.lower()) == skill
+
+
+def test_unknown_skill_keeps_input_spelling(canonicalizer):
+    assert canonicalizer.canonicalize(" Quantum Basket Weaving ") == "Quantum Basket Weaving"
+
+
+def test_lowercase_only_skill_keeps_input_spelling():
+    canonicalizer = SkillCanonicalizer(["terraform"])
+    assert canonicalizer.canonicalize("TerraForm") == "TerraForm"
+
+
+def test_ambiguous_fuzzy_match_is_rejected():
+    # "postgres" is one edit from both candidates: neither is guessed
+    canonicalizer = SkillCanonicalizer(["postgrey", "postgresx"])
+    assert canonicalizer.canonicalize("postgres") == "postgres"
+    assert canonicalizer.canonicalize("postgrey") == "postgrey"
+
+
+def test_canonicalize_skills_drops_blanks_and_duplicates(canonicalizer):
+    assert canonicalizer.canonicalize_skills(["Rust", "", "rust", "RUST ", "  ", "Reactjs", "React"]) == ["Rust", "React"]
+
+
+@pytest.mark.parametrize("a, b, bound, expected", [
+    ("python", "python", 1, 0),
+    ("pyhton", "python", 1, 1),
+    ("kubernets", "kubernetes", 1, 1),
+    ("scale", "scala", 1, 1),
+    ("flask", "flash", 0, None),
+    ("java", "javascript", 2, None),
+])
+def test_bounded_edit_distance(a, b, bound, expected):
+    assert bounded_edit_distance(a, b, bound) == expected
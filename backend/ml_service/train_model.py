@@ -6,22 +6,40 @@ It uses TF-IDF vectorization and cosine similarity for skill matching, combined
 a content-based recommendation system.
 """
 
+import argparse
+import hashlib
 import json
 import pickle
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import os
 
-class CareerPathPredictor:
+from inference import (
+    CareerPathInference, CareerTable, compact_matrix,
+    DEFAULT_PRECISION, INFERENCE_ARRAYS, INFERENCE_METADATA, PRECISIONS, SCORING_MODES, TEST_CASES
+)
+from utils.timing import stage
+
+
+class CareerPathPredictor(CareerPathInference):
     def __init__(self):
+        # scikit-learn is only needed for training, so it is imported here
+        # rather than at module level; serving uses CareerPathInference.
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
+        super().__init__()
         self.vectorizer = TfidfVectorizer(
             lowercase=True,
             ngram_range=(1, 2),  # Use unigrams and bigrams
             max_features=500
         )
-        self.skill_vectors = None
-        self.career_data = []
+        
+        # Set to False to score through TfidfVectorizer.transform instead
+        self.use_skill_index = True
+        
+        # Fitted by fit_lsa for exporting an LSA-scored model; the training
+        # predictor itself always scores with sparse TF-IDF
+        self.lsa_components = None
+        self.lsa_embeddings = None
         
     def load_training_data(self, data_path):
         """Load training data from JSON file"""
@@ -56,6 +74,7 @@ class CareerPathPredictor:
                 'title': career_title,
                 'description': career_info['description'],
                 'skills_text': ', '.join(career_info['related_skills']).lower(),
+                'skills': sorted(career_info['related_skills']),
                 'popularity': career_info['occurrences']
             })
         
@@ -74,51 +93,104 @@ class CareerPathPredictor:
         print("Model training completed!")
         print(f"Vocabulary size: {len(self.vectorizer.vocabulary_)}")
         
-    def predict_career_paths(self, user_skills, top_n=5):
+        self.build_skill_index()
+        
+    def fit_lsa(self, n_components=128):
         """
-        Predict top N career paths for given user skills
+        Fit a truncated SVD over the normalized career TF-IDF matrix
+        
+        Stores the vocabulary x k projection and the L2-normalized float32
+        career embeddings used when the model is exported with LSA scoring.
         
         Args:
-            user_skills (list): List of user skills
-            top_n (int): Number of career paths to return
-            
-        Returns:
-            list: Top N career paths with match scores
+            n_components (int): Embedding dimension (capped by the matrix rank)
         """
-        # Convert user skills to text
-        user_skills_text = ', '.join(user_skills).lower()
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.preprocessing import normalize
         
-        # Transform user skills using the trained vectorizer
-        user_vector = self.vectorizer.transform([user_skills_text])
+        careers = self._career_matrix_t.T.tocsr()
+        n_components = max(1, min(n_components, careers.shape[0] - 1, careers.shape[1] - 1))
         
-        # Calculate cosine similarity between user skills and all careers
-        similarities = cosine_similarity(user_vector, self.skill_vectors)[0]
+        print(f"\nFitting LSA embeddings ({n_components} dimensions)...")
+        svd = TruncatedSVD(n_components=n_components, random_state=42)
+        embeddings = svd.fit_transform(careers)
         
-        # Get top N indices
-        top_indices = np.argsort(similarities)[::-1][:top_n]
+        self.lsa_components = svd.components_.astype(np.float32)
+        self.lsa_embeddings = normalize(embeddings).astype(np.float32)
+        
+        print(f"Explained variance: {svd.explained_variance_ratio_.sum():.1%}")
+    
+    def build_skill_index(self):
+        """Expose the fitted vectorizer to the skill index and build it"""
+        from sklearn.preprocessing import normalize
         
-        # Build results
-        results = []
-        for idx, career_idx in enumerate(top_indices):
-            match_score = similarities[career_idx]
-            career = self.career_data[career_idx]
+        self.vocabulary = self.vectorizer.vocabulary_
+        self._tokenize = self.vectorizer.build_tokenizer()
+        self._idf = self.vectorizer.idf_
+        self._career_matrix_t = normalize(self.skill_vectors).T.tocsr()
+        
+        super().build_skill_index()
+    
+    def vectorize_skill_batch(self, skill_lists):
+        """
+        Build L2-normalized TF-IDF query vectors for several skill lists
+        
+        Uses the skill index unless use_skill_index is turned off, in which
+        case the fitted TfidfVectorizer tokenizes the joined skill strings.
+        """
+        if not self.use_skill_index or self._career_matrix_t is None:
+            from sklearn.preprocessing import normalize
             
-            results.append({
-                'id': idx + 1,
-                'title': career['title'],
-                'description': career['description'],
-                'match_score': float(match_score),
-                'confidence': 'high' if match_score > 0.5 else 'medium' if match_score > 0.3 else 'low'
-            })
+            texts = [', '.join(user_skills).lower() for user_skills in skill_lists]
+            return normalize(self.vectorizer.transform(texts))
+        
+        return super().vectorize_skill_batch(skill_lists)
+    
+    def score_career_batch(self, skill_lists):
+        """
+        Cosine similarity between several skill lists and every career
+        
+        Uses the skill index unless use_skill_index is turned off, in which
+        case scores come from TfidfVectorizer.transform and cosine_similarity.
+        """
+        if not self.use_skill_index or self._career_matrix_t is None:
+            from sklearn.metrics.pairwise import cosine_similarity
+            
+            texts = [', '.join(user_skills).lower() for user_skills in skill_lists]
+            with stage("vectorize"):
+                user_vectors = self.vectorizer.transform(texts)
+            with stage("similarity"):
+                return cosine_similarity(user_vectors, self.skill_vectors)
         
-        return results
+        return super().score_career_batch(skill_lists)
     
-    def save_model(self, model_dir):
-        """Save trained model and vectorizer"""
+    def _memory_components(self):
+        """Inference components plus the fitted vectorizer and raw TF-IDF matrix"""
+        components = super()._memory_components()
+        components['vectorizer'] = self.vectorizer
+        components['skill_vectors'] = self.skill_vectors
+        return components
+    
+    def save_model(self, model_dir, precision=DEFAULT_PRECISION, scoring='tfidf'):
+        """
+        Save trained model and vectorizer
+        
+        Args:
+            model_dir (str): Output directory
+            precision (str): Career matrix precision of the inference
+                artifact ('float64', 'float32' or 'int8')
+            scoring (str): Scoring mode of the inference artifact ('tfidf'
+                or 'lsa'; 'lsa' requires fit_lsa)
+        """
         print(f"\nSaving model to {model_dir}...")
         
         os.makedirs(model_dir, exist_ok=True)
         
+        # Only used to explain max_features pruning; sklearn recommends
+        # dropping it before pickling
+        if getattr(self.vectorizer, 'stop_words_', None) is not None:
+            self.vectorizer.stop_words_ = None
+        
         # Save vectorizer
         with open(os.path.join(model_dir, 'vectorizer.pkl'), 'wb') as f:
             pickle.dump(self.vectorizer, f)
@@ -131,26 +203,157 @@ class CareerPathPredictor:
         with open(os.path.join(model_dir, 'career_data.pkl'), 'wb') as f:
             pickle.dump(self.career_data, f)
         
+        self.export_inference_model(model_dir, precision, scoring)
+        
         print("Model saved successfully!")
     
+    def export_inference_model(self, model_dir, precision=DEFAULT_PRECISION, scoring='tfidf'):
+        """
+        Write the sklearn-free artifact loaded by CareerPathInference
+        
+        Holds the vocabulary, IDF weights, tokenizer pattern, career metadata
+        as a CareerTable (titles, descriptions and per-career skill ids
+        instead of a skills_text string per career) and what queries are
+        scored against: the normalized career matrix at the given precision
+        with int32 indices, or for LSA scoring the SVD projection and dense
+        career embeddings.
+        """
+        if scoring not in SCORING_MODES:
+            raise ValueError(f"scoring must be one of {', '.join(SCORING_MODES)}")
+        
+        if scoring == 'lsa':
+            if self.lsa_embeddings is None:
+                raise ValueError("LSA scoring requires fit_lsa() before export")
+            scoring_arrays = {
+                'lsa_components_t': np.ascontiguousarray(self.lsa_components.T),
+                'career_embeddings': self.lsa_embeddings
+            }
+        else:
+            scoring_arrays = compact_matrix(self._career_matrix_t, precision)
+        
+        careers = CareerTable.from_records(self.career_data)
+        np.savez(
+            os.path.join(model_dir, INFERENCE_ARRAYS),
+            idf=self._idf,
+            **scoring_arrays,
+            **careers.arrays()
+        )
+        
+        metadata = {
+            'scoring': scoring,
+            'precision': precision if scoring == 'tfidf' else 'float32',
+            'token_pattern': self.vectorizer.token_pattern,
+            'vocabulary': {term: int(column) for term, column in self.vectorizer.vocabulary_.items()},
+            'careers': careers.metadata(),
+            # Career skills are lowercased; keep their original spelling for display
+            'skill_display_names': sorted({
+                skill.strip() for career in self.career_data for skill in career.get('skills', [])
+            })
+        }
+        with open(os.path.join(model_dir, INFERENCE_METADATA), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+    
+    def compaction_report(self, model_dir, skill_sets, top_n=5):
+        """
+        Compare the exported inference artifact with this full-precision model
+        
+        Prints memory per component before (this training model) and after
+        (the artifact loaded by CareerPathInference), and how well the
+        artifact's top N careers agree with the full-precision ones.
+        
+        Args:
+            model_dir (str): Directory holding the exported artifact
+            skill_sets (list): Skill lists to compare rankings on
+            top_n (int): Number of careers compared per skill list
+            
+        Returns:
+            dict: Memory before/after and top-N agreement figures
+        """
+        compact = CareerPathInference()
+        compact.load_model(model_dir)
+        
+        before = self.memory_usage()
+        after = compact.memory_usage()
+        
+        full_scores = self.score_career_batch(skill_sets)
+        compact_scores = compact.score_career_batch(skill_sets)
+        overlap = 0.0
+        same_order = 0
+        for full_row, compact_row in zip(full_scores, compact_scores):
+            full_top = [pred['title'] for pred in self.rank_careers(full_row, top_n)]
+            compact_top = [pred['title'] for pred in compact.rank_careers(compact_row, top_n)]
+            overlap += len(set(full_top) & set(compact_top)) / max(len(full_top), 1)
+            same_order += full_top == compact_top
+        
+        report = {
+            'memory_before': before,
+            'memory_after': after,
+            'top_n': top_n,
+            'queries': len(skill_sets),
+            'top_n_overlap': overlap / len(skill_sets),
+            'top_n_same_order': same_order / len(skill_sets),
+            'max_score_error': float(np.max(np.abs(full_scores - compact_scores)))
+        }
+        
+        print(f"\n{'Component':<16}{'Before (KB)':>14}{'After (KB)':>14}")
+        for name in list(before) + [name for name in after if name not in before]:
+            if name == 'total':
+                continue
+            before_kb = f"{before[name] / 1024:.1f}" if name in before else "-"
+            after_kb = f"{after[name] / 1024:.1f}" if name in after else "-"
+            print(f"{name:<16}{before_kb:>14}{after_kb:>14}")
+        print(f"{'total':<16}{before['total'] / 1024:>14.1f}{after['total'] / 1024:>14.1f}")
+        print(f"\nTop-{top_n} agreement over {len(skill_sets)} queries: "
+              f"{report['top_n_overlap']:.1%} overlap, {report['top_n_same_order']:.1%} identical order, "
+              f"max score difference {report['max_score_error']:.2e}")
+        
+        return report
+    
     def load_model(self, model_dir):
         """Load trained model"""
         print(f"Loading model from {model_dir}...")
         
-        with open(os.path.join(model_dir, 'vectorizer.pkl'), 'rb') as f:
-            self.vectorizer = pickle.load(f)
+        digest = hashlib.sha256()
+        
+        def load(filename):
+            with open(os.path.join(model_dir, filename), 'rb') as f:
+                data = f.read()
+            digest.update(data)
+            return pickle.loads(data)
         
-        with open(os.path.join(model_dir, 'skill_vectors.pkl'), 'rb') as f:
-            self.skill_vectors = pickle.load(f)
+        self.vectorizer = load('vectorizer.pkl')
+        self.skill_vectors = load('skill_vectors.pkl')
+        self.career_data = load('career_data.pkl')
+        self.model_version = digest.hexdigest()[:16]
         
-        with open(os.path.join(model_dir, 'career_data.pkl'), 'rb') as f:
-            self.career_data = pickle.load(f)
+        self.build_skill_index()
         
         print("Model loaded successfully!")
 
 
 def main():
     """Main training function"""
+    parser = argparse.ArgumentParser(description="Train the career path prediction model")
+    parser.add_argument(
+        "--precision",
+        choices=PRECISIONS,
+        default=DEFAULT_PRECISION,
+        help="career matrix precision of the exported inference model"
+    )
+    parser.add_argument(
+        "--scoring",
+        choices=SCORING_MODES,
+        default="tfidf",
+        help="scoring mode of the exported inference model"
+    )
+    parser.add_argument(
+        "--lsa-dims",
+        type=int,
+        default=128,
+        help="embedding dimension for --scoring lsa"
+    )
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Career Path Prediction Model - Training Script")
     print("=" * 60)
@@ -167,20 +370,15 @@ def main():
     # Load and train
     predictor.load_training_data(data_path)
     predictor.train()
+    if args.scoring == 'lsa':
+        predictor.fit_lsa(args.lsa_dims)
     
     # Test the model
     print("\n" + "=" * 60)
     print("Testing Model")
     print("=" * 60)
     
-    test_cases = [
-        ["JavaScript", "React", "Node.js", "HTML", "CSS"],
-        ["Python", "Machine Learning", "TensorFlow", "Data Analysis"],
-        ["Java", "Spring Boot", "Microservices", "Docker"],
-        ["AWS", "Kubernetes", "DevOps", "CI/CD"]
-    ]
-    
-    for test_skills in test_cases:
+    for test_skills in TEST_CASES:
         print(f"\nTest Skills: {', '.join(test_skills)}")
         predictions = predictor.predict_career_paths(test_skills, top_n=3)
         
@@ -188,7 +386,11 @@ def main():
             print(f"  {pred['id']}. {pred['title']} (Match: {pred['match_score']:.2f}, Confidence: {pred['confidence']})")
     
     # Save the model
-    predictor.save_model(model_dir)
+    predictor.save_model(model_dir, precision=args.precision, scoring=args.scoring)
+    
+    # Memory saved and ranking agreement of the exported artifact
+    skill_sets = TEST_CASES + [example['skills'] for example in predictor.training_data]
+    predictor.compaction_report(model_dir, skill_sets)
     
     print("\n" + "=" * 60)
     print("Training completed successfully!")
@@ -3,6 +3,7 @@ Utils Package
 """
 
 from .helpers import (
+    load_skill_aliases,
     normalize_skills,
     calculate_skill_coverage,
     get_missing_skills,
@@ -10,6 +11,7 @@ from .helpers import (
 )
 
 __all__ = [
+    'load_skill_aliases',
     'normalize_skills',
     'calculate_skill_coverage',
     'get_missing_skills',
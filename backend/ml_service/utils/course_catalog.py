@@ -0,0 +1,136 @@
+"""
+Course Catalog Retrieval
+
+Vector index over a large external course catalog (Coursera/Udemy-style
+exports) used to find the courses that best cover a user's skill gap. The
+index is built with the shared numpy TF-IDF analyzer when the catalog is
+loaded, so serving never imports scikit-learn.
+"""
+
+import csv
+import json
+import os
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from .tfidf import TfidfAnalyzer
+
+
+CATALOG_FIELDS = ("platform", "name", "link", "description")
+
+# Keeps one-letter and symbol skills ("C", "R", "C++", "C#", "Node.js"), and
+# no stop words are removed ("IT", "Go" stay searchable)
+CATALOG_TOKEN_PATTERN = r"(?u)\w[\w+#]*(?:\.\w[\w+#]*)*"
+
+
+class CourseCatalog:
+    """TF-IDF index over course names and descriptions with top-k retrieval"""
+    
+    def __init__(self, courses: List[Dict[str, str]], max_features: int = 100000):
+        self.courses = courses
+        
+        # Course names are repeated so title matches outweigh description mentions
+        texts = [
+            f"{course['name']} {course['name']} {course.get('description', '')} {course.get('skills', '')}"
+            for course in courses
+        ]
+        self.analyzer = TfidfAnalyzer.fit(
+            texts,
+            CATALOG_TOKEN_PATTERN,
+            sublinear_tf=True,
+            max_features=max_features
+        )
+        course_vectors = self.analyzer.transform(texts)
+        
+        # Term-major layout: scoring a query only touches the postings of its terms
+        self._index = course_vectors.T.tocsr()
+    
+    def __len__(self) -> int:
+        return len(self.courses)
+    
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "CourseCatalog":
+        """
+        Load a catalog from a JSON array, JSON Lines or CSV file
+        
+        Each entry needs platform, name, link and description; an optional
+        skills field is indexed too. Entries without a name are skipped.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        with open(path, "r", encoding="utf-8") as f:
+            if extension == ".csv":
+                rows = list(csv.DictReader(f))
+            elif extension in (".jsonl", ".ndjson"):
+                rows = [json.loads(line) for line in f if line.strip()]
+            else:
+                rows = json.load(f)
+        
+        courses = []
+        for row in rows:
+            if not row.get("name"):
+                continue
+            course = {field: str(row.get(field) or "") for field in CATALOG_FIELDS}
+            skills = row.get("skills")
+            if skills:
+                course["skills"] = ", ".join(skills) if isinstance(skills, list) else str(skills)
+            courses.append(course)
+        
+        return cls(courses, **kwargs)
+    
+    def search_batch(self, skill_lists: List[List[str]], top_k: int = 3) -> List[List[Dict[str, str]]]:
+        """
+        Find the top_k courses covering each list of skills
+        
+        All queries are vectorized together and scored with one sparse matrix
+        product; only the top_k scores per query are sorted.
+        
+        Args:
+            skill_lists: One list of (missing) skills per query
+            top_k: Number of courses to return per query
+            
+        Returns:
+            One list of courses per query, best match first
+        """
+        if not skill_lists:
+            return []
+        
+        # The analyzer L2-normalizes its output rows already
+        query_vectors = self.analyzer.transform([", ".join(skills) for skills in skill_lists])
+        scores = (query_vectors @ self._index).tocsr()
+        
+        results = []
+        for i in range(len(skill_lists)):
+            if top_k <= 0:
+                results.append([])
+                continue
+            
+            # Only courses sharing a term with the query have a non-zero score
+            start, end = scores.indptr[i], scores.indptr[i + 1]
+            row_scores = scores.data[start:end]
+            row_courses = scores.indices[start:end]
+            
+            if len(row_scores) > top_k:
+                top = np.argpartition(row_scores, -top_k)[-top_k:]
+            else:
+                top = np.arange(len(row_scores))
+            top = top[np.argsort(-row_scores[top], kind="stable")]
+            
+            results.append([
+                {field: self.courses[row_courses[j]][field] for field in CATALOG_FIELDS}
+                for j in top
+                if row_scores[j] > 0
+            ])
+        
+        return results
+    
+    def search(self, skills: List[str], top_k: int = 3) -> List[Dict[str, str]]:
+        """Find the top_k courses covering a single list of skills"""
+        return self.search_batch([skills], top_k)[0]
+
+
+def load_catalog(path: Optional[str]) -> Optional[CourseCatalog]:
+    """Load the course catalog at path, or return None if there is no file there"""
+    if not path or not os.path.exists(path):
+        return None
+    return CourseCatalog.load(path)
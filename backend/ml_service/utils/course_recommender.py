@@ -5,12 +5,75 @@ Recommends relevant courses from Coursera and Udemy based on career paths and sk
 """
 
 import re
-from typing import List, Dict, Any
+from collections import deque
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+
+from .course_catalog import CourseCatalog
+from .helpers import get_missing_skills
+from .timing import stage
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over groups of keywords
+    
+    Reports which groups have at least one keyword occurring as a substring of
+    the text, in a single pass over the text regardless of how many keywords
+    there are.
+    """
+    
+    def __init__(self, keyword_groups: Iterable[Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Set[int]] = [set()]
+        
+        for group_id, keywords in enumerate(keyword_groups):
+            for keyword in keywords:
+                state = 0
+                for char in keyword:
+                    next_state = self._goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto[state][char] = next_state
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._output.append(set())
+                    state = next_state
+                self._output[state].add(group_id)
+        
+        # Breadth-first pass to fill in failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] |= self._output[self._fail[next_state]]
+    
+    def match(self, text: str) -> Set[int]:
+        """Return the ids of all keyword groups found in text"""
+        matched = set()
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state]:
+                matched |= self._output[state]
+        return matched
 
 
 class CourseRecommender:
     """Recommends courses from Coursera and Udemy"""
     
+    # Optional indexed course catalog (see set_catalog)
+    CATALOG: Optional[CourseCatalog] = None
+    
     # Comprehensive course database with real Coursera and Udemy courses
     COURSE_DATABASE = {
         # Frontend Development
@@ -371,130 +434,148 @@ class CourseRecommender:
         skill_lower = skill.lower().strip()
         return cls.SKILL_CATEGORY_MAP.get(skill_lower, None)
     
+    # Career title keywords and the course categories they map to, in priority order
+    CAREER_CATEGORY_RULES = [
+        (["frontend", "front-end", "front end", "ui"], ["frontend"]),
+        (["backend", "back-end", "back end", "api"], ["backend"]),
+        (["full stack", "fullstack", "full-stack"], ["fullstack", "frontend", "backend"]),
+        (["mobile", "android", "ios", "react native"], ["mobile"]),
+        (["data scientist", "machine learning", "ml engineer", "ai"], ["datascience", "ai"]),
+        (["devops", "cloud", "sre", "site reliability"], ["devops"]),
+        (["data engineer", "big data"], ["dataengineering"]),
+        (["security", "cybersecurity"], ["cybersecurity"]),
+        (["qa", "test", "quality assurance"], ["qa"]),
+        (["ux", "ui", "designer"], ["uiux"]),
+        (["product manager", "product owner"], ["productmanagement"]),
+        (["blockchain", "web3"], ["blockchain"]),
+    ]
+    
+    # All title keywords compiled once into a single automaton
+    CAREER_KEYWORD_MATCHER = KeywordMatcher(keywords for keywords, _ in CAREER_CATEGORY_RULES)
+    
     @classmethod
-    def get_category_from_career(cls, career_title: str) -> List[str]:
-        """Map a career path to relevant course categories"""
-        title_lower = career_title.lower()
-        categories = []
+    @lru_cache(maxsize=4096)
+    def _categories_for_title(cls, title_lower: str) -> Tuple[str, ...]:
+        """Ordered, de-duplicated categories for a lowercased career title"""
+        matched = cls.CAREER_KEYWORD_MATCHER.match(title_lower)
         
-        # Check for keywords in career title
-        if any(word in title_lower for word in ["frontend", "front-end", "front end", "ui"]):
-            categories.append("frontend")
-        if any(word in title_lower for word in ["backend", "back-end", "back end", "api"]):
-            categories.append("backend")
-        if any(word in title_lower for word in ["full stack", "fullstack", "full-stack"]):
-            categories.extend(["fullstack", "frontend", "backend"])
-        if any(word in title_lower for word in ["mobile", "android", "ios", "react native"]):
-            categories.append("mobile")
-        if any(word in title_lower for word in ["data scientist", "machine learning", "ml engineer", "ai"]):
-            categories.extend(["datascience", "ai"])
-        if any(word in title_lower for word in ["devops", "cloud", "sre", "site reliability"]):
-            categories.append("devops")
-        if any(word in title_lower for word in ["data engineer", "big data"]):
-            categories.append("dataengineering")
-        if any(word in title_lower for word in ["security", "cybersecurity"]):
-            categories.append("cybersecurity")
-        if any(word in title_lower for word in ["qa", "test", "quality assurance"]):
-            categories.append("qa")
-        if any(word in title_lower for word in ["ux", "ui", "designer"]):
-            categories.append("uiux")
-        if any(word in title_lower for word in ["product manager", "product owner"]):
-            categories.append("productmanagement")
-        if any(word in title_lower for word in ["blockchain", "web3"]):
-            categories.append("blockchain")
+        categories = []
+        for rule_id, (_, rule_categories) in enumerate(cls.CAREER_CATEGORY_RULES):
+            if rule_id in matched:
+                categories.extend(rule_categories)
         
         # If no specific category found, default to fullstack for developers
         if not categories and "developer" in title_lower:
             categories.append("fullstack")
         
-        # Remove duplicates
-        return list(set(categories))
+        # Remove duplicates, keeping first occurrence so the order is stable
+        return tuple(dict.fromkeys(categories))
+    
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _courses_for_categories(cls, categories: Tuple[str, ...], num_courses: int) -> Tuple[Dict[str, str], ...]:
+        """De-duplicated courses for an ordered combination of categories"""
+        seen = set()
+        unique_courses = []
+        for category in categories:
+            for course in cls.COURSE_DATABASE.get(category, []):
+                course_key = (course["platform"], course["name"])
+                if course_key not in seen:
+                    seen.add(course_key)
+                    unique_courses.append(course)
+                    if len(unique_courses) >= num_courses:
+                        return tuple(unique_courses)
+        
+        return tuple(unique_courses)
+    
+    @classmethod
+    def get_category_from_career(cls, career_title: str) -> List[str]:
+        """Map a career path to relevant course categories"""
+        return list(cls._categories_for_title(career_title.lower()))
     
     @classmethod
     def recommend_courses_for_career(cls, career_title: str, num_courses: int = 3) -> List[Dict[str, str]]:
         """Recommend courses for a specific career path"""
-        categories = cls.get_category_from_career(career_title)
+        categories = cls._categories_for_title(career_title.lower())
         
         if not categories:
             # Default recommendations for general software development
-            categories = ["fullstack"]
-        
-        courses = []
-        for category in categories:
-            if category in cls.COURSE_DATABASE:
-                courses.extend(cls.COURSE_DATABASE[category])
+            categories = ("fullstack",)
         
-        # Remove duplicates and limit to num_courses
-        seen = set()
-        unique_courses = []
-        for course in courses:
-            course_key = (course["platform"], course["name"])
-            if course_key not in seen:
-                seen.add(course_key)
-                unique_courses.append(course)
-                if len(unique_courses) >= num_courses:
-                    break
-        
-        return unique_courses[:num_courses]
+        return list(cls._courses_for_categories(categories, num_courses))
     
     @classmethod
     def recommend_courses_for_skills(cls, skills: List[str], num_courses: int = 3) -> List[Dict[str, str]]:
         """Recommend courses based on user skills"""
-        categories = set()
+        categories = []
         
         for skill in skills:
             category = cls.get_category_from_skill(skill)
             if category:
-                categories.add(category)
+                categories.append(category)
         
         if not categories:
             # Default to fullstack if no categories found
-            categories.add("fullstack")
-        
-        courses = []
-        for category in categories:
-            if category in cls.COURSE_DATABASE:
-                courses.extend(cls.COURSE_DATABASE[category])
+            categories.append("fullstack")
         
-        # Remove duplicates and limit to num_courses
-        seen = set()
-        unique_courses = []
-        for course in courses:
-            course_key = (course["platform"], course["name"])
-            if course_key not in seen:
-                seen.add(course_key)
-                unique_courses.append(course)
-                if len(unique_courses) >= num_courses:
-                    break
-        
-        return unique_courses[:num_courses]
+        return list(cls._courses_for_categories(tuple(dict.fromkeys(categories)), num_courses))
+    
+    @classmethod
+    def set_catalog(cls, catalog: Optional[CourseCatalog]):
+        """Use an indexed external course catalog for skill-gap recommendations"""
+        cls.CATALOG = catalog
     
     @classmethod
     def recommend_training(
         cls, 
         career_paths: List[Dict[str, Any]], 
-        user_skills: List[str]
+        user_skills: List[str],
+        required_skills: Optional[Dict[str, List[str]]] = None
     ) -> List[Dict[str, Any]]:
         """
         Recommend training based on predicted career paths
         
+        When a course catalog is loaded and the required skills of a career
+        are known, its courses are retrieved from the catalog for the skills
+        the user is missing. Otherwise courses come from COURSE_DATABASE.
+        
         Args:
             career_paths: List of predicted career paths
             user_skills: List of user skills
+            required_skills: Optional mapping of career title to its required skills
             
         Returns:
             List of training recommendations with courses
         """
+        catalog_courses = {}
+        if cls.CATALOG is not None and required_skills:
+            gaps = {}
+            for career in career_paths:
+                required = required_skills.get(career['title'])
+                if required:
+                    # Fall back to all required skills if the user already has them
+                    gaps[career['title']] = get_missing_skills(user_skills, required) or required
+            
+            titles = list(gaps)
+            with stage("catalog_search"):
+                results = cls.CATALOG.search_batch([gaps[t] for t in titles], top_k=3)
+            for title, courses in zip(titles, results):
+                if courses:
+                    catalog_courses[title] = courses
+        
         recommendations = []
         
-        for i, career in enumerate(career_paths):
-            # Get courses for this career path
-            courses = cls.recommend_courses_for_career(career['title'], num_courses=3)
-            
-            recommendations.append({
-                "id": i + 1,
-                "title": career['title'],
-                "courses": courses
-            })
+        with stage("course_lookup"):
+            for i, career in enumerate(career_paths):
+                # Get courses for this career path
+                courses = catalog_courses.get(career['title'])
+                if courses is None:
+                    courses = cls.recommend_courses_for_career(career['title'], num_courses=3)
+                
+                recommendations.append({
+                    "id": i + 1,
+                    "title": career['title'],
+                    "courses": courses
+                })
         
         return recommendations
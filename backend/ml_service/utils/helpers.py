@@ -2,6 +2,33 @@
 Utility functions for ML service
 """
 
+import json
+import os
+from functools import lru_cache
+
+
+SKILL_ALIASES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'skill_aliases.json'
+)
+
+
+@lru_cache(maxsize=None)
+def load_skill_aliases(path=SKILL_ALIASES_PATH):
+    """
+    Load the lowercase alias -> canonical skill name mappings
+    
+    The file is read once per path and shared by every caller afterwards.
+    
+    Args:
+        path (str): JSON file with an object of alias/canonical pairs
+        
+    Returns:
+        dict: Alias to canonical skill name
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 def normalize_skills(skills):
     """
     Normalize skill names for better matching
@@ -15,46 +42,7 @@ def normalize_skills(skills):
     normalized = []
     
     # Skill name mappings for common variations
-    skill_mappings = {
-        'javascript': 'JavaScript',
-        'js': 'JavaScript',
-        'reactjs': 'React',
-        'react.js': 'React',
-        'nodejs': 'Node.js',
-        'node': 'Node.js',
-        'typescript': 'TypeScript',
-        'ts': 'TypeScript',
-        'python3': 'Python',
-        'py': 'Python',
-        'java': 'Java',
-        'csharp': 'C#',
-        'c-sharp': 'C#',
-        'cplusplus': 'C++',
-        'c++': 'C++',
-        'golang': 'Go',
-        'aws': 'AWS',
-        'amazon web services': 'AWS',
-        'azure': 'Azure',
-        'gcp': 'Google Cloud',
-        'google cloud platform': 'Google Cloud',
-        'ml': 'Machine Learning',
-        'ai': 'Artificial Intelligence',
-        'css3': 'CSS',
-        'html5': 'HTML',
-        'sql': 'SQL',
-        'nosql': 'NoSQL',
-        'mongodb': 'MongoDB',
-        'postgresql': 'PostgreSQL',
-        'mysql': 'MySQL',
-        'docker': 'Docker',
-        'kubernetes': 'Kubernetes',
-        'k8s': 'Kubernetes',
-        'ci/cd': 'CI/CD',
-        'devops': 'DevOps',
-        'git': 'Git',
-        'github': 'GitHub',
-        'gitlab': 'GitLab',
-    }
+    skill_mappings = load_skill_aliases()
     
     for skill in skills:
         skill_lower = skill.lower().strip()
@@ -0,0 +1,103 @@
+"""
+Job Relevance Ranking
+
+Scores scraped jobs against a user's skills with the career model's own
+TF-IDF analyzer (utils/tfidf.py), loaded from the artifact train_model.py
+exports exactly as career inference loads it. Each job's title +
+description is vectorized once and cached by job_url, and a whole page of
+jobs is scored with one sparse matrix product.
+"""
+
+import os
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .tfidf import TfidfAnalyzer, rows_to_csr
+
+
+DEFAULT_MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+
+# Job vectors kept in the job_url cache
+JOB_VECTOR_CACHE_SIZE = int(os.getenv("JOB_VECTOR_CACHE_SIZE", "5000"))
+
+
+class JobRanker:
+    """Cosine similarity between job postings and a user's skills"""
+    
+    def __init__(self, analyzer: TfidfAnalyzer, cache_size: int = JOB_VECTOR_CACHE_SIZE):
+        """
+        Args:
+            analyzer: The career model's TF-IDF analyzer
+            cache_size: Job vectors kept in the job_url cache
+        """
+        self.analyzer = analyzer
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    @classmethod
+    def from_model_dir(cls, model_dir: str = DEFAULT_MODEL_DIR) -> Optional["JobRanker"]:
+        """Load the vectorizer from an exported model, or None if there is none"""
+        analyzer = TfidfAnalyzer.from_model_dir(model_dir)
+        return cls(analyzer) if analyzer is not None else None
+    
+    def vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted column indices and L2-normalized TF-IDF weights of one text"""
+        return self.analyzer.vectorize(text)
+    
+    def _job_vector(self, job: dict) -> Tuple[np.ndarray, np.ndarray]:
+        """Vector of a job's title and description, cached by job_url"""
+        url = job.get("job_url")
+        cacheable = bool(url) and url != "#"
+        if cacheable:
+            vector = self._cache.get(url)
+            if vector is not None:
+                self._cache.move_to_end(url)
+                self.cache_hits += 1
+                return vector
+        
+        self.cache_misses += 1
+        vector = self.vectorize(f"{job.get('title') or ''}\n{job.get('description') or ''}")
+        if cacheable:
+            self._cache[url] = vector
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return vector
+    
+    def score(self, jobs: List[dict], user_skills: List[str]) -> np.ndarray:
+        """
+        Cosine similarity of every job to the user's skills
+        
+        The skills are joined the way training data is (", "), so they are
+        vectorized exactly like a career's skill list.
+        """
+        query_indices, query_data = self.vectorize(", ".join(user_skills))
+        if not jobs or not len(query_indices):
+            return np.zeros(len(jobs))
+        
+        rows = [self._job_vector(job) for job in jobs]
+        job_matrix = rows_to_csr(rows, len(self.analyzer.idf))
+        query = np.zeros(len(self.analyzer.idf))
+        query[query_indices] = query_data
+        return job_matrix @ query
+    
+    def rank(self, jobs: List[dict], user_skills: List[str]) -> List[dict]:
+        """
+        Jobs sorted by relevance to the user's skills, each with a match_score
+        
+        Ties keep their original order.
+        """
+        scores = self.score(jobs, user_skills)
+        order = np.argsort(-scores, kind="stable")
+        return [{**jobs[i], "match_score": float(scores[i])} for i in order]
+    
+    def cache_info(self) -> dict:
+        return {
+            "size": len(self._cache),
+            "max_size": self.cache_size,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses
+        }
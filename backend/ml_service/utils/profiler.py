@@ -0,0 +1,295 @@
+"""
+On-Demand Profiling
+
+Stdlib-only tools for diagnosing a live worker without restarting it:
+
+- StackSampler polls sys._current_frames() from a background thread and
+  aggregates what every thread is running into collapsed stacks
+  ("thread;outer;inner count"), ready for flamegraph.pl or speedscope.
+- allocation_snapshot() reports the top allocation sites from tracemalloc.
+- estimate_size() approximates how much memory an object graph (numpy
+  arrays, scipy sparse matrices, dicts, lists, strings) holds.
+
+admin_router() exposes these as token-protected endpoints so both FastAPI
+apps can mount the same /admin routes. The token comes from ADMIN_TOKEN;
+without it the routes answer 403.
+"""
+
+import asyncio
+import hmac
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Bounds for a requested profiling run
+MAX_PROFILE_SECONDS = 60.0
+MIN_INTERVAL_MS = 1.0
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples the stacks of every thread at a fixed interval"""
+    
+    def __init__(self, interval: float = 0.005):
+        """
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter = Counter()
+    
+    def _sample(self, own_ident: int):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+    
+    def run(self, duration: float):
+        """Sample for duration seconds on the calling thread"""
+        own_ident = threading.get_ident()
+        deadline = time.perf_counter() + duration
+        next_sample = time.perf_counter()
+        while next_sample < deadline:
+            self._sample(own_ident)
+            next_sample += self.interval
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    
+    def collapsed(self) -> str:
+        """Collapsed stack lines ("frame;frame;frame count"), most frequent first"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+    
+    def top_functions(self, limit: int = 25) -> List[Dict]:
+        """Functions by self (leaf) and total (anywhere on the stack) sample counts"""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]
+            if not frames:
+                continue
+            own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        
+        return [
+            {"function": function, "self": own[function], "total": total[function]}
+            for function, _ in total.most_common(limit)
+        ]
+
+
+def allocation_snapshot(limit: int = 25) -> Dict:
+    """
+    Top allocation sites by size from tracemalloc
+    
+    Only allocations made while tracemalloc is tracing are visible.
+    """
+    if not tracemalloc.is_tracing():
+        return {"tracing": False, "top_allocations": []}
+    
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ])
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "tracing": True,
+        "traced_current_bytes": current,
+        "traced_peak_bytes": peak,
+        "top_allocations": [
+            {
+                "file": stat.traceback[0].filename,
+                "line": stat.traceback[0].lineno,
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in snapshot.statistics("lineno")[:limit]
+        ]
+    }
+
+
+def estimate_size(obj, _seen: Optional[set] = None) -> int:
+    """
+    Approximate bytes held by obj and everything it references
+    
+    Counts numpy buffers and the data/indices/indptr arrays of scipy sparse
+    matrices, and recurses into dicts, lists, tuples, sets and object
+    attributes. Shared objects are counted once.
+    """
+    seen = _seen if _seen is not None else set()
+    if obj is None or id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if hasattr(obj, "tocsr") and hasattr(obj, "nnz"):
+        return sum(
+            estimate_size(getattr(obj, name), seen)
+            for name in ("data", "indices", "indptr", "row", "col")
+            if hasattr(obj, name)
+        )
+    
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(key, seen) + estimate_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += estimate_size(vars(obj), seen)
+    return size
+
+
+def require_admin(token: Optional[str]):
+    """Raise unless token matches ADMIN_TOKEN"""
+    from fastapi import HTTPException
+    
+    if not ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=403,
+            detail="Admin endpoints are disabled. Set ADMIN_TOKEN to enable them."
+        )
+    if not token or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin token"
+        )
+
+
+def admin_router(memory_report: Optional[Callable[[], Dict]] = None):
+    """
+    Admin routes for a FastAPI app
+    
+    GET /admin/profile samples every thread of this worker for `seconds`
+    (the event loop keeps serving meanwhile) and returns collapsed stacks,
+    top functions, tracemalloc's top allocation sites and memory_report().
+    GET /admin/memory returns only the memory part.
+    Both require an X-Admin-Token header matching ADMIN_TOKEN.
+    
+    Args:
+        memory_report: Optional callable returning app-specific memory usage
+            (e.g. model matrices) in bytes
+    """
+    from fastapi import APIRouter, Header, HTTPException
+    from fastapi.responses import PlainTextResponse
+    
+    router = APIRouter(prefix="/admin", tags=["admin"])
+    profile_lock = asyncio.Lock()
+    
+    def memory(top: int) -> Dict:
+        result = allocation_snapshot(top)
+        if memory_report is not None:
+            result["objects"] = memory_report()
+        return result
+    
+    @router.get("/profile")
+    async def profile(
+        seconds: float = 5.0,
+        interval_ms: float = 5.0,
+        format: str = "json",
+        top: int = 25,
+        memory_top: int = 25,
+        trace_allocations: bool = True,
+        x_admin_token: Optional[str] = Header(default=None)
+    ):
+        """
+        Sample this worker's stacks for a number of seconds
+        
+        Args:
+            seconds: Sampling duration (max 60)
+            interval_ms: Time between samples (min 1)
+            format: "json" (stacks, top functions and memory) or "collapsed"
+                (plain-text collapsed stacks for flamegraph.pl / speedscope)
+            top: Number of top functions to list
+            memory_top: Number of allocation sites to list
+            trace_allocations: Start tracemalloc for the run if it is not
+                already tracing, so allocations made during it are reported
+        """
+        require_admin(x_admin_token)
+        
+        if seconds <= 0 or seconds > MAX_PROFILE_SECONDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"seconds must be between 0 and {MAX_PROFILE_SECONDS:g}"
+            )
+        
+        if interval_ms < MIN_INTERVAL_MS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"interval_ms must be at least {MIN_INTERVAL_MS:g}"
+            )
+        
+        if format not in ("json", "collapsed"):
+            raise HTTPException(
+                status_code=400,
+                detail="format must be 'json' or 'collapsed'"
+            )
+        
+        if profile_lock.locked():
+            raise HTTPException(
+                status_code=409,
+                detail="A profile is already running on this worker"
+            )
+        
+        async with profile_lock:
+            started_tracing = trace_allocations and format == "json" and not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            
+            try:
+                sampler = StackSampler(interval=interval_ms / 1000.0)
+                start = time.perf_counter()
+                await asyncio.get_running_loop().run_in_executor(None, sampler.run, seconds)
+                elapsed = time.perf_counter() - start
+                
+                if format == "collapsed":
+                    return PlainTextResponse(sampler.collapsed())
+                
+                return {
+                    "duration_seconds": elapsed,
+                    "interval_ms": interval_ms,
+                    "samples": sampler.samples,
+                    "top_functions": sampler.top_functions(top),
+                    "collapsed": sampler.collapsed(),
+                    "memory": memory(memory_top)
+                }
+            finally:
+                if started_tracing:
+                    tracemalloc.stop()
+    
+    @router.get("/memory")
+    async def memory_usage(
+        top: int = 25,
+        x_admin_token: Optional[str] = Header(default=None)
+    ):
+        """
+        Object memory report and tracemalloc's top allocation sites
+        
+        Allocation sites are only available while tracemalloc is tracing
+        (start the process with PYTHONTRACEMALLOC=1 to trace from startup).
+        """
+        require_admin(x_admin_token)
+        return memory(top)
+    
+    return router
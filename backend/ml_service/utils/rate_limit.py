@@ -0,0 +1,105 @@
+"""
+Per-Client Rate Limiting
+
+RateLimitMiddleware is a pure ASGI token bucket keyed by client address:
+each client may burst up to `burst` requests and is refilled at `rate`
+requests per second. Requests over the limit get 429 with a Retry-After
+header. WebSocket connections and exempt paths (health probes) are never
+limited.
+"""
+
+import json
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+# Client buckets kept before idle (fully refilled) ones are dropped
+MAX_CLIENTS = 10000
+
+
+class TokenBuckets:
+    """Thread-safe token buckets, one per key"""
+    
+    def __init__(self, rate: float, burst: float):
+        """
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity
+        """
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, List[float]] = {}
+    
+    def _prune(self, now: float):
+        """Drop buckets that have refilled completely (they behave like new ones)"""
+        full = [
+            key for key, (tokens, updated) in self._buckets.items()
+            if tokens + (now - updated) * self.rate >= self.burst
+        ]
+        for key in full:
+            del self._buckets[key]
+    
+    def acquire(self, key: str) -> float:
+        """
+        Take one token for key
+        
+        Returns:
+            float: 0 if the request may proceed, otherwise seconds until a token is available
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= MAX_CLIENTS:
+                    self._prune(now)
+                bucket = self._buckets[key] = [self.burst, now]
+            
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return 0.0
+            bucket[0] = tokens
+            return (1 - tokens) / self.rate
+
+
+class RateLimitMiddleware:
+    """ASGI middleware answering 429 once a client exceeds its request rate"""
+    
+    def __init__(self, app, rate: float, burst: Optional[float] = None, exempt_paths: Iterable[str] = ()):
+        """
+        Args:
+            app: ASGI application to wrap
+            rate: Requests per second allowed per client
+            burst: Requests a client may make at once (defaults to 2 x rate)
+            exempt_paths: Paths that are never limited
+        """
+        self.app = app
+        self.buckets = TokenBuckets(rate, burst if burst is not None else max(1.0, 2 * rate))
+        self.exempt_paths = frozenset(exempt_paths)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        
+        client = scope.get("client")
+        retry_after = self.buckets.acquire(client[0] if client else "unknown")
+        if not retry_after:
+            await self.app(scope, receive, send)
+            return
+        
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(retry_after)).encode()),
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
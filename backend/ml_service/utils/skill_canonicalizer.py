@@ -0,0 +1,221 @@
+"""
+Skill Canonicalization
+
+Maps free-form skill input ("Reactjs ", "Kubernets", "Node JS") onto the
+skill names the model and course recommender know about, so typos and
+spelling variants do not silently lower match scores.
+"""
+
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+_COMPACT_PATTERN = re.compile(r"[\s.\-_]+")
+
+
+def _clean(skill: str) -> str:
+    """Lowercase and collapse internal whitespace"""
+    return " ".join(skill.lower().split())
+
+
+def _compact(skill: str) -> str:
+    """Drop spaces, dots, hyphens and underscores ("node.js" / "node js" -> "nodejs")"""
+    return _COMPACT_PATTERN.sub("", skill)
+
+
+def _trigrams(text: str) -> set:
+    """Character trigrams of text padded with word boundaries"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Edit distance between a and b if it is at most max_distance
+    
+    Counts insertions, deletions, substitutions and transpositions of two
+    adjacent characters ("pyhton" -> "python" is 1). Only a diagonal band of
+    width 2 * max_distance + 1 is computed and the scan stops as soon as every
+    cell in a row exceeds the bound.
+    
+    Returns:
+        The distance, or None if it is larger than max_distance
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if a == b:
+        return 0
+    
+    infinity = max_distance + 1
+    before_previous = None
+    previous = [j if j <= max_distance else infinity for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        low = max(1, i - max_distance)
+        high = min(len(b), i + max_distance)
+        current = [infinity] * (len(b) + 1)
+        current[0] = i if i <= max_distance else infinity
+        row_min = current[0]
+        for j in range(low, high + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, before_previous[j - 2] + 1)
+            current[j] = value if value <= max_distance else infinity
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return None
+        before_previous, previous = previous, current
+    
+    distance = previous[len(b)]
+    return distance if distance <= max_distance else None
+
+
+class SkillCanonicalizer:
+    """
+    Canonicalizes skill names against a fixed vocabulary
+    
+    Lookup order:
+        1. Exact alias or vocabulary match (case and whitespace insensitive)
+        2. Match ignoring spaces, dots, hyphens and underscores
+        3. Fuzzy match through a character-trigram index, accepting the
+           candidate with the smallest bounded edit distance only if no
+           other candidate is as close
+    
+    Matches are returned in the canonical skill's display spelling (alias
+    target or display name, e.g. "Rust"); an exact match on a skill known
+    only in lowercase keeps the input's spelling. Unmatched skills are
+    returned stripped but otherwise unchanged. Results are memoized in an
+    LRU cache.
+    """
+    
+    # Skills shorter than this are never fuzzy-matched: one edit turns many
+    # real words into another skill ("scale" -> "scala", "excels" -> "excel")
+    MIN_FUZZY_LENGTH = 7
+    
+    # Number of trigram-ranked candidates checked with edit distance
+    MAX_CANDIDATES = 16
+    
+    def __init__(
+        self,
+        vocabulary: Iterable[str],
+        aliases: Optional[Dict[str, str]] = None,
+        cache_size: int = 8192,
+        display_names: Optional[Iterable[str]] = None
+    ):
+        """
+        Args:
+            vocabulary: Canonical skill names (any case)
+            aliases: Alias to canonical skill name mappings
+            cache_size: Maximum number of memoized inputs
+            display_names: Preferred spellings of vocabulary skills ("Rust" for "rust")
+        """
+        aliases = aliases or {}
+        
+        # Display form for every canonical key; cased spellings win over
+        # lowercase ones, and alias targets win over everything
+        self._display: Dict[str, str] = {}
+        for skill in vocabulary:
+            key = _clean(skill)
+            if key and (key not in self._display or self._display[key].islower()):
+                self._display[key] = skill.strip()
+        for name in display_names or ():
+            key = _clean(name)
+            if key in self._display:
+                self._display[key] = name.strip()
+        for canonical in aliases.values():
+            self._display[_clean(canonical)] = canonical
+        
+        self._exact: Dict[str, str] = {key: key for key in self._display}
+        for alias, canonical in aliases.items():
+            self._exact[_clean(alias)] = _clean(canonical)
+        
+        self._compact: Dict[str, str] = {}
+        for key, canonical in self._exact.items():
+            self._compact.setdefault(_compact(key), canonical)
+        
+        # Trigram postings over canonical keys only, so fuzzy hits land on real skills
+        self._keys: List[str] = sorted(self._display)
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for key_id, key in enumerate(self._keys):
+            for trigram in _trigrams(key):
+                self._postings[trigram].append(key_id)
+        
+        self._lookup = lru_cache(maxsize=cache_size)(self._canonicalize_uncached)
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    @staticmethod
+    def max_distance_for(length: int) -> int:
+        """Edit distance budget for an input of the given length (about one edit per five characters)"""
+        return 1 if length <= 10 else 2
+    
+    def _fuzzy_match(self, key: str) -> Optional[str]:
+        """The one closest canonical key within the edit distance budget, if any"""
+        if len(key) < self.MIN_FUZZY_LENGTH:
+            return None
+        
+        shared: Dict[int, int] = defaultdict(int)
+        for trigram in _trigrams(key):
+            for key_id in self._postings.get(trigram, ()):
+                shared[key_id] += 1
+        if not shared:
+            return None
+        
+        candidates = sorted(shared.items(), key=lambda item: (-item[1], item[0]))[:self.MAX_CANDIDATES]
+        max_distance = self.max_distance_for(len(key))
+        
+        best: Optional[Tuple[int, int]] = None
+        tied = False
+        for key_id, _ in candidates:
+            distance = bounded_edit_distance(key, self._keys[key_id], max_distance)
+            if distance is None:
+                continue
+            if best is None or distance < best[0]:
+                best, tied = (distance, key_id), False
+            elif distance == best[0]:
+                tied = True
+        
+        # Two skills equally close: guessing would swap one real skill for another
+        if best is None or tied:
+            return None
+        return self._keys[best[1]]
+    
+    def _canonicalize_uncached(self, skill: str) -> str:
+        key = _clean(skill)
+        if not key:
+            return ""
+        
+        canonical = self._exact.get(key) or self._compact.get(_compact(key)) or self._fuzzy_match(key)
+        if canonical is None:
+            return skill.strip()
+        
+        display = self._display[canonical]
+        if canonical == key and display == canonical:
+            # No spelling is known for this skill: keep the user's
+            return skill.strip()
+        return display
+    
+    def canonicalize(self, skill: str) -> str:
+        """Canonical name for a single skill"""
+        return self._lookup(skill)
+    
+    def canonicalize_skills(self, skills: Iterable[str]) -> List[str]:
+        """
+        Canonicalize a list of skills
+        
+        Blank entries are dropped and duplicates that map to the same
+        canonical skill are kept only once, in first-seen order.
+        """
+        unique: Dict[str, str] = {}
+        for skill in skills:
+            canonical = self._lookup(skill)
+            if canonical:
+                unique.setdefault(_clean(canonical), canonical)
+        return list(unique.values())
+    
+    def cache_info(self):
+        """LRU cache statistics for the lookup cache"""
+        return self._lookup.cache_info()
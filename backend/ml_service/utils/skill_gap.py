@@ -0,0 +1,135 @@
+"""
+Skill Gap Analysis
+
+Bitset index of every career's required skills over a global skill
+vocabulary, so coverage and missing skills for one user against the whole
+career catalog come from a few vectorized AND/popcount operations.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# Number of set bits in every possible byte
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class SkillGapIndex:
+    """Packed career x skill bit matrix with vectorized coverage queries"""
+    
+    def __init__(self, career_skills: Dict[str, List[str]]):
+        """
+        Args:
+            career_skills: Career title to the skills it requires
+        """
+        self.titles: List[str] = list(career_skills)
+        self.skills: List[str] = sorted({
+            skill.lower().strip()
+            for skills in career_skills.values()
+            for skill in skills
+            if skill.strip()
+        })
+        self.skill_ids: Dict[str, int] = {skill: i for i, skill in enumerate(self.skills)}
+        self.title_ids: Dict[str, int] = {title: i for i, title in enumerate(self.titles)}
+        
+        required = np.zeros((len(self.titles), len(self.skills)), dtype=bool)
+        for row, skills in enumerate(career_skills.values()):
+            for skill in skills:
+                skill_id = self.skill_ids.get(skill.lower().strip())
+                if skill_id is not None:
+                    required[row, skill_id] = True
+        
+        # One bit per skill, eight skills per byte
+        self.bits = np.packbits(required, axis=1)
+        self.required_counts = _POPCOUNT[self.bits].sum(axis=1, dtype=np.int32)
+    
+    def __len__(self) -> int:
+        return len(self.titles)
+    
+    def user_bits(self, user_skills: Sequence[str]) -> np.ndarray:
+        """Packed bit row of the user's skills that are in the vocabulary"""
+        row = np.zeros(len(self.skills), dtype=bool)
+        for skill in user_skills:
+            skill_id = self.skill_ids.get(skill.lower().strip())
+            if skill_id is not None:
+                row[skill_id] = True
+        return np.packbits(row)
+    
+    def coverage(self, user_skills: Sequence[str], career_ids: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Fraction of each career's required skills the user has
+        
+        Args:
+            user_skills: User's skills
+            career_ids: Optional subset of career rows (default: all careers)
+        
+        Returns:
+            np.ndarray: Coverage in [0, 1] per career
+        """
+        bits = self.bits if career_ids is None else self.bits[career_ids]
+        required = self.required_counts if career_ids is None else self.required_counts[career_ids]
+        
+        matched = _POPCOUNT[bits & self.user_bits(user_skills)].sum(axis=1, dtype=np.int32)
+        return np.divide(matched, required, out=np.zeros(len(bits)), where=required > 0)
+    
+    def analyze(
+        self,
+        user_skills: Sequence[str],
+        titles: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Coverage, matched and missing skills per career
+        
+        Args:
+            user_skills: User's skills
+            titles: Careers to analyze, in order (default: every career,
+                highest coverage first). Unknown titles are skipped.
+            limit: Maximum number of careers to return
+        
+        Returns:
+            list: One dict per career with title, coverage, matched_skills
+            and missing_skills
+        """
+        user = self.user_bits(user_skills)
+        
+        if titles is None:
+            # Rank the whole catalog by popcount first, then expand only the winners
+            coverage = self.coverage(user_skills)
+            if limit is not None and limit < len(coverage):
+                top = np.argpartition(-coverage, limit)[:limit] if limit > 0 else np.array([], dtype=np.intp)
+                career_ids = top[np.argsort(-coverage[top], kind="stable")]
+            else:
+                career_ids = np.argsort(-coverage, kind="stable")
+        else:
+            career_ids = np.array(
+                [self.title_ids[title] for title in titles if title in self.title_ids],
+                dtype=np.intp
+            )[:limit]
+        
+        bits = self.bits[career_ids]
+        required = self.required_counts[career_ids]
+        
+        matched_bits = bits & user
+        missing_bits = bits & ~user
+        matched_counts = _POPCOUNT[matched_bits].sum(axis=1, dtype=np.int32)
+        coverage = np.divide(matched_counts, required, out=np.zeros(len(bits)), where=required > 0)
+        
+        # Unpack all selected rows at once and read skill ids off the set bits
+        n_skills = len(self.skills)
+        boundaries = np.arange(1, len(career_ids))
+        matched_rows, matched_cols = np.nonzero(np.unpackbits(matched_bits, axis=1, count=n_skills))
+        missing_rows, missing_cols = np.nonzero(np.unpackbits(missing_bits, axis=1, count=n_skills))
+        matched_split = np.split(matched_cols, np.searchsorted(matched_rows, boundaries))
+        missing_split = np.split(missing_cols, np.searchsorted(missing_rows, boundaries))
+        
+        return [
+            {
+                "title": self.titles[career_ids[i]],
+                "coverage": float(coverage[i]),
+                "matched_skills": [self.skills[j] for j in matched_split[i]],
+                "missing_skills": [self.skills[j] for j in missing_split[i]],
+            }
+            for i in range(len(career_ids))
+        ]
@@ -0,0 +1,151 @@
+"""
+TF-IDF Analysis
+
+Numpy/scipy implementation of the analysis TfidfVectorizer(lowercase=True,
+ngram_range=(1, 2)) performs, shared by everything that vectorizes text at
+serving time (career inference, job ranking, course catalog retrieval) so
+none of them needs scikit-learn and they cannot drift apart.
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+# Inference artifact written by CareerPathPredictor.save_model
+INFERENCE_ARRAYS = 'inference_model.npz'
+INFERENCE_METADATA = 'inference_model.json'
+
+
+class TfidfAnalyzer:
+    """Unigram + bigram tokenization, vocabulary lookup and IDF weighting"""
+    
+    def __init__(self, vocabulary: Dict[str, int], idf: np.ndarray, token_pattern: str,
+                 sublinear_tf: bool = False):
+        """
+        Args:
+            vocabulary: Term (unigram, or two tokens joined by a space) to column index
+            idf: IDF weight of every column
+            token_pattern: Token regex, applied to the lowercased text
+            sublinear_tf: Weight terms by 1 + log(count) instead of count
+        """
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.token_pattern = token_pattern
+        self.sublinear_tf = sublinear_tf
+        self._findall = re.compile(token_pattern).findall
+        self._bigrams = {
+            tuple(term.split(" ")): column
+            for term, column in vocabulary.items()
+            if " " in term
+        }
+    
+    @classmethod
+    def fit(cls, texts: Iterable[str], token_pattern: str, sublinear_tf: bool = False,
+            max_features: Optional[int] = None) -> "TfidfAnalyzer":
+        """
+        Learn a vocabulary and smoothed IDF weights from texts
+        
+        Like TfidfVectorizer: idf = ln((1 + n) / (1 + df)) + 1, columns in
+        term order, and max_features keeps the terms most frequent across
+        all texts.
+        """
+        findall = re.compile(token_pattern).findall
+        term_counts = Counter()
+        document_counts = Counter()
+        n = 0
+        for text in texts:
+            n += 1
+            tokens = findall(text.lower())
+            counts = Counter(tokens)
+            counts.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+            term_counts.update(counts)
+            document_counts.update(counts.keys())
+        
+        terms = list(term_counts)
+        if max_features is not None and len(terms) > max_features:
+            terms = [term for term, _ in sorted(term_counts.items(), key=lambda item: (-item[1], item[0]))[:max_features]]
+        terms.sort()
+        
+        vocabulary = {term: column for column, term in enumerate(terms)}
+        df = np.array([document_counts[term] for term in terms], dtype=np.float64)
+        idf = np.log((1 + n) / (1 + df)) + 1
+        return cls(vocabulary, idf, token_pattern, sublinear_tf)
+    
+    @classmethod
+    def from_artifact(cls, metadata: dict, idf: np.ndarray) -> "TfidfAnalyzer":
+        """The career model's analyzer from its exported metadata and IDF array"""
+        return cls(metadata['vocabulary'], idf, metadata['token_pattern'])
+    
+    @classmethod
+    def from_model_dir(cls, model_dir: str) -> Optional["TfidfAnalyzer"]:
+        """The career model's analyzer from an exported model, or None if there is none"""
+        metadata_path = os.path.join(model_dir, INFERENCE_METADATA)
+        arrays_path = os.path.join(model_dir, INFERENCE_ARRAYS)
+        if not (os.path.exists(metadata_path) and os.path.exists(arrays_path)):
+            return None
+        
+        with open(metadata_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        with np.load(arrays_path, allow_pickle=False) as arrays:
+            idf = arrays['idf']
+        return cls.from_artifact(metadata, idf)
+    
+    def tokenize(self, text: str) -> List[str]:
+        """Tokens of the lowercased text"""
+        return self._findall(text.lower())
+    
+    def term_counts(self, text: str) -> Dict[int, int]:
+        """Column to count of every in-vocabulary unigram and bigram of text"""
+        vocabulary = self.vocabulary
+        tokens = self.tokenize(text)
+        
+        # Long texts run to thousands of tokens: count distinct unigrams and
+        # bigrams in C first, then look each one up once
+        counts: Dict[int, int] = {}
+        for term, count in Counter(tokens).items():
+            column = vocabulary.get(term)
+            if column is not None:
+                counts[column] = count
+        bigrams = self._bigrams
+        for pair, count in Counter(zip(tokens, tokens[1:])).items():
+            column = bigrams.get(pair)
+            if column is not None:
+                counts[column] = count
+        return counts
+    
+    def vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted column indices and L2-normalized TF-IDF weights of one text"""
+        counts = self.term_counts(text)
+        indices = np.array(sorted(counts), dtype=np.int32)
+        data = np.array([counts[column] for column in indices], dtype=np.float64)
+        if self.sublinear_tf and len(data):
+            data = 1 + np.log(data)
+        data *= self.idf[indices]
+        norm = math.sqrt(float(data @ data)) if len(data) else 0.0
+        if norm:
+            data /= norm
+        return indices, data
+    
+    def transform(self, texts: Iterable[str]) -> csr_matrix:
+        """L2-normalized TF-IDF rows of several texts"""
+        return rows_to_csr([self.vectorize(text) for text in texts], len(self.idf))
+
+
+def rows_to_csr(rows: List[Tuple[np.ndarray, np.ndarray]], n_columns: int) -> csr_matrix:
+    """Stack (indices, data) sparse rows into a CSR matrix"""
+    indptr = np.zeros(len(rows) + 1, dtype=np.int32)
+    indptr[1:] = np.cumsum([len(indices) for indices, _ in rows])
+    if rows:
+        indices = np.concatenate([indices for indices, _ in rows])
+        data = np.concatenate([data for _, data in rows])
+    else:
+        indices = np.array([], dtype=np.int32)
+        data = np.array([], dtype=np.float64)
+    return csr_matrix((data, indices, indptr), shape=(len(rows), n_columns))
@@ -0,0 +1,210 @@
+"""
+Request Stage Timing
+
+Code marks the stages of a request with ``with stage("similarity"):``. Inside
+a request handled by ServerTimingMiddleware, stage durations are collected
+for that request and returned in a Server-Timing response header, e.g.
+
+    Server-Timing: canonicalize;dur=0.041, vectorize;dur=0.112, total;dur=1.870
+
+Every stage duration also goes into a process-wide histogram
+(stage_histograms), with or without a request in progress.
+
+Set SERVER_TIMING=0 to disable. stage() then returns a shared no-op context
+manager and the middleware passes requests straight through.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+
+ENABLED = os.getenv("SERVER_TIMING", "1").strip().lower() not in ("0", "false", "no", "off")
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is unbounded)
+BUCKETS_MS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+_NOOP = nullcontext()
+_current: ContextVar[Optional["StageTimer"]] = ContextVar("stage_timer", default=None)
+
+
+class StageHistograms:
+    """Thread-safe per-stage latency histograms"""
+    
+    def __init__(self, buckets_ms: List[float] = BUCKETS_MS):
+        self.buckets_ms = list(buckets_ms)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._max: Dict[str, float] = {}
+    
+    def observe(self, name: str, duration_ms: float):
+        """Record one duration for a stage"""
+        bucket = len(self.buckets_ms)
+        for i, bound in enumerate(self.buckets_ms):
+            if duration_ms <= bound:
+                bucket = i
+                break
+        
+        with self._lock:
+            counts = self._counts.get(name)
+            if counts is None:
+                counts = self._counts[name] = [0] * (len(self.buckets_ms) + 1)
+                self._sums[name] = 0.0
+                self._max[name] = 0.0
+            counts[bucket] += 1
+            self._sums[name] += duration_ms
+            if duration_ms > self._max[name]:
+                self._max[name] = duration_ms
+    
+    def _quantile(self, counts: List[int], total: int, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile"""
+        target = q * total
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= target and count:
+                return self.buckets_ms[i] if i < len(self.buckets_ms) else float("inf")
+        return 0.0
+    
+    def snapshot(self) -> Dict[str, dict]:
+        """Count, mean, max, bucketed p50/p95/p99 and bucket counts per stage"""
+        with self._lock:
+            stages = {name: list(counts) for name, counts in self._counts.items()}
+            sums = dict(self._sums)
+            maxima = dict(self._max)
+        
+        labels = [f"le_{bound:g}" for bound in self.buckets_ms] + ["inf"]
+        result = {}
+        for name, counts in stages.items():
+            total = sum(counts)
+            result[name] = {
+                "count": total,
+                "mean_ms": sums[name] / total if total else 0.0,
+                "max_ms": maxima[name],
+                "p50_ms": self._quantile(counts, total, 0.50),
+                "p95_ms": self._quantile(counts, total, 0.95),
+                "p99_ms": self._quantile(counts, total, 0.99),
+                "buckets": {label: count for label, count in zip(labels, counts) if count}
+            }
+        return result
+    
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+            self._max.clear()
+
+
+stage_histograms = StageHistograms()
+
+
+class StageTimer:
+    """Stage durations (milliseconds) of one request, in first-seen order"""
+    
+    __slots__ = ("stages",)
+    
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+    
+    def add(self, name: str, duration_ms: float):
+        self.stages[name] = self.stages.get(name, 0.0) + duration_ms
+    
+    def header(self) -> str:
+        """Server-Timing header value"""
+        return ", ".join(f"{name};dur={duration:.3f}" for name, duration in self.stages.items())
+
+
+class _Stage:
+    __slots__ = ("name", "timer", "start")
+    
+    def __init__(self, name: str, timer: Optional[StageTimer]):
+        self.name = name
+        self.timer = timer
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        duration_ms = (time.perf_counter() - self.start) * 1000
+        if self.timer is not None:
+            self.timer.add(self.name, duration_ms)
+        stage_histograms.observe(self.name, duration_ms)
+        return False
+
+
+def stage(name: str):
+    """
+    Context manager timing one stage of the current request
+    
+    Repeated stages within a request are summed.
+    """
+    if not ENABLED:
+        return _NOOP
+    return _Stage(name, _current.get())
+
+
+@contextmanager
+def collect():
+    """
+    Collect stage timings into a fresh StageTimer
+    
+    For work handed off to another thread (which does not see the request's
+    timer): time it under collect() there, then pass timer.stages back and
+    merge them into the request with record().
+    """
+    timer = StageTimer() if ENABLED else None
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+def record(stages: Optional[Dict[str, float]]):
+    """Add stage durations measured elsewhere to the current request"""
+    timer = _current.get()
+    if timer is not None and stages:
+        for name, duration_ms in stages.items():
+            timer.add(name, duration_ms)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware that times each HTTP request and adds a Server-Timing header
+    
+    The header lists every stage run while handling the request plus "total",
+    the time until the response headers were sent.
+    """
+    
+    def __init__(self, app):
+        from starlette.datastructures import MutableHeaders
+        
+        self.app = app
+        self._headers = MutableHeaders
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ENABLED:
+            await self.app(scope, receive, send)
+            return
+        
+        timer = StageTimer()
+        token = _current.set(timer)
+        start = time.perf_counter()
+        
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - start) * 1000
+                timer.add("total", total_ms)
+                stage_histograms.observe("total", total_ms)
+                self._headers(scope=message).append("Server-Timing", timer.header())
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
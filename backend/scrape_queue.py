@@ -0,0 +1,261 @@
+"""
+Durable Scrape Task Queue
+
+SQLite-backed queue behind the asynchronous scrape API. The API process
+enqueues tasks and reads their status; scraper worker processes claim
+queued tasks, report per-site progress and store the result. Tasks are
+rows in one table, so queued work survives restarts, and any number of
+processes can share the database (WAL mode; claims run in an IMMEDIATE
+transaction so a task is handed to exactly one worker).
+
+Task status goes queued -> running -> done | failed. A claim is a lease
+that the worker renews while it scrapes (heartbeat); a task whose lease
+ran out, because its worker died or the service restarted, is put back in
+the queue, up to max_attempts. Workers also publish their per-site
+circuit breaker state here, so the API process can report it.
+"""
+
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrape_tasks (
+    id TEXT PRIMARY KEY,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    sites_total INTEGER NOT NULL,
+    sites_done INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    result TEXT,
+    scraped INTEGER NOT NULL DEFAULT 0,
+    delivered INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS scrape_tasks_status ON scrape_tasks (status, created_at);
+CREATE TABLE IF NOT EXISTS scrape_workers (
+    worker TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class ScrapeQueue:
+    """Scrape tasks persisted in a SQLite database"""
+
+    def __init__(self, path: str, max_attempts: int = 3, retention_seconds: float = 24 * 3600,
+                 lease_seconds: float = 120.0):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            max_attempts: Times a task is started before it is failed for good
+            retention_seconds: Age after which finished tasks are deleted
+            lease_seconds: Time a claimed task stays with its worker without a heartbeat
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_seconds
+        self.lease_seconds = lease_seconds
+        db = sqlite3.connect(path, timeout=30)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            # Databases created before leases
+            columns = {row[1] for row in db.execute("PRAGMA table_info(scrape_tasks)")}
+            if "lease_until" not in columns:
+                db.execute("ALTER TABLE scrape_tasks ADD COLUMN lease_until REAL")
+                db.commit()
+        finally:
+            db.close()
+
+    @contextmanager
+    def _connect(self, immediate: bool = False):
+        """A short-lived connection; commits on success, rolls back on error"""
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            db.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            yield db
+            db.execute("COMMIT")
+        except BaseException:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    def enqueue(self, params: dict, sites_total: int) -> str:
+        """Persist a new task and return its id"""
+        task_id = uuid.uuid4().hex
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO scrape_tasks (id, params, status, sites_total, created_at) VALUES (?, ?, ?, ?, ?)",
+                (task_id, json.dumps(params), QUEUED, sites_total, time.time())
+            )
+        return task_id
+
+    def _requeue(self, db: sqlite3.Connection, where: str, params: tuple, now: float) -> int:
+        """Requeue the running tasks matching where, failing those out of attempts"""
+        db.execute(
+            f"UPDATE scrape_tasks SET status = ?, error = ?, finished_at = ?, lease_until = NULL "
+            f"WHERE status = ? AND attempts >= ? AND {where}",
+            (FAILED, "Worker stopped during the scrape too many times", now, RUNNING, self.max_attempts) + params
+        )
+        return db.execute(
+            f"UPDATE scrape_tasks SET status = ?, worker = NULL, lease_until = NULL WHERE status = ? AND {where}",
+            (QUEUED, RUNNING) + params
+        ).rowcount
+
+    def claim(self, worker: str) -> Optional[dict]:
+        """
+        Lease the oldest queued task to this worker and return it
+
+        Running tasks whose lease expired are requeued first.
+        """
+        now = time.time()
+        with self._connect(immediate=True) as db:
+            self._requeue(db, "lease_until < ?", (now,), now)
+            row = db.execute(
+                "SELECT id, params FROM scrape_tasks WHERE status = ? ORDER BY created_at LIMIT 1",
+                (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE scrape_tasks SET status = ?, worker = ?, started_at = ?, sites_done = 0, "
+                "attempts = attempts + 1, lease_until = ? WHERE id = ?",
+                (RUNNING, worker, now, now + self.lease_seconds, row["id"])
+            )
+        return {"id": row["id"], "params": json.loads(row["params"])}
+
+    def heartbeat(self, task_id: str, worker: str) -> bool:
+        """Renew a worker's lease on a running task; False if the task is no longer its own"""
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE scrape_tasks SET lease_until = ? WHERE id = ? AND worker = ? AND status = ?",
+                (time.time() + self.lease_seconds, task_id, worker, RUNNING)
+            )
+        return cursor.rowcount == 1
+
+    def set_progress(self, task_id: str, sites_done: int):
+        with self._connect() as db:
+            db.execute("UPDATE scrape_tasks SET sites_done = ? WHERE id = ?", (sites_done, task_id))
+
+    def complete(self, task_id: str, result: dict, scraped: bool):
+        """Store a finished task's result (scraped is False for mock fallback data)"""
+        with self._connect() as db:
+            db.execute(
+                "UPDATE scrape_tasks SET status = ?, result = ?, scraped = ?, sites_done = sites_total, "
+                "finished_at = ?, lease_until = NULL WHERE id = ?",
+                (DONE, json.dumps(result), int(scraped), time.time(), task_id)
+            )
+
+    def fail(self, task_id: str, error: str):
+        with self._connect() as db:
+            db.execute(
+                "UPDATE scrape_tasks SET status = ?, error = ?, finished_at = ?, lease_until = NULL WHERE id = ?",
+                (FAILED, error, time.time(), task_id)
+            )
+
+    def get(self, task_id: str) -> Optional[dict]:
+        """A task's status, progress and (when done) result, or None if unknown"""
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM scrape_tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            return None
+        task = dict(row)
+        task["params"] = json.loads(task["params"])
+        task["result"] = json.loads(task["result"]) if task["result"] else None
+        return task
+
+    def mark_delivered(self, task_id: str) -> bool:
+        """Flag a done task's result as delivered; True only the first time"""
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE scrape_tasks SET delivered = 1 WHERE id = ? AND status = ? AND delivered = 0",
+                (task_id, DONE)
+            )
+        return cursor.rowcount == 1
+
+    def recover(self) -> int:
+        """
+        Requeue every task left running by workers of a previous run and purge old tasks
+
+        Call before starting workers (their leases need not run out first).
+        Tasks that already used max_attempts are failed.
+
+        Returns:
+            int: Number of tasks put back in the queue
+        """
+        now = time.time()
+        with self._connect(immediate=True) as db:
+            requeued = self._requeue(db, "1", (), now)
+            db.execute("DELETE FROM scrape_workers")
+        self.purge()
+        return requeued
+
+    def purge(self) -> int:
+        """
+        Delete tasks finished more than retention_seconds ago
+
+        Returns:
+            int: Number of tasks deleted
+        """
+        now = time.time()
+        with self._connect() as db:
+            deleted = db.execute(
+                "DELETE FROM scrape_tasks WHERE status IN (?, ?) AND finished_at < ?",
+                (DONE, FAILED, now - self.retention_seconds)
+            ).rowcount
+            db.execute("DELETE FROM scrape_workers WHERE updated_at < ?", (now - self.retention_seconds,))
+        return deleted
+
+    def report_worker(self, worker: str, status: dict):
+        """Publish a worker's status (its circuit breakers and caches)"""
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO scrape_workers (worker, status, updated_at) VALUES (?, ?, ?)",
+                (worker, json.dumps(status), time.time())
+            )
+
+    def worker_status(self, max_age: Optional[float] = None) -> dict:
+        """Status last published by each worker, within max_age seconds (default: lease_seconds)"""
+        max_age = self.lease_seconds if max_age is None else max_age
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT worker, status, updated_at FROM scrape_workers WHERE updated_at >= ?",
+                (time.time() - max_age,)
+            ).fetchall()
+        return {
+            row["worker"]: {"updated_at": row["updated_at"], **json.loads(row["status"])}
+            for row in rows
+        }
+
+    def counts(self) -> dict:
+        """Number of tasks in each status"""
+        with self._connect() as db:
+            rows = db.execute("SELECT status, COUNT(*) AS n FROM scrape_tasks GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+
+def default_queue_path() -> str:
+    return os.getenv(
+        "SCRAPE_QUEUE_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "scrape_queue.db")
+    )